@@ -0,0 +1,109 @@
+#!/usr/bin/env python3.11
+"""
+Benchmark: Biography chunker throughput
+=======================================
+Compares the original string-concatenating chunker with the offset-based
+``chunking.chunk_spans`` on a multi-megabyte synthetic biography:
+  1. Throughput (MB/s) and chunk count
+  2. Character vs whitespace-token size measures
+  3. Streaming (``iter_chunk_spans``) over page-sized blocks
+
+Runs offline — no embedding model or vector store required.
+
+Usage:
+  python3.11 benchmarks/chunker.py [megabytes]
+"""
+
+import random
+import re
+import sys
+import time
+
+from brain_system.core.chunking import (
+    chunk_spans,
+    iter_chunk_spans,
+    whitespace_tokens,
+)
+
+WORDS = (
+    "truth non-violence freedom Africa India march salt prison letter "
+    "science theory light energy compass engine machine poetry numbers "
+    "justice courage people nation village spinning wheel experiment"
+).split()
+
+
+def make_text(megabytes: float, seed: int = 7) -> str:
+    """Generate roughly *megabytes* of sentence-structured text."""
+    rng = random.Random(seed)
+    target = int(megabytes * 1024 * 1024)
+    parts, size = [], 0
+    while size < target:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 30)))
+        sentence = sentence.capitalize() + rng.choice([".", ".", ".", "!", "?"])
+        if rng.random() < 0.1:
+            sentence += "\n\n"
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(parts)
+
+
+def legacy_chunk_text(text: str, chunk_size: int = 500, overlap: int = 50):
+    """The original VectorMemory._chunk_text, kept here for comparison."""
+    text = re.sub(r"\s+", " ", text).strip()
+    sentences = re.split(r"(?<=[.!?])\s+(?=[A-Z\"\'\u201c(])", text)
+    chunks, current_chunk = [], ""
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if current_chunk and len(current_chunk) + len(sentence) + 1 > chunk_size:
+            chunks.append(current_chunk.strip())
+            if overlap > 0 and len(current_chunk) > overlap:
+                tail = current_chunk[-overlap:]
+                word_start = tail.find(" ")
+                if word_start != -1:
+                    current_chunk = tail[word_start + 1:] + " " + sentence
+                else:
+                    current_chunk = sentence
+            else:
+                current_chunk = sentence
+        else:
+            current_chunk = current_chunk + " " + sentence if current_chunk else sentence
+    if current_chunk.strip():
+        chunks.append(current_chunk.strip())
+    return [c for c in chunks if len(c) >= 30]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def blocks_of(text: str, size: int = 4000):
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+
+if __name__ == "__main__":
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 8.0
+    text = make_text(megabytes)
+    mb = len(text) / (1024 * 1024)
+
+    print("\n🧠 Brain System • Chunker Benchmark")
+    print(f"   Text size: {mb:.1f} MB\n")
+
+    cases = [
+        ("legacy (+= concat)", lambda: legacy_chunk_text(text)),
+        ("chunk_spans chars", lambda: chunk_spans(text, 500, 50)),
+        ("chunk_spans tokens", lambda: chunk_spans(text, 100, 10, whitespace_tokens)),
+        ("iter_chunk_spans", lambda: list(iter_chunk_spans(blocks_of(text), 500, 50))),
+    ]
+
+    print(f"  {'Chunker':<22} {'Chunks':>8} {'Time (s)':>10} {'MB/s':>8}")
+    print(f"  {'-'*22} {'-'*8} {'-'*10} {'-'*8}")
+    for label, fn in cases:
+        chunks, seconds = timed(fn)
+        print(f"  {label:<22} {len(chunks):>8} {seconds:>10.3f} {mb / seconds:>8.1f}")
+
+    print("\n✅ Benchmark complete.\n")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3.11
+"""
+Stress test: searches during re-indexing
+========================================
+Runs reader threads that search one persona non-stop while a writer
+thread rebuilds its index, appends documents and removes them again.
+Readers must never fail or see an empty result: each rebuild is
+published by swapping snapshots, and the old snapshot is only deleted
+once its last search has finished.
+
+Reports:
+  1. Searches completed and their latency during writes
+  2. Rebuilds / appends / removals completed
+  3. Errors and empty results seen by readers (both must be 0)
+  4. Stale build directories left on disk (must be 0)
+
+Uses a hashing embedder, so no embedding model is required.
+
+Usage:
+  python3.11 benchmarks/concurrent_search.py [seconds] [readers] [backend]
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import statistics
+import sys
+import threading
+import time
+
+import numpy as np
+
+from brain_system.core.vector_memory import VectorMemory
+
+STORE = "/tmp/bench_concurrent_search"
+PERSONA = "Stress Persona"
+DIM = 384
+PARAGRAPHS = 400
+QUERIES = ["childhood in the village", "the war years", "letters to my brother",
+           "the first company", "years in exile", "on faith and doubt"]
+
+
+class HashEmbedder:
+    """Bag-of-words vectors from hashed tokens (deterministic, model-free)."""
+
+    dimension = DIM
+
+    def embed(self, text: str):
+        vector = np.zeros(DIM, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % DIM] += 1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+
+def make_biography(version: int) -> str:
+    topics = [q.split() for q in QUERIES]
+    return "\n\n".join(
+        f"Chapter {i} (edition {version}). I remember {' '.join(topics[i % len(topics)])} "
+        f"and how it shaped paragraph {i} of my life."
+        for i in range(PARAGRAPHS)
+    )
+
+
+def reader(memory, stop, stats):
+    i = 0
+    while not stop.is_set():
+        query = QUERIES[i % len(QUERIES)]
+        mode = "hybrid" if i % 2 else "vector"
+        start = time.perf_counter()
+        try:
+            hits = memory.search(query, top_k=5, mode=mode)
+        except Exception as e:
+            stats["errors"].append(repr(e))
+        else:
+            stats["latency"].append((time.perf_counter() - start) * 1000)
+            if not hits:
+                stats["empty"] += 1
+        i += 1
+
+
+def writer(memory, stop, stats):
+    version = 1
+    while not stop.is_set():
+        version += 1
+        memory.index_text(make_biography(version), PERSONA)
+        stats["rebuilds"] += 1
+
+        memory.add_documents([f"A diary entry, number {version}, about the war years."], "diary")
+        stats["appends"] += 1
+        memory.remove_source("diary")
+        stats["removals"] += 1
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    num_readers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    backend = sys.argv[3] if len(sys.argv) > 3 else "numpy"
+
+    print("\n🧠 Brain System • Concurrent Search Stress Test")
+    print(f"   Backend: {backend}, readers: {num_readers}, duration: {seconds:.0f}s\n")
+
+    if os.path.exists(STORE):
+        shutil.rmtree(STORE)
+    memory = VectorMemory(storage_dir=STORE, backend=backend, embedder=HashEmbedder())
+    memory.index_text(make_biography(1), PERSONA)
+
+    stop = threading.Event()
+    reader_stats = [{"latency": [], "errors": [], "empty": 0} for _ in range(num_readers)]
+    writer_stats = {"rebuilds": 0, "appends": 0, "removals": 0}
+    threads = [
+        threading.Thread(target=reader, args=(memory, stop, stats)) for stats in reader_stats
+    ]
+    threads.append(threading.Thread(target=writer, args=(memory, stop, writer_stats)))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    latency = [ms for stats in reader_stats for ms in stats["latency"]]
+    errors = [error for stats in reader_stats for error in stats["errors"]]
+    empty = sum(stats["empty"] for stats in reader_stats)
+
+    memory.close()
+    safe_name = memory._safe_name(PERSONA)
+    builds = [entry for entry in os.listdir(STORE)
+              if entry.startswith(f"{safe_name}_v") and not entry.endswith(".jsonl")]
+
+    print(f"  Searches:            {len(latency)}")
+    if latency:
+        print(f"  Search latency:      mean {statistics.mean(latency):.2f} ms, "
+              f"p99 {np.percentile(latency, 99):.2f} ms")
+    print(f"  Rebuilds:            {writer_stats['rebuilds']}")
+    print(f"  Appends / removals:  {writer_stats['appends']} / {writer_stats['removals']}")
+    print(f"  Reader errors:       {len(errors)}")
+    for error in errors[:5]:
+        print(f"    {error}")
+    print(f"  Empty results:       {empty}")
+    print(f"  Builds left on disk: {len(builds)} (1 expected)")
+
+    shutil.rmtree(STORE, ignore_errors=True)
+    ok = not errors and not empty and len(builds) == 1
+    print(f"\n{'✅' if ok else '❌'} Stress test {'passed' if ok else 'failed'}.\n")
+    sys.exit(0 if ok else 1)
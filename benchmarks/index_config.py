@@ -0,0 +1,119 @@
+#!/usr/bin/env python3.11
+"""
+Benchmark: Vector precision and HNSW parameters
+===============================================
+Builds the same collection under several ``IndexConfig`` settings and
+reports for each:
+  1. On-disk footprint
+  2. Build time
+  3. Query latency
+  4. Recall@k against exact (brute-force) inner-product search
+
+Note that int8 needs more disk than fp32 (zvec stores the fp32 vectors
+alongside the quantized index): it trades recall for build and query
+speed, not for space.  fp16 is the setting that halves the footprint.
+
+Uses clustered synthetic unit vectors passed to ``index_profile`` as
+precomputed embeddings, so no embedding model is required.
+
+Usage:
+  python3.11 benchmarks/index_config.py [num_vectors]
+"""
+
+import os
+import shutil
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from brain_system.core.vector_memory import IndexConfig, VectorMemory
+
+STORE = "/tmp/bench_index_config"
+TOP_K = 10
+NUM_QUERIES = 200
+DIM = 384
+
+CONFIGS = [
+    ("fp32 default", IndexConfig()),
+    ("fp32 m=16", IndexConfig(hnsw_m=16, ef_construction=200, ef_search=100)),
+    ("fp16 default", IndexConfig(precision="fp16")),
+    ("fp16 m=16", IndexConfig(precision="fp16", hnsw_m=16, ef_construction=200, ef_search=100)),
+    ("int8 default", IndexConfig(precision="int8")),
+    ("int8 m=16", IndexConfig(precision="int8", hnsw_m=16, ef_construction=200, ef_search=100)),
+]
+
+
+def make_vectors(count: int, clusters: int = 50, seed: int = 7) -> np.ndarray:
+    """Unit vectors grouped around random centroids, like topical chunks."""
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(clusters, DIM))
+    vectors = centroids[rng.integers(0, clusters, count)] + 0.6 * rng.normal(size=(count, DIM))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def directory_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total
+
+
+def run_config(config: IndexConfig, profile, embeddings, queries, truth):
+    memory = VectorMemory(storage_dir=STORE, index_config=config, backend="zvec")
+
+    start = time.perf_counter()
+    memory.index_profile(profile, "bench_index", embeddings=embeddings)
+    build = time.perf_counter() - start
+    size = directory_size(memory._active.path)
+
+    # chunk_type is "profile_f<row>", which maps a hit back to its corpus row
+    backend = memory._active.backend
+    latencies, recall = [], []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        hits = backend.query(query.tolist(), TOP_K)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found = {int(hit.chunk_type.split("_f")[1]) for hit in hits}
+        recall.append(len(found & expected) / TOP_K)
+
+    memory.clear()
+    memory.close()
+    return size, build, latencies, statistics.mean(recall)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    print("\n🧠 Brain System • Index Config Benchmark")
+    print(f"   Vectors: {count} × {DIM}, queries: {NUM_QUERIES}, k={TOP_K}\n")
+
+    vectors = make_vectors(count + NUM_QUERIES)
+    corpus, queries = vectors[:count], vectors[count:]
+    profile = {f"F{i:07d}": f"synthetic passage {i}" for i in range(count)}
+    embeddings = {f"F{i:07d}": corpus[i].tolist() for i in range(count)}
+
+    # Exact top-k by inner product
+    scores = queries @ corpus.T
+    top = np.argpartition(-scores, TOP_K, axis=1)[:, :TOP_K]
+    truth = [set(row.tolist()) for row in top]
+
+    if os.path.exists(STORE):
+        shutil.rmtree(STORE)
+
+    print(f"  {'Config':<14} {'Disk (MB)':>10} {'Build (s)':>10} {'Avg (ms)':>9} {'P95 (ms)':>9} {f'Recall@{TOP_K}':>10}")
+    print(f"  {'-'*14} {'-'*10} {'-'*10} {'-'*9} {'-'*9} {'-'*10}")
+    for label, config in CONFIGS:
+        size, build, latencies, recall = run_config(
+            config, profile, embeddings, queries, truth
+        )
+        p95 = sorted(latencies)[int(0.95 * (len(latencies) - 1))]
+        print(
+            f"  {label:<14} {size / 1e6:>10.1f} {build:>10.2f} "
+            f"{statistics.mean(latencies):>9.3f} {p95:>9.3f} {recall:>10.1%}"
+        )
+
+    shutil.rmtree(STORE, ignore_errors=True)
+    print("\n✅ Benchmark complete.\n")
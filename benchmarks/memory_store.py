@@ -0,0 +1,104 @@
+#!/usr/bin/env python3.11
+"""
+Benchmark: MemoryStore write throughput
+=======================================
+Appends memories one ``add_memory`` call at a time and reports, per
+store size:
+  1. Write throughput (entries/s) of the JSON Lines log
+  2. Reopen time (reading the whole log back and indexing it)
+  3. ``retrieve_memories`` latency (BM25 over the inverted index)
+  4. For comparison, the write throughput of the legacy JSON array
+     store, which rewrote the whole file on every call.  It is quadratic,
+     so it is measured once, over LEGACY_SIZE entries
+
+Usage:
+  python3.11 benchmarks/memory_store.py [max_entries]
+"""
+
+import json
+import os
+import shutil
+import sys
+import time
+
+from brain_system.core.memory_store import MemoryStore
+
+STORE = "/tmp/bench_memory_store"
+SIZES = [10_000, 100_000, 1_000_000]
+LEGACY_SIZE = 2_000
+QUERIES = [
+    "what did we say about topic 42",
+    "remind me of the summary for turn 777",
+    "the short answer about topic 7",
+]
+
+
+def memory_text(i: int) -> str:
+    return (
+        f"User asked about topic {i % 997} and word{i % 10007}; "
+        f"the brain answered with a short summary of turn {i}."
+    )
+
+
+def legacy_add_memory(filepath: str, memory_text: str, tags=None):
+    """The original MemoryStore.add_memory: read, append, rewrite."""
+    entry = {"timestamp": "2025-01-01T00:00:00", "content": memory_text, "tags": tags or []}
+    with open(filepath, "r+") as f:
+        data = json.load(f)
+        data.append(entry)
+        f.seek(0)
+        f.truncate()
+        json.dump(data, f, indent=4)
+
+
+def bench_log(size: int):
+    path = os.path.join(STORE, f"log_{size}.jsonl")
+    store = MemoryStore(path)
+    start = time.perf_counter()
+    for i in range(size):
+        store.add_memory(memory_text(i), tags=["turn"])
+    write_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reopened = MemoryStore(path)
+    reopen_s = time.perf_counter() - start
+    assert len(reopened) == size
+
+    start = time.perf_counter()
+    for _ in range(10):
+        for query in QUERIES:
+            reopened.retrieve_memories(query, limit=3)
+    query_ms = (time.perf_counter() - start) * 1000 / (10 * len(QUERIES))
+    return size / write_s, reopen_s, query_ms, os.path.getsize(path)
+
+
+def bench_legacy(size: int) -> float:
+    path = os.path.join(STORE, f"legacy_{size}.json")
+    with open(path, "w") as f:
+        json.dump([], f)
+    start = time.perf_counter()
+    for i in range(size):
+        legacy_add_memory(path, memory_text(i), tags=["turn"])
+    return size / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    max_entries = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]
+    sizes = [size for size in SIZES if size <= max_entries] or [max_entries]
+
+    print("\n🧠 Brain System • MemoryStore Write Benchmark\n")
+    if os.path.exists(STORE):
+        shutil.rmtree(STORE)
+    os.makedirs(STORE)
+
+    print(f"  {'Entries':>9}  {'Writes/s':>10} {'Reopen':>8} {'Query (ms)':>10} {'Size':>9}")
+    print(f"  {'-'*9}  {'-'*10} {'-'*8} {'-'*10} {'-'*9}")
+    for size in sizes:
+        rate, reopen_s, query_ms, nbytes = bench_log(size)
+        print(f"  {size:>9}  {rate:>10.0f} {reopen_s:>7.2f}s {query_ms:>10.2f} {nbytes / 1e6:>7.1f}MB")
+
+    print(f"\n  Legacy JSON array store: {bench_legacy(LEGACY_SIZE):.0f} writes/s "
+          f"over its first {LEGACY_SIZE} entries")
+
+    shutil.rmtree(STORE)
+    print("\n✅ Benchmark complete.\n")
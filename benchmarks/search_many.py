@@ -0,0 +1,72 @@
+#!/usr/bin/env python3.11
+"""
+Benchmark: one search per query vs search_many
+==============================================
+Indexes the biographies of all pre-curated personas into one collection,
+then answers the same batch of queries with
+  1. ``VectorMemory.search`` called once per query
+  2. a single ``VectorMemory.search_many`` call
+
+and reports the wall time of each at several batch sizes, plus whether
+both return identical passages.
+
+Usage:
+  python3.11 benchmarks/search_many.py [vector|hybrid]
+"""
+
+import os
+import shutil
+import sys
+import time
+
+from brain_system.core.vector_memory import VectorMemory
+
+from hybrid_retrieval import QUERIES, build_corpus
+
+STORE = "/tmp/bench_search_many"
+TOP_K = 5
+BATCH_SIZES = [1, 3, 10]
+REPEATS = 5
+
+
+def time_loop(memory: VectorMemory, queries, mode: str):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        results = [memory.search(query, top_k=TOP_K, mode=mode) for query in queries]
+    return (time.perf_counter() - start) * 1000 / REPEATS, results
+
+
+def time_batch(memory: VectorMemory, queries, mode: str):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        results = memory.search_many(queries, top_k=TOP_K, mode=mode)
+    return (time.perf_counter() - start) * 1000 / REPEATS, results
+
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "vector"
+    print("\n🧠 Brain System • Batched Search Benchmark")
+    print(f"   Mode: {mode}, k={TOP_K}\n")
+
+    if os.path.exists(STORE):
+        shutil.rmtree(STORE)
+    memory = VectorMemory(storage_dir=STORE)
+    memory.index_text(build_corpus(), "all_personas")
+
+    # Warm up the embedding model so the first query isn't penalised
+    memory.search_many(["warm up", "warm up again"], top_k=1)
+
+    print(f"\n  {'Queries':>7} {'Loop (ms)':>10} {'Batch (ms)':>11} {'Speedup':>8} {'Same':>5}")
+    print(f"  {'-'*7} {'-'*10} {'-'*11} {'-'*8} {'-'*5}")
+    for size in BATCH_SIZES:
+        queries = [query for query, _ in QUERIES[:size]]
+        loop_ms, loop_results = time_loop(memory, queries, mode)
+        batch_ms, batch_results = time_batch(memory, queries, mode)
+        print(
+            f"  {size:>7} {loop_ms:>10.2f} {batch_ms:>11.2f} "
+            f"{loop_ms / batch_ms:>7.1f}x {'yes' if loop_results == batch_results else 'no':>5}"
+        )
+
+    memory.close()
+    shutil.rmtree(STORE)
+    print("\n✅ Benchmark complete.\n")
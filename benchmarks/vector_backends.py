@@ -0,0 +1,110 @@
+#!/usr/bin/env python3.11
+"""
+Benchmark: NumPy exact search vs zvec HNSW
+==========================================
+Inserts the same synthetic embeddings into ``NumpyBackend`` and
+``ZvecBackend`` at increasing collection sizes and reports
+  1. Build time (insert + flush)
+  2. Query latency (top-k)
+  3. zvec recall@k against the exact NumPy result
+
+The smallest size at which zvec answers faster is the crossover point;
+``VectorMemory.NUMPY_MAX_VECTORS`` should sit just below it.
+
+Usage:
+  python3.11 benchmarks/vector_backends.py [max_vectors]
+"""
+
+import os
+import shutil
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from brain_system.core.vector_backends import NumpyBackend, SearchHit, ZvecBackend
+
+STORE = "/tmp/bench_vector_backends"
+SIZES = [100, 1000, 5000, 10000, 20000, 50000, 100000]
+TOP_K = 5
+NUM_QUERIES = 200
+DIM = 384
+INSERT_BATCH = 1000
+
+
+def make_vectors(count: int, clusters: int = 50, seed: int = 7) -> np.ndarray:
+    """Unit vectors grouped around random centroids, like topical chunks."""
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(clusters, DIM))
+    vectors = centroids[rng.integers(0, clusters, count)] + 0.6 * rng.normal(size=(count, DIM))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def build(backend, vectors: np.ndarray) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(vectors), INSERT_BATCH):
+        backend.insert([
+            SearchHit(id=str(row), text=f"passage {row}", vector=vector.tolist())
+            for row, vector in enumerate(vectors[i:i + INSERT_BATCH], start=i)
+        ])
+    backend.flush()
+    return time.perf_counter() - start
+
+
+def run_queries(backend, queries: np.ndarray):
+    latencies, results = [], []
+    for query in queries:
+        vector = query.tolist()
+        start = time.perf_counter()
+        hits = backend.query(vector, TOP_K)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({hit.id for hit in hits})
+    return latencies, results
+
+
+if __name__ == "__main__":
+    max_vectors = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]
+    sizes = [size for size in SIZES if size <= max_vectors]
+
+    print("\n🧠 Brain System • Vector Backend Crossover Benchmark")
+    print(f"   Dimension: {DIM}, queries: {NUM_QUERIES}, k={TOP_K}\n")
+
+    vectors = make_vectors(sizes[-1] + NUM_QUERIES)
+    queries = vectors[-NUM_QUERIES:]
+
+    print(f"  {'Vectors':>8}  {'NumPy build':>11} {'NumPy (ms)':>10}  "
+          f"{'zvec build':>10} {'zvec (ms)':>9} {f'Recall@{TOP_K}':>9}")
+    print(f"  {'-'*8}  {'-'*11} {'-'*10}  {'-'*10} {'-'*9} {'-'*9}")
+
+    crossover = None
+    for size in sizes:
+        if os.path.exists(STORE):
+            shutil.rmtree(STORE)
+        corpus = vectors[:size]
+
+        numpy_backend = NumpyBackend(os.path.join(STORE, "bench_numpy"))
+        numpy_build = build(numpy_backend, corpus)
+        numpy_latency, exact = run_queries(numpy_backend, queries)
+
+        zvec_backend = ZvecBackend.create(os.path.join(STORE, "bench_zvec"), DIM)
+        zvec_build = build(zvec_backend, corpus)
+        zvec_latency, approximate = run_queries(zvec_backend, queries)
+        zvec_backend.destroy()
+
+        recall = statistics.mean(len(a & e) / len(e) for a, e in zip(approximate, exact))
+        numpy_ms = statistics.mean(numpy_latency)
+        zvec_ms = statistics.mean(zvec_latency)
+        if crossover is None and zvec_ms < numpy_ms:
+            crossover = size
+
+        print(f"  {size:>8}  {numpy_build:>10.2f}s {numpy_ms:>10.3f}  "
+              f"{zvec_build:>9.2f}s {zvec_ms:>9.3f} {recall:>9.1%}")
+
+    shutil.rmtree(STORE, ignore_errors=True)
+    if crossover is None:
+        print(f"\n  NumPy was faster at every size up to {sizes[-1]} vectors.")
+    else:
+        print(f"\n  zvec overtakes NumPy at ~{crossover} vectors.")
+    print("\n✅ Benchmark complete.\n")
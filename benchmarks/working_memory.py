@@ -0,0 +1,130 @@
+#!/usr/bin/env python3.11
+"""
+Benchmark: WorkingMemory context building
+=========================================
+Simulates a long conversation (one ``add_turn`` plus one context build per
+request) and reports the cost per request, at several turn sizes, of
+  1. ``add_turn`` — storing the turn (and evicting the oldest)
+  2. ``get_context(last_n=15)`` — the whole window as a string
+  3. ``select_context(query)`` — relevance-selected turns within a budget
+
+each against the original list-backed buffer, which resliced the list on
+every turn and re-formatted (and, to select turns, re-measured and
+re-indexed) every turn on every call.  ``add_turn`` costs more than the
+original's because each turn is formatted and measured (words counted) up
+front, once; that is what makes building the context cheap.  Also shows
+how many turns a ``max_tokens`` budget keeps when one turn is a pasted
+essay.
+
+Usage:
+  python3.11 benchmarks/working_memory.py [requests]
+"""
+
+import sys
+import time
+
+from brain_system.core.bm25 import BM25Index
+from brain_system.core.chunking import whitespace_tokens
+from brain_system.core.working_memory import ContextSelection, WorkingMemory
+
+MAX_TURNS = 15
+TURN_WORDS = [50, 250, 1000]
+TOKEN_BUDGET = 4000
+
+
+class LegacyWorkingMemory:
+    """The original WorkingMemory: a list, re-formatted on every call."""
+
+    def __init__(self, max_turns: int = 15):
+        self.max_turns = max_turns
+        self._turns = []
+
+    def add_turn(self, user_message: str, brain_response: str):
+        self._turns.append((user_message, brain_response))
+        if len(self._turns) > self.max_turns:
+            self._turns = self._turns[-self.max_turns:]
+
+    def get_context(self, last_n: int = 10) -> str:
+        lines = []
+        for user_msg, brain_resp in self._turns[-last_n:]:
+            lines.append(f"User: {user_msg}")
+            lines.append(f"Brain: {brain_resp}")
+        return "\n".join(lines)
+
+    def select_context(self, query: str, max_tokens: int = WorkingMemory.MAX_CONTEXT_TOKENS):
+        """Relevance selection as first written: everything rebuilt per call."""
+        rendered = [f"User: {user}\nBrain: {brain}" for user, brain in self._turns]
+        sizes = [whitespace_tokens(text) for text in rendered]
+        first_recent = max(0, len(rendered) - 1)
+        selected = list(range(first_recent, len(rendered)))
+        budget = max_tokens - sum(sizes[first_recent:])
+
+        index = BM25Index()
+        for position in range(first_recent):
+            index.add(position, rendered[position])
+        scores = index.scores(query, max_df=WorkingMemory.COMMON_TERM_DF, fallback=False)
+        if scores:
+            cutoff = max(scores.values()) * WorkingMemory.MIN_RELATIVE_SCORE
+            for position, score in sorted(scores.items(), key=lambda item: (item[1], item[0]), reverse=True):
+                if score >= cutoff and sizes[position] <= budget:
+                    selected.append(position)
+                    budget -= sizes[position]
+        selected.sort()
+        return ContextSelection(
+            "\n".join(rendered[p] for p in selected), len(selected),
+            sum(sizes[p] for p in selected), sum(sizes),
+        )
+
+
+def turn(i: int, words: int):
+    user = f"Question {i} about topic{i % 7}: " + "word " * (words // 5)
+    brain = f"Answer {i} on topic{i % 7}: " + "reply " * words
+    return user, brain
+
+
+def per_request_us(memory, build, requests: int, words: int):
+    """Average ``(add_turn, build)`` time per request, in microseconds."""
+    turns = [turn(i, words) for i in range(requests)]
+    add = build_time = 0.0
+    for i, (user, brain) in enumerate(turns):
+        start = time.perf_counter()
+        memory.add_turn(user, brain)
+        middle = time.perf_counter()
+        build(memory, i)
+        add += middle - start
+        build_time += time.perf_counter() - middle
+    return add * 1e6 / requests, build_time * 1e6 / requests
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    print("\n🧠 Brain System • Working Memory Benchmark")
+    print(f"   {requests} requests, window of {MAX_TURNS} turns\n")
+
+    def window(memory, i):
+        return memory.get_context(last_n=MAX_TURNS)
+
+    def select(memory, i):
+        return memory.select_context(f"more on topic{i % 7}")
+
+    print(f"  {'':>10} {'add_turn (us)':>23} {'get_context (us)':>23} {'select_context (us)':>23}")
+    print(f"  {'Words/turn':>10}" + f" {'Legacy':>11} {'Deque':>11}" * 3)
+    print(f"  {'-'*10}" + f" {'-'*11}" * 6)
+    for words in TURN_WORDS:
+        legacy_add, legacy_window = per_request_us(LegacyWorkingMemory(MAX_TURNS), window, requests, words)
+        deque_add, deque_window = per_request_us(WorkingMemory(MAX_TURNS), window, requests, words)
+        _, legacy_select = per_request_us(LegacyWorkingMemory(MAX_TURNS), select, requests, words)
+        _, deque_select = per_request_us(WorkingMemory(MAX_TURNS), select, requests, words)
+        timings = [legacy_add, deque_add, legacy_window, deque_window, legacy_select, deque_select]
+        print(f"  {words:>10} " + " ".join(f"{us:>11.1f}" for us in timings))
+
+    memory = WorkingMemory(MAX_TURNS, max_tokens=TOKEN_BUDGET)
+    for i in range(MAX_TURNS):
+        memory.add_turn(*turn(i, 250))
+    before = memory.turn_count
+    memory.add_turn("Please summarise this essay: " + "essay " * 3000, "Done.")
+    print(f"\n  Pasting a 3000-word essay with max_tokens={TOKEN_BUDGET}: "
+          f"{before} turns -> {memory.turn_count} ({memory.token_count} words kept)")
+
+    print("\n✅ Benchmark complete.\n")
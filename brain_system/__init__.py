@@ -14,20 +14,33 @@ Quick start::
 
 __version__ = "0.4.1"
 
-from brain_system.wrapper import BrainWrapper, BrainResult, AgentWrapper, BrainContext  # noqa: F401
-from brain_system.core.orchestrator import BrainOrchestrator  # noqa: F401
-from brain_system.core.llm_interface import LLMFactory  # noqa: F401
-from brain_system.agents.base_agent import BaseAgent  # noqa: F401
-from brain_system.personas.persona_registry import list_personas  # noqa: F401
-
-__all__ = [
-    "BrainWrapper",
-    "BrainResult",
-    "AgentWrapper",
-    "BrainContext",
-    "BrainOrchestrator",
-    "LLMFactory",
-    "BaseAgent",
-    "list_personas",
-    "__version__",
-]
+import importlib
+
+# Public names and the modules defining them, imported on first access so
+# that importing a submodule (e.g. in a PDF extraction worker) doesn't pull
+# in LangGraph and the LLM SDKs
+_EXPORTS = {
+    "BrainWrapper": "brain_system.wrapper",
+    "BrainResult": "brain_system.wrapper",
+    "AgentWrapper": "brain_system.wrapper",
+    "BrainContext": "brain_system.wrapper",
+    "BrainOrchestrator": "brain_system.core.orchestrator",
+    "LLMFactory": "brain_system.core.llm_interface",
+    "BaseAgent": "brain_system.agents.base_agent",
+    "list_personas": "brain_system.personas.persona_registry",
+}
+
+__all__ = list(_EXPORTS) + ["__version__"]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
@@ -1,14 +1,22 @@
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 from langchain_core.messages import HumanMessage, SystemMessage
 from ..core.llm_interface import LLMFactory
 
 class BaseAgent(ABC):
+    # Whether this agent retrieves the persona profile fields most relevant
+    # to each input for its own prompt; the orchestrator limits it to the
+    # fields its persona_context does not already contain
+    RETRIEVES_PERSONA = False
+    RETRIEVAL_TOP_K = 2
+
     def __init__(self, name: str, role: str, provider: str = "gemini", model_name: str = None):
         self.name = name
         self.role = role
         self.persona_context: str = ""  # Injected by orchestrator when persona is active
+        self.retrieval_chunk_types: Tuple[str, ...] = ()  # Set with the persona
+        self.vector_memory = None  # Set by orchestrator
         self.llm = LLMFactory.create_llm(provider=provider, model_name=model_name)
     
     @abstractmethod
@@ -19,6 +27,25 @@ class BaseAgent(ABC):
         """
         pass
 
+    def _retrieve_persona_passages(self, query: str) -> List[str]:
+        """Passages of this agent's retrieval profile relevant to *query*."""
+        vector_memory = self.vector_memory
+        if not self.retrieval_chunk_types or vector_memory is None or not vector_memory.ready:
+            return []
+        return vector_memory.search(
+            query,
+            top_k=self.RETRIEVAL_TOP_K,
+            chunk_types=self.retrieval_chunk_types,
+        )
+
+    @staticmethod
+    def _format_passages(title: str, passages: List[str]) -> str:
+        """Prompt section listing *passages*, or "" when there are none."""
+        if not passages:
+            return ""
+        lines = "\n".join(f"- {passage}" for passage in passages)
+        return f"\n{title}:\n{lines}\n"
+
     def _query_llm(self, system_prompt: str, user_input: str) -> str:
         """
         Helper method to query the LLM with a system and user message.
@@ -3,6 +3,8 @@ from typing import Any, Dict
 from .base_agent import BaseAgent
 
 class EmotionalAgent(BaseAgent):
+    RETRIEVES_PERSONA = True
+
     def __init__(self, provider: str = "gemini", model_name: str = None):
         super().__init__(name="EmotionalAgent", role="Amygdala & Limbic System", provider=provider, model_name=model_name)
 
@@ -13,6 +15,10 @@ class EmotionalAgent(BaseAgent):
         """
         user_input = inputs.get("input", "")
         context = inputs.get("context", "")
+        persona_passages = self._format_passages(
+            "MORE ABOUT THE PERSONA (retrieved for this input)",
+            self._retrieve_persona_passages(user_input),
+        )
         
         system_prompt = f"""You are the Emotional Processing System of a digital brain, modeling the Amygdala, Insula, Cingulate Gyrus, and Hypothalamus (the Limbic System).
 
@@ -24,7 +30,7 @@ Your output is consumed by the Executive Agent (Prefrontal Cortex), which integr
 
 CONTEXT FROM MEMORY SYSTEM:
 {context}
-
+{persona_passages}
 YOUR TASK — Perform emotional analysis:
 
 1. **Emotional Profiling** (Amygdala)
@@ -21,7 +21,7 @@ class ExecutiveAgent(BaseAgent):
         conversation_block = ""
         if conversation_context:
             conversation_block = f"""
-💬 WORKING MEMORY (Recent Conversation):
+💬 WORKING MEMORY (Latest turn and related earlier turns, in order):
 {conversation_context}
 """
         
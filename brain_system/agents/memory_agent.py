@@ -1,12 +1,36 @@
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from langchain_core.messages import HumanMessage, SystemMessage
 from .base_agent import BaseAgent
+from ..core.bm25 import BM25Index
+from ..core.consolidation import MemoryConsolidator
 
 
 class MemoryAgent(BaseAgent):
+    # Fuse BM25 and vector rankings so exact names and dates are found
+    SEARCH_MODE = "hybrid"
+    # Diversify results and stitch overlapping neighbours into one passage
+    SEARCH_DIVERSITY = 0.3
+    MERGE_ADJACENT = True
+    # Only brief the downstream agents on passages whose cosine similarity
+    # to the input clears MIN_SIMILARITY, cut at the elbow of the scores;
+    # when none does, the LLM call is skipped
+    SEARCH_TOP_K = 5
+    MIN_SIMILARITY = 0.25
+    ADAPTIVE_K = True
+    # Past conversation turns recalled from long-term memory per input
+    PAST_TURNS_LIMIT = 3
+
     def __init__(self, provider: str = "gemini", model_name: str = None):
         super().__init__(name="MemoryAgent", role="Hippocampus", provider=provider, model_name=model_name)
         self._vector_memory = None  # Set by orchestrator when persona is loaded
+        self.memory_store = None  # Long-term memory of past turns, set by orchestrator
+        # Tags a stored turn must carry to be recalled (this persona and session)
+        self.turn_tags: List[str] = []
+        self.working_memory = None  # Turns already in the conversation context
+        self.consolidator = None  # Summaries of turns evicted from working memory
+        # "FIELD: value" profile lines, searched while the biography index builds
+        self.profile_passages: List[str] = []
 
     @property
     def vector_memory(self):
@@ -20,22 +44,37 @@ class MemoryAgent(BaseAgent):
         """
         Memory processing — mirrors the Hippocampus.
         Searches the persona's biography for life experiences relevant
-        to the user's current input.
+        to the user's current input, and long-term memory for related
+        past conversation turns.
         """
         user_input = inputs.get("input", "")
 
         # Search persona biography via ZVec semantic search
         retrieved_passages = self._search_persona_memories(user_input)
-
-        if not retrieved_passages:
-            # No persona loaded or no relevant memories found
+        past_turns = self._search_past_turns(user_input)
+        earlier_summaries = self._search_earlier_conversation(user_input)
+
+        if not retrieved_passages and not past_turns and not earlier_summaries:
+            # No persona loaded, or nothing relevant enough to brief on
+            if self._vector_memory is not None and self._vector_memory.ready:
+                context = "No relevant persona memories for this input. Responding without biographical context."
+            else:
+                context = "No persona memories available. Responding without biographical context."
             return {
-                "memory_context": "No persona memories available. Responding without biographical context.",
-                "raw_memories": []
+                "memory_context": context,
+                "raw_memories": [],
+                "past_turns": [],
+                "earlier_summaries": [],
+                "passages_used": 0,
             }
 
         formatted_memories = "\n".join(
             [f"- {passage}" for passage in retrieved_passages]
+        ) or "None"
+        past_conversations = self._format_passages(
+            "RELEVANT PAST CONVERSATIONS (from long-term memory)", past_turns
+        ) + self._format_passages(
+            "EARLIER IN THIS CONVERSATION (consolidated summaries)", earlier_summaries
         )
 
         system_prompt = f"""You are the Memory System of a digital brain, modeling the Hippocampus — the brain's autobiographical memory hub.
@@ -48,7 +87,7 @@ Your output is consumed by the Logic Agent, Emotional Agent, and Executive Agent
 
 RETRIEVED PERSONA MEMORIES (from biography/autobiography):
 {formatted_memories}
-
+{past_conversations}
 YOUR TASK — Think step-by-step:
 
 Step 1: **Relevance Assessment** — Which retrieved passages are most relevant to the current input? Rate each (High / Medium / Low). Discard Low-relevance passages.
@@ -79,11 +118,83 @@ FLAGS: [any critical biographical context that must not be ignored, or "None"]
         response = self._query_llm(system_prompt, user_input)
         return {
             "memory_context": response,
-            "raw_memories": retrieved_passages
+            "raw_memories": retrieved_passages,
+            "past_turns": past_turns,
+            "earlier_summaries": earlier_summaries,
+            "passages_used": len(retrieved_passages),
         }
 
-    def _search_persona_memories(self, query: str, top_k: int = 5) -> List[str]:
-        """Search the persona's indexed biography for relevant passages."""
-        if self._vector_memory is None or not self._vector_memory.is_loaded:
+    def _search_persona_memories(self, query: str, top_k: int = None) -> List[str]:
+        """Search the persona's indexed biography for relevant passages.
+
+        Falls back to the persona profile while the index is still building.
+        """
+        top_k = top_k or self.SEARCH_TOP_K
+        if self._vector_memory is None or not self._vector_memory.ready:
+            return self._search_profile(query, top_k)
+        return self._vector_memory.search(
+            query,
+            top_k=top_k,
+            mode=self.SEARCH_MODE,
+            diversity=self.SEARCH_DIVERSITY,
+            merge_adjacent=self.MERGE_ADJACENT,
+            min_score=self.MIN_SIMILARITY,
+            adaptive_k=self.ADAPTIVE_K,
+        )
+
+    def _search_past_turns(self, query: str) -> List[str]:
+        """Past conversation turns from long-term memory relevant to *query*.
+
+        Only turns carrying every tag in :attr:`turn_tags` are recalled, so
+        the store's other personas and sessions stay out.  Turns still in
+        working memory are left out: the Executive already sees them as
+        conversation context.
+        """
+        if self.memory_store is None:
+            return []
+        in_context = self.working_memory.turn_texts() if self.working_memory is not None else ()
+        entries = self.memory_store.retrieve_memories(
+            query,
+            limit=self.PAST_TURNS_LIMIT,
+            recent_fallback=False,
+            exclude=in_context,
+            tags=self.turn_tags,
+        )
+        return [entry["content"] for entry in entries]
+
+    def _search_earlier_conversation(self, query: str) -> List[str]:
+        """Consolidated summaries of this session's evicted turns relevant to *query*."""
+        if self.consolidator is None:
+            return []
+        return self.consolidator.search(query)
+
+    def consolidate(self, turns: List[Tuple[str, str]]) -> str:
+        """Summarize conversation turns into one long-term memory passage.
+
+        Called off the request path by the orchestrator's consolidator.
+        The persona is left out: the summary records what was said.
+        """
+        transcript = MemoryConsolidator.transcript(turns)
+        system_prompt = """You are the Memory System of a digital brain, modeling the Hippocampus consolidating short-term memory into long-term memory.
+
+Summarize the conversation excerpt you are given so it can be recalled later.
+
+## CONSTRAINTS:
+- Keep your TOTAL output under 120 words
+- Keep names, dates, numbers, decisions and the user's stated preferences or facts about themselves
+- Write plain sentences in the third person ("The user asked...", "The Brain explained...")
+- Do NOT add anything that is not in the excerpt"""
+        response = self.llm.invoke([
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=transcript),
+        ])
+        return response.content
+
+    def _search_profile(self, query: str, top_k: int) -> List[str]:
+        """Rank profile lines against *query* by BM25."""
+        if not self.profile_passages:
             return []
-        return self._vector_memory.search(query, top_k=top_k)
+        index = BM25Index()
+        for position, passage in enumerate(self.profile_passages):
+            index.add(position, passage)
+        return [self.profile_passages[position] for position, _ in index.search(query, top_k)]
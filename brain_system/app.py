@@ -39,6 +39,8 @@ def init_brain():
     model_name = data.get("model_name", None)
 
     try:
+        if brain is not None:
+            brain.close()
         brain = BrainOrchestrator(provider=provider, model_name=model_name)
         current_config["provider"] = provider
         current_config["model_name"] = model_name
@@ -92,12 +94,25 @@ def clear_persona():
     for agent in agents:
         agent.persona_context = ""
     brain.persona = None
-    brain.vector_memory.clear()
+    brain.memory.profile_passages = []
+    brain.vector_memory.deactivate()
     current_config["persona_name"] = None
     current_config["persona_active"] = False
     return jsonify({"status": "ok", "message": "Persona cleared"})
 
 
+@app.route("/api/persona/status", methods=["GET"])
+def persona_status():
+    """Report background biography indexing progress for polling."""
+    if brain is None:
+        return jsonify({"status": "error", "message": "Brain not initialized"}), 400
+    return jsonify({
+        "status": "ok",
+        "ready": brain.vector_memory.ready,
+        "progress": brain.vector_memory.progress,
+    })
+
+
 @app.route("/api/personas", methods=["GET"])
 def list_available_personas():
     """Return list of available pre-curated personas."""
@@ -135,6 +150,8 @@ def select_persona():
 def reset_brain():
     """Full reset — destroy brain instance and return to setup."""
     global brain, current_config
+    if brain is not None:
+        brain.close()
     brain = None
     current_config = {
         "provider": "ollama",
@@ -151,6 +168,7 @@ def clear_memory():
     global brain
     if brain is not None:
         brain.working_memory.clear()
+        brain.consolidator.clear()
     return jsonify({"status": "ok", "message": "Conversation memory cleared"})
 
 
@@ -173,6 +191,7 @@ def chat():
             "status": "ok",
             "response": result["final_response"],
             "agent_outputs": result["agent_outputs"],
+            "context": result["context"],
             "persona_active": current_config["persona_active"],
             "persona_name": current_config["persona_name"]
         })
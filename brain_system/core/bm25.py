@@ -0,0 +1,220 @@
+"""
+Compact inverted index with BM25 ranking.
+
+Complements embedding search with exact lexical matching, which catches
+names, dates, and places ("Robben Island", "1905") that dense vectors
+tend to blur.
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Collection, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# English function words; a match on these alone says nothing about topic
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers herself him
+himself his how i if in into is it its itself just me more most my myself no
+nor not now of off on once only or other our ours ourselves out over own same
+she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what when
+where which while who whom why will with would you your yours yourself
+yourselves
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens (letters, digits, underscore)."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def term_counts(text: str) -> Dict[str, int]:
+    """Term frequencies of *text*, as :meth:`BM25Index.add_terms` takes them."""
+    return Counter(tokenize(text))
+
+
+class BM25Index:
+    """In-memory inverted index: term → {doc_id: term frequency}."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[Hashable, int]] = {}
+        self._doc_len: Dict[Hashable, int] = {}
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._doc_len
+
+    def add(self, doc_id: Hashable, text: str):
+        """Index *text* under *doc_id* (replacing any previous version)."""
+        self.add_terms(doc_id, term_counts(text))
+
+    def add_terms(self, doc_id: Hashable, terms: Dict[str, int]):
+        """Index a document given its ``{term: frequency}`` counts."""
+        if doc_id in self._doc_len:
+            self.remove(doc_id)
+
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+        length = sum(terms.values())
+        self._doc_len[doc_id] = length
+        self._total_len += length
+
+    def remove(self, doc_id: Hashable, text: str = None):
+        """Drop *doc_id* from the index.
+
+        Passing the original *text* avoids a scan over every posting list.
+        """
+        self.remove_terms(doc_id, set(tokenize(text)) if text is not None else None)
+
+    def remove_terms(self, doc_id: Hashable, terms: Optional[Iterable[str]] = None):
+        """Drop *doc_id*, whose terms are *terms* (every posting list if None)."""
+        length = self._doc_len.pop(doc_id, None)
+        if length is None:
+            return
+        self._total_len -= length
+
+        for term in (terms if terms is not None else list(self._postings)):
+            posting = self._postings.get(term)
+            if posting is not None and posting.pop(doc_id, None) is not None:
+                if not posting:
+                    del self._postings[term]
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[Hashable, float]]:
+        """Return up to *top_k* ``(doc_id, score)`` pairs, best first."""
+        ranked = sorted(self.scores(query).items(), key=lambda item: item[1], reverse=True)
+        return ranked[:top_k]
+
+    def scores(
+        self,
+        query: str,
+        max_df: float = None,
+        fallback: bool = True,
+        ignore: Collection[str] = (),
+    ) -> Dict[Hashable, float]:
+        """BM25 score of every document containing a term of *query*.
+
+        With *max_df*, query terms found in more than that fraction of the
+        documents (stopwords, mostly) are ignored, unless every term is
+        (and *fallback* is set); their long posting lists would dominate
+        the cost of the query while adding little to the ranking.  Terms
+        in *ignore* (e.g. :data:`STOPWORDS`) never count.
+        """
+        n_docs = len(self._doc_len)
+        if n_docs == 0:
+            return {}
+
+        postings = [
+            posting for posting in (
+                self._postings.get(term) for term in set(tokenize(query)) if term not in ignore
+            )
+            if posting
+        ]
+        if max_df is not None:
+            rare = [posting for posting in postings if len(posting) <= max_df * n_docs]
+            postings = rare or (postings if fallback else [])
+
+        avg_len = self._total_len / n_docs
+        scores: Dict[Hashable, float] = {}
+        for posting in postings:
+            df = len(posting)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in posting.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def documents(self) -> Iterator[Tuple[Hashable, Dict[str, int]]]:
+        """``(doc_id, {term: frequency})`` for every indexed document."""
+        terms: Dict[Hashable, Dict[str, int]] = {doc_id: {} for doc_id in self._doc_len}
+        for term, posting in self._postings.items():
+            for doc_id, tf in posting.items():
+                terms[doc_id][term] = tf
+        return iter(terms.items())
+
+
+class BM25Log:
+    """Append-only file recording the changes to a :class:`BM25Index`.
+
+    A JSON Lines file: the BM25 parameters, then one line per document
+    added (``["+", doc_id, {term: tf}]``) or removed (``["-", doc_id,
+    [term, ...]]``).  Writers only append, so indexing more documents never
+    rewrites what is on disk and the index need not be in memory while it
+    is built.  :meth:`load` replays the log into an index; :meth:`compact`
+    rewrites it with only the documents still live.  Document ids must be
+    JSON strings or numbers.  Not thread-safe.
+    """
+
+    def __init__(self, path: str, k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._file = None
+
+    def add(self, doc_id: Hashable, terms: Dict[str, int]):
+        self._write(["+", doc_id, terms])
+
+    def remove(self, doc_id: Hashable, terms: Optional[Iterable[str]] = None):
+        self._write(["-", doc_id, sorted(terms) if terms is not None else None])
+
+    def _write(self, entry):
+        if self._file is None:
+            new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._file = open(self.path, "a", encoding="utf-8")
+            if new:
+                self._file.write(json.dumps({"k1": self.k1, "b": self.b}) + "\n")
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def load(self) -> BM25Index:
+        """Replay the log into a new index (empty if there is no log).
+
+        A line cut short by a crash ends the replay.
+        """
+        self.flush()
+        try:
+            f = open(self.path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return BM25Index(self.k1, self.b)
+        with f:
+            header = json.loads(f.readline() or "{}")
+            index = BM25Index(header.get("k1", self.k1), header.get("b", self.b))
+            for line in f:
+                try:
+                    op, doc_id, terms = json.loads(line)
+                except ValueError:
+                    break
+                if op == "+":
+                    index.add_terms(doc_id, terms)
+                else:
+                    index.remove_terms(doc_id, terms)
+        return index
+
+    def compact(self, index: BM25Index):
+        """Rewrite the log as the additions of *index*'s live documents."""
+        self.close()
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"k1": index.k1, "b": index.b}) + "\n")
+            for doc_id, terms in index.documents():
+                f.write(json.dumps(["+", doc_id, terms], separators=(",", ":")) + "\n")
+        os.replace(temp_path, self.path)
@@ -0,0 +1,291 @@
+"""
+Offset-based, sentence-aware text chunking.
+
+Chunks are described by ``(start, end)`` offsets into the source text, so
+they can be stored as provenance and no intermediate strings are grown
+while grouping sentences.  Chunk size is measured by a pluggable function:
+characters by default, or tokens via :func:`token_counter` so chunks line
+up with the embedding model's truncation limit.
+"""
+
+import re
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+# Sentence boundary — handles Mr./Mrs./Dr. abbreviations
+_BOUNDARY_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z\"\'\u201c(])")
+_WORD_RE = re.compile(r"\S+")
+
+SizeMeasure = Callable[[str], int]
+
+
+class ChunkSpan(NamedTuple):
+    """A chunk of source text: absolute offsets plus whitespace-normalized text."""
+
+    start: int
+    end: int
+    text: str
+
+
+def char_length(text: str) -> int:
+    """Size measure counting characters."""
+    return len(text)
+
+
+def whitespace_tokens(text: str) -> int:
+    """Size measure counting whitespace-separated words (cheap token proxy)."""
+    return len(text.split())
+
+
+def token_counter(tokenizer) -> SizeMeasure:
+    """Size measure counting tokens with a tokenizer's ``encode`` method.
+
+    Works with Hugging Face tokenizers (special tokens are excluded) and
+    any object whose ``encode(text)`` returns a sequence of token ids.
+    """
+    def count(text: str) -> int:
+        try:
+            return len(tokenizer.encode(text, add_special_tokens=False))
+        except TypeError:
+            return len(tokenizer.encode(text))
+    tokenizer_name = getattr(tokenizer, "name_or_path", None) or type(tokenizer).__qualname__
+    count.measure_name = f"tokens:{tokenizer_name}"
+    return count
+
+
+def measure_name(measure: SizeMeasure) -> str:
+    """Stable name of a size measure, identifying the tokenizer it counts with.
+
+    Used to tell chunkings apart: measures from :func:`token_counter` are
+    named after their tokenizer's model, others after the function.
+    """
+    return getattr(measure, "measure_name", None) or (
+        f"{getattr(measure, '__module__', '')}.{getattr(measure, '__qualname__', type(measure).__qualname__)}"
+    )
+
+
+class SentenceChunker:
+    """Incremental sentence chunker over a stream of text blocks.
+
+    Feed blocks with :meth:`feed` and call :meth:`finish` at the end; both
+    yield :class:`ChunkSpan` objects whose offsets refer to the
+    concatenation of every block fed so far.  Only the text of the chunk in
+    progress plus roughly one *window* of unscanned input is retained.
+
+    Sentences are grouped until adding the next one would exceed
+    *chunk_size* (in units of *measure*).  Each chunk after the first starts
+    with a word-aligned tail of at most *overlap* units from the previous
+    chunk.  Sentences larger than *chunk_size* are split at word boundaries.
+    Chunks shorter than *min_chars* characters are dropped.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 500,
+        overlap: int = 50,
+        measure: SizeMeasure = char_length,
+        window: int = 64 * 1024,
+        min_chars: int = 30,
+    ):
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.measure = measure
+        self.window = window
+        self.min_chars = min_chars
+
+        # Cost of the single space that joins two sentences in a chunk
+        self._sep = measure(" ")
+
+        self._buffer = ""
+        self._base = 0       # absolute offset of _buffer[0]
+        self._scanned = 0    # buffer offset up to which sentences are consumed
+
+        self._chunk_start: Optional[int] = None   # absolute offsets
+        self._chunk_end = 0
+        self._chunk_used = 0
+        self._ready: List[ChunkSpan] = []
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def feed(self, block: str) -> Iterator[ChunkSpan]:
+        """Add a block of text and yield every chunk completed by it."""
+        self._buffer += block
+        if len(self._buffer) - self._scanned >= self.window:
+            self._scan(final=False)
+            self._compact()
+        yield from self._drain()
+
+    def finish(self) -> Iterator[ChunkSpan]:
+        """Flush the remaining text and the chunk in progress."""
+        self._scan(final=True)
+        if self._chunk_start is not None:
+            self._emit()
+            self._chunk_start = None
+        yield from self._drain()
+
+    def chunk(self, text: str) -> List[ChunkSpan]:
+        """Chunk a complete text in one call."""
+        spans = list(self.feed(text))
+        spans.extend(self.finish())
+        return spans
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    def _scan(self, final: bool):
+        """Consume complete sentences from the unscanned part of the buffer."""
+        buffer = self._buffer
+        position = self._scanned
+        for match in _BOUNDARY_RE.finditer(buffer, self._scanned):
+            self._add_sentence(position, match.start())
+            position = match.end()
+
+        if final:
+            self._add_sentence(position, len(buffer))
+            position = len(buffer)
+        elif len(buffer) - position > 4 * self.window:
+            # No sentence boundary for a long stretch: cut at a space
+            cut = buffer.rfind(" ", position + 1, position + self.window)
+            cut = cut if cut != -1 else position + self.window
+            self._add_sentence(position, cut)
+            position = cut
+
+        self._scanned = position
+
+    def _compact(self):
+        """Drop buffered text that no chunk can refer to any more."""
+        keep = self._scanned
+        if self._chunk_start is not None:
+            keep = min(keep, self._chunk_start - self._base)
+        if keep > 0:
+            self._buffer = self._buffer[keep:]
+            self._base += keep
+            self._scanned -= keep
+
+    def _add_sentence(self, start: int, end: int):
+        """Add buffer range [start, end) as one sentence (whitespace-trimmed)."""
+        buffer = self._buffer
+        while start < end and buffer[start].isspace():
+            start += 1
+        while end > start and buffer[end - 1].isspace():
+            end -= 1
+        if start == end:
+            return
+
+        size = self.measure(buffer[start:end])
+        if size <= self.chunk_size:
+            self._add_piece(start, end, size)
+            return
+
+        # Oversized sentence: split into word-aligned pieces, leaving room
+        # for the overlap tail that will precede each piece
+        limit = self.chunk_size - max(self.overlap, 0) - self._sep
+        limit = limit if limit > 0 else self.chunk_size
+        piece_start, piece_end, piece_used = None, 0, 0
+        for word in _WORD_RE.finditer(buffer, start, end):
+            word_size = self.measure(word.group())
+            if piece_start is not None and piece_used + self._sep + word_size > limit:
+                self._add_piece(piece_start, piece_end, piece_used)
+                piece_start = None
+            if piece_start is None:
+                piece_start, piece_used = word.start(), word_size
+            else:
+                piece_used += self._sep + word_size
+            piece_end = word.end()
+        if piece_start is not None:
+            self._add_piece(piece_start, piece_end, piece_used)
+
+    # ------------------------------------------------------------------
+    # Grouping
+    # ------------------------------------------------------------------
+
+    def _add_piece(self, start: int, end: int, size: int):
+        """Append buffer range [start, end) of *size* units to the chunk."""
+        start += self._base
+        end += self._base
+
+        if self._chunk_start is None:
+            self._chunk_start, self._chunk_end, self._chunk_used = start, end, size
+            return
+
+        if self._chunk_used + self._sep + size <= self.chunk_size:
+            self._chunk_end = end
+            self._chunk_used += self._sep + size
+            return
+
+        self._emit()
+        tail_start, tail_used = self._overlap_tail()
+        if tail_start is None or tail_used + self._sep + size > self.chunk_size:
+            self._chunk_start, self._chunk_used = start, size
+        else:
+            self._chunk_start = tail_start
+            self._chunk_used = tail_used + self._sep + size
+        self._chunk_end = end
+
+    def _overlap_tail(self):
+        """Earliest word start in the current chunk whose tail fits *overlap*.
+
+        Returns ``(absolute_start, size)`` or ``(None, 0)`` for no overlap.
+        """
+        if self.overlap <= 0:
+            return None, 0
+
+        buffer = self._buffer
+        lower = self._chunk_start - self._base
+        end = self._chunk_end - self._base
+        best, best_used = None, 0
+
+        space = end
+        while True:
+            space = buffer.rfind(" ", lower + 1, space)
+            if space == -1:
+                break
+            start = space + 1
+            if start >= end:
+                continue
+            used = self.measure(buffer[start:end])
+            if used > self.overlap:
+                break
+            best, best_used = start, used
+
+        if best is None:
+            return None, 0
+        return best + self._base, best_used
+
+    def _emit(self):
+        start = self._chunk_start - self._base
+        end = self._chunk_end - self._base
+        text = " ".join(self._buffer[start:end].split())
+        if len(text) >= self.min_chars:
+            self._ready.append(ChunkSpan(self._chunk_start, self._chunk_end, text))
+
+    def _drain(self) -> Iterator[ChunkSpan]:
+        ready, self._ready = self._ready, []
+        yield from ready
+
+
+def chunk_spans(
+    text: str,
+    chunk_size: int = 500,
+    overlap: int = 50,
+    measure: SizeMeasure = char_length,
+) -> List[ChunkSpan]:
+    """Chunk *text* into overlapping sentence-aligned spans."""
+    chunker = SentenceChunker(chunk_size, overlap, measure, window=len(text) + 1)
+    return chunker.chunk(text)
+
+
+def iter_chunk_spans(
+    blocks: Iterable[str],
+    chunk_size: int = 500,
+    overlap: int = 50,
+    measure: SizeMeasure = char_length,
+    window: int = 64 * 1024,
+) -> Iterator[ChunkSpan]:
+    """Chunk a stream of text blocks, holding only a bounded window in memory."""
+    chunker = SentenceChunker(chunk_size, overlap, measure, window=window)
+    for block in blocks:
+        yield from chunker.feed(block)
+    yield from chunker.finish()
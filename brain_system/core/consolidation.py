@@ -0,0 +1,263 @@
+"""
+Memory consolidation — moves old conversation into long-term memory.
+
+Models the Hippocampus's offline consolidation: turns that fall out of
+working memory are summarized in batches on a background thread, and the
+summaries are indexed into a vector collection for the current session,
+so earlier parts of a long conversation stay retrievable while the prompt
+only ever carries the recent window.
+"""
+
+import atexit
+import os
+import queue
+import shutil
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .vector_memory import VectorMemory
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows: stale sessions are not swept
+    FCNTL_AVAILABLE = False
+
+Turn = Tuple[str, str]
+
+
+class MemoryConsolidator:
+    """Summarizes evicted turns into a per-session vector collection.
+
+    :meth:`add_turns` only buffers turns; every ``batch_turns`` of them are
+    handed to a worker thread that calls *summarize* (a list of
+    ``(user_message, brain_response)`` turns in, one summary out) and adds
+    the summary to the session's collection.  If summarizing fails the
+    plain transcript is indexed instead, so no turn is lost.
+
+    :meth:`search` retrieves summaries relevant to a query; :meth:`flush`
+    consolidates everything buffered and waits for the worker.
+
+    A session started with a *session_id* is kept on disk and resumed by
+    the next consolidator given the same id; :meth:`close` (also run at
+    interpreter exit) consolidates its buffered turns first.  A session
+    without one is deleted on close, buffered turns included.
+
+    Sessions are stored under *storage_dir*, ``.brain_session_store`` in
+    the working directory by default, apart from the persona indexes.
+    Each unnamed session gets its own directory under ``unnamed/``, locked
+    while it is open; directories a crashed process left behind are
+    deleted when the next consolidator starts.
+    """
+
+    # Default storage, in the working directory
+    STORE_DIR = ".brain_session_store"
+    # Before sessions had their own store
+    LEGACY_STORE_DIR = os.path.join(".brain_vector_store", "sessions")
+    # Directory of unnamed sessions, and the lock file held in each
+    UNNAMED_DIR = "unnamed"
+    LOCK_FILE = ".lock"
+
+    # Evicted turns summarized together
+    BATCH_TURNS = 5
+
+    # Summaries returned per search, and the cosine similarity they need
+    SEARCH_TOP_K = 2
+    MIN_SIMILARITY = 0.3
+
+    # Source label of summaries in the session collection
+    SOURCE = "consolidated"
+
+    # Queue sentinel that stops the worker
+    _STOP = object()
+
+    def __init__(
+        self,
+        summarize: Callable[[List[Turn]], str],
+        session_id: Optional[str] = None,
+        storage_dir: Optional[str] = None,
+        embedder_source: Optional[VectorMemory] = None,
+        batch_turns: int = BATCH_TURNS,
+    ):
+        self.summarize = summarize
+        self.batch_turns = max(1, batch_turns)
+        # A new, temporary collection per session unless one is named
+        self.persistent = session_id is not None
+        self.session_id = session_id or (
+            f"{datetime.now():%Y%m%d%H%M%S}_{uuid.uuid4().hex[:6]}"
+        )
+        self.collection = f"session_{self.session_id}"
+
+        if storage_dir is None:
+            storage_dir = os.path.join(os.getcwd(), self.STORE_DIR)
+            self._migrate(storage_dir, os.path.join(os.getcwd(), self.LEGACY_STORE_DIR))
+        self._sweep_unnamed(storage_dir)
+        self._lock_fd: Optional[int] = None
+        self._session_dir: Optional[str] = None
+        if not self.persistent:
+            self._session_dir = os.path.join(storage_dir, self.UNNAMED_DIR, self.session_id)
+            storage_dir = self._session_dir
+            self._lock_session()
+
+        self.vector_memory = VectorMemory(storage_dir=storage_dir)
+        if embedder_source is not None:
+            self.vector_memory.share_embedder(embedder_source)
+        self.vector_memory.activate(self.collection)
+
+        self._pending: List[Turn] = []
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._stats = {"turns": 0, "summaries": 0, "failures": 0}
+
+    @staticmethod
+    def _migrate(storage_dir: str, legacy_dir: str):
+        """Move named sessions out of the persona store they used to share."""
+        if os.path.isdir(legacy_dir) and not os.path.exists(storage_dir):
+            os.replace(legacy_dir, storage_dir)
+
+    @classmethod
+    def _sweep_unnamed(cls, storage_dir: str):
+        """Delete unnamed sessions whose process exited without closing them."""
+        unnamed = os.path.join(storage_dir, cls.UNNAMED_DIR)
+        if not FCNTL_AVAILABLE or not os.path.isdir(unnamed):
+            return
+        for entry in os.listdir(unnamed):
+            path = os.path.join(unnamed, entry)
+            try:
+                # No lock file yet: the session is still being created
+                fd = os.open(os.path.join(path, cls.LOCK_FILE), os.O_RDWR)
+            except OSError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # Still open in a live process
+                os.close(fd)
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            os.close(fd)
+
+    def _lock_session(self):
+        """Mark this unnamed session's directory as in use until :meth:`close`."""
+        lock_path = os.path.join(self._session_dir, self.LOCK_FILE)
+        while True:
+            os.makedirs(self._session_dir, exist_ok=True)
+            if not FCNTL_AVAILABLE:
+                return
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            # A sweep may have deleted the directory before the lock was held
+            try:
+                if os.stat(lock_path).st_ino == os.fstat(fd).st_ino:
+                    self._lock_fd = fd
+                    return
+            except FileNotFoundError:
+                pass
+            os.close(fd)
+
+    def add_turns(self, turns: List[Turn]):
+        """Buffer evicted turns; full batches are queued for consolidation."""
+        with self._lock:
+            self._pending.extend(turns)
+            while len(self._pending) >= self.batch_turns:
+                batch = self._pending[:self.batch_turns]
+                del self._pending[:self.batch_turns]
+                self._submit(batch)
+
+    def _submit(self, batch: List[Turn]):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._run, name="memory-consolidation", daemon=True
+            )
+            self._worker.start()
+            atexit.register(self.close)
+        self._queue.put(batch)
+
+    def _run(self):
+        """Worker: summarize and index queued batches until stopped."""
+        while True:
+            batch = self._queue.get()
+            try:
+                if batch is self._STOP:
+                    return
+                self._consolidate(batch)
+            except Exception as e:
+                self._stats["failures"] += 1
+                print(f"⚠️  Failed to consolidate {len(batch)} turns: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _consolidate(self, batch: List[Turn]):
+        try:
+            summary = self.summarize(batch).strip()
+        except Exception as e:
+            print(f"⚠️  Summarizing {len(batch)} turns failed ({e}); indexing the transcript")
+            summary = ""
+        if not summary:
+            summary = self.transcript(batch)
+        self.vector_memory.add_documents([summary], self.SOURCE, persona_name=self.collection)
+        self._stats["turns"] += len(batch)
+        self._stats["summaries"] += 1
+
+    @staticmethod
+    def transcript(turns: List[Turn]) -> str:
+        """Turns formatted as "User: ... / Brain: ..." lines."""
+        return "\n".join(
+            f"User: {user_msg}\nBrain: {brain_resp}" for user_msg, brain_resp in turns
+        )
+
+    def search(self, query: str, top_k: int = SEARCH_TOP_K) -> List[str]:
+        """Summaries of earlier turns relevant to *query*, best first."""
+        if not self.vector_memory.ready:
+            return []
+        return self.vector_memory.search(query, top_k=top_k, min_score=self.MIN_SIMILARITY)
+
+    def flush(self):
+        """Consolidate all buffered turns, then wait for the worker."""
+        with self._lock:
+            if self._pending:
+                self._submit(self._pending)
+                self._pending = []
+        self._queue.join()
+
+    def clear(self):
+        """Drop buffered turns and delete this session's summaries."""
+        with self._lock:
+            self._pending = []
+        self._queue.join()
+        if self.vector_memory.ready:
+            self.vector_memory.clear()
+
+    def close(self):
+        """Stop the worker and close the collection.
+
+        A persistent session consolidates its buffered turns first; any
+        other is deleted from disk.
+        """
+        if self.persistent:
+            self.flush()
+        else:
+            with self._lock:
+                self._pending = []
+            self._queue.join()
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(self._STOP)
+            self._worker.join()
+        self._worker = None
+        atexit.unregister(self.close)
+        if not self.persistent and self.vector_memory.ready:
+            self.vector_memory.clear()
+        self.vector_memory.close()
+        if self._session_dir is not None:
+            shutil.rmtree(self._session_dir, ignore_errors=True)
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Turns consolidated, summaries indexed, failed batches, turns waiting."""
+        return dict(self._stats, pending=len(self._pending))
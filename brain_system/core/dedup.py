@@ -0,0 +1,174 @@
+"""
+Near-duplicate detection with MinHash and locality-sensitive hashing.
+
+Biographies extracted from PDFs repeat running headers, footers and quoted
+passages, and every copy would otherwise be embedded and indexed as its own
+chunk.  Each text is reduced to a MinHash signature over its word shingles;
+signatures are split into bands, and only texts sharing a band bucket are
+compared, so checking a new chunk costs the same whatever the corpus size.
+"""
+
+import zlib
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .bm25 import tokenize
+
+# Mersenne prime for the universal hash family h(x) = (a*x + b) mod p.
+# Shingle hashes are 32-bit, so a*x + b stays below 2**63.
+_PRIME = (1 << 31) - 1
+
+
+def shingles(text: str, size: int = 5) -> List[str]:
+    """Overlapping word *size*-grams of *text* (the whole text if shorter)."""
+    words = tokenize(text)
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def _band_layout(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Bands x rows splitting *num_perm* whose S-curve crosses near *threshold*.
+
+    Two texts of Jaccard similarity s share a bucket with probability
+    1 - (1 - s**rows)**bands, which rises steepest around
+    (1 / bands) ** (1 / rows).
+    """
+    layouts = [
+        (num_perm // rows, rows)
+        for rows in range(1, num_perm + 1)
+        if num_perm % rows == 0
+    ]
+    return min(layouts, key=lambda layout: abs((1 / layout[0]) ** (1 / layout[1]) - threshold))
+
+
+class MinHashDeduplicator:
+    """Streaming near-duplicate filter.
+
+    :meth:`is_duplicate` reports whether a text's estimated Jaccard
+    similarity to any text seen before reaches *threshold*, and remembers
+    it otherwise.
+
+    Signatures are not kept.  Each remembered text costs about 640 bytes
+    with the default 128 permutations: for every band, a 64-bit hash of
+    its rows and the text's 32-bit position, held in sorted arrays, and
+    the low 16 bits of each signature value.  Candidates sharing a band
+    hash with a new text are compared on those 16-bit values, which a
+    pair of unequal 31-bit values shares only once in 65536.
+    """
+
+    # Band hashes buffered before they are merged into the sorted arrays
+    MERGE_EVERY = 16384
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        shingle_size: int = 5,
+        seed: int = 1,
+    ):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _band_layout(threshold, num_perm)
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+        # Band hash: sum(row value * odd multiplier) + per-band salt, mod 2**64
+        self._mix = rng.integers(1, 1 << 63, self.rows, dtype=np.uint64) | np.uint64(1)
+        self._salt = rng.integers(0, 1 << 63, self.bands, dtype=np.uint64)
+
+        # Band hashes of remembered texts, sorted, and the text each is from
+        self._keys = np.empty(0, dtype=np.uint64)
+        self._owners = np.empty(0, dtype=np.int32)
+        # Band hashes of the texts remembered since the last merge, a row each
+        self._pending = np.empty((max(1, self.MERGE_EVERY // self.bands), self.bands), dtype=np.uint64)
+        self._pending_count = 0
+        # Low 16 bits of each signature value, 2 * num_perm bytes per text
+        self._sketches = bytearray()
+
+        self._count = 0
+        self.checked = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of *text*, or an empty array if it has no words."""
+        grams = shingles(text, self.shingle_size)
+        if not grams:
+            return np.empty(0, dtype=np.uint64)
+        hashes = np.fromiter(
+            (zlib.crc32(gram.encode("utf-8")) for gram in grams),
+            dtype=np.uint64, count=len(grams),
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % _PRIME
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> np.ndarray:
+        bands = signature.reshape(self.bands, self.rows)
+        return (bands * self._mix).sum(axis=1, dtype=np.uint64) + self._salt
+
+    def _shared_bands(self, keys: np.ndarray) -> Dict[int, int]:
+        """``{position: bands shared with *keys*}`` for remembered texts."""
+        shared: Dict[int, int] = {}
+        lows = np.searchsorted(self._keys, keys, side="left")
+        highs = np.searchsorted(self._keys, keys, side="right")
+        for band in np.flatnonzero(highs > lows).tolist():
+            for owner in self._owners[lows[band]:highs[band]].tolist():
+                shared[owner] = shared.get(owner, 0) + 1
+
+        # Texts since the last merge are numbered on from those merged
+        first_pending = self._count - self._pending_count
+        matches = (self._pending[:self._pending_count] == keys).sum(axis=1)
+        for row in np.flatnonzero(matches).tolist():
+            shared[first_pending + row] = int(matches[row])
+        return shared
+
+    def _similarity(self, position: int, sketch: bytes) -> float:
+        start = position * len(sketch)
+        stored = np.frombuffer(self._sketches[start:start + len(sketch)], dtype=np.uint16)
+        return float(np.mean(stored == np.frombuffer(sketch, dtype=np.uint16)))
+
+    def is_duplicate(self, text: str) -> bool:
+        """True if *text* nearly duplicates an earlier one; otherwise record it."""
+        self.checked += 1
+        signature = self.signature(text)
+        if len(signature) == 0:
+            return False
+
+        keys = self._band_keys(signature)
+        sketch = signature.astype(np.uint16).tobytes()
+        shared = self._shared_bands(keys)
+        for position in sorted(shared, key=shared.get, reverse=True):
+            if self._similarity(position, sketch) >= self.threshold:
+                self.dropped += 1
+                return True
+
+        self._remember(keys, sketch)
+        return False
+
+    def _remember(self, keys: np.ndarray, sketch: bytes):
+        self._count += 1
+        self._sketches += sketch
+        self._pending[self._pending_count] = keys
+        self._pending_count += 1
+        if self._pending_count == len(self._pending):
+            self._merge()
+
+    def _merge(self):
+        """Move the buffered band hashes into the sorted arrays."""
+        first = self._count - self._pending_count
+        keys = self._pending[:self._pending_count].ravel()
+        owners = np.repeat(np.arange(first, self._count, dtype=np.int32), self.bands)
+        order = np.argsort(keys, kind="stable")
+        keys, owners = keys[order], owners[order]
+        at = np.searchsorted(self._keys, keys)
+        self._keys = np.insert(self._keys, at, keys)
+        self._owners = np.insert(self._owners, at, owners)
+        self._pending_count = 0
@@ -1,13 +1,73 @@
 
+import hashlib
+import json
+import multiprocessing
 import os
-from typing import List
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+
+# Serializes updates of the text cache's fingerprint index in this process
+_CACHE_INDEX_LOCK = threading.Lock()
+
+# Extraction workers shared by every PDF read in this process, started on
+# first use and kept, since starting them costs more than a short document
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+
+
+def _extract_pages(filepath: str, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) of a PDF, "" for pages without text.
+
+    Module-level so a process pool can run it; each call opens its own
+    reader.
+    """
+    import PyPDF2
+    with open(filepath, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        return [reader.pages[number].extract_text() or "" for number in range(start, stop)]
 
 
 class DocumentLoader:
-    """Loads and chunks text/PDF documents for persona extraction."""
+    """Loads and chunks text/PDF documents for persona extraction.
+
+    Text extracted from a PDF is cached under ``CACHE_DIR`` as plain UTF-8
+    (pages separated by form feeds), named by the SHA-256 of the PDF's
+    bytes.  An index maps each path, size and modification time to that
+    hash (and the page count, once a reader has opened the file), so a
+    known, unchanged PDF is neither hashed nor parsed again:
+    :meth:`fingerprint`, :meth:`count_blocks` and every text method read
+    the cache instead of PyPDF2.  A moved or touched file with the same
+    bytes is re-hashed and still hits the cache.
+    """
 
     SUPPORTED_EXTENSIONS = [".txt", ".pdf"]
 
+    # Characters per block when streaming plain-text files
+    BLOCK_SIZE = 64 * 1024
+
+    # Parallel PDF extraction: pages per worker task, the page count below
+    # which a pool isn't worth starting, and how many tasks per worker may
+    # run ahead of the consumer
+    PAGES_PER_TASK = 16
+    PARALLEL_MIN_PAGES = 48
+    TASKS_AHEAD = 2
+
+    # Workers are never forked from this process, which may be running
+    # indexing threads and a loaded model: forking it can deadlock them
+    POOL_START_METHOD = (
+        "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+
+    # Extracted-text cache, relative to the working directory (None: off)
+    CACHE_DIR: Optional[str] = ".brain_text_cache"
+    CACHE_INDEX = "index.json"
+    PAGE_BREAK = "\f"
+
     @staticmethod
     def load(filepath: str) -> str:
         """
@@ -29,30 +89,345 @@ class DocumentLoader:
                 f"Supported: {DocumentLoader.SUPPORTED_EXTENSIONS}"
             )
 
+    @staticmethod
+    def iter_text(filepath: str, workers: Optional[int] = None) -> Iterator[str]:
+        """
+        Stream a document's text in bounded blocks (PDF pages, or
+        ``BLOCK_SIZE`` slices of a text file) without loading it whole.
+        Concatenating the blocks yields the same text as :meth:`load`.
+        PDF pages are extracted as by :meth:`iter_pages`.
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"Document not found: {filepath}")
+
+        ext = os.path.splitext(filepath)[1].lower()
+
+        if ext == ".txt":
+            return DocumentLoader._iter_txt(filepath)
+        elif ext == ".pdf":
+            return DocumentLoader._iter_pdf(filepath, workers)
+        else:
+            raise ValueError(
+                f"Unsupported file type: {ext}. "
+                f"Supported: {DocumentLoader.SUPPORTED_EXTENSIONS}"
+            )
+
+    @staticmethod
+    def iter_pages(filepath: str, workers: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield the text of every page of a PDF in page order, "" for pages
+        without text, as soon as each page is extracted.
+
+        Pages are extracted ``PAGES_PER_TASK`` at a time by a pool of
+        *workers* processes (one per CPU by default), with at most
+        ``TASKS_AHEAD`` tasks per worker ahead of the consumer.  The pool
+        is started on first use and shared by later reads in this process
+        (see :meth:`close_pool`).  Short documents, or ``workers=1``, are
+        extracted in this process.
+
+        A document already in the text cache is read from it; otherwise
+        it is added to the cache once every page has been extracted.
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"Document not found: {filepath}")
+        if os.path.splitext(filepath)[1].lower() != ".pdf":
+            raise ValueError(f"Not a PDF: {filepath}")
+
+        cache_dir = DocumentLoader._cache_dir()
+        if cache_dir is None:
+            digest = None
+        else:
+            digest = DocumentLoader.fingerprint(filepath)
+            cached_pages = DocumentLoader._cached_page_count(cache_dir, digest)
+            if cached_pages is not None:
+                return DocumentLoader._iter_cached_pages(cache_dir, digest, cached_pages)
+
+        DocumentLoader._require_pypdf2()
+        workers = workers or os.cpu_count() or 1
+        page_count = 0 if workers <= 1 else DocumentLoader._pdf_page_count(filepath)
+        if page_count < DocumentLoader.PARALLEL_MIN_PAGES:
+            pages = DocumentLoader._iter_pages_serial(filepath)
+        else:
+            pages = DocumentLoader._iter_pages_parallel(filepath, page_count, workers)
+        if digest is None:
+            return pages
+        return DocumentLoader._caching_pages(pages, cache_dir, digest, filepath)
+
+    @staticmethod
+    def load_head(filepath: str, max_chars: int) -> str:
+        """Return at most the first *max_chars* characters of a document.
+
+        Only the pages holding them are extracted from a PDF not yet in
+        the text cache; the whole text is cached by the first full read
+        (:meth:`iter_text`).
+        """
+        parts = []
+        remaining = max_chars
+        # Only the first pages are needed, so don't extract ahead in a pool
+        for block in DocumentLoader.iter_text(filepath, workers=1):
+            parts.append(block[:remaining])
+            remaining -= len(parts[-1])
+            if remaining <= 0:
+                break
+        return "".join(parts)
+
+    @staticmethod
+    def count_blocks(filepath: str) -> int:
+        """Upper bound on the number of blocks :meth:`iter_text` yields."""
+        ext = os.path.splitext(filepath)[1].lower()
+        if ext == ".pdf":
+            try:
+                return DocumentLoader._pdf_page_count(filepath)
+            except ImportError:
+                return 0
+        size = os.path.getsize(filepath)
+        return -(-size // DocumentLoader.BLOCK_SIZE)
+
+    @staticmethod
+    def fingerprint(filepath: str) -> str:
+        """SHA-256 of the file's bytes, read in blocks.
+
+        With the text cache on, the hash is remembered per path, size and
+        modification time, and only recomputed when one of them changes.
+        """
+        cache_dir = DocumentLoader._cache_dir()
+        stat = os.stat(filepath)
+        key = os.path.abspath(filepath)
+        if cache_dir is not None:
+            known = DocumentLoader._read_cache_index(cache_dir).get(key)
+            if known and known.get("size") == stat.st_size and known.get("mtime_ns") == stat.st_mtime_ns:
+                return known["sha256"]
+
+        digest = hashlib.sha256()
+        with open(filepath, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+
+        if cache_dir is not None:
+            with _CACHE_INDEX_LOCK:
+                index = DocumentLoader._read_cache_index(cache_dir)
+                index[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+                DocumentLoader._write_json(os.path.join(cache_dir, DocumentLoader.CACHE_INDEX), index)
+        return sha256
+
+    # ------------------------------------------------------------------
+    # Extracted-text cache
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _cache_dir() -> Optional[str]:
+        if DocumentLoader.CACHE_DIR is None:
+            return None
+        cache_dir = os.path.abspath(DocumentLoader.CACHE_DIR)
+        os.makedirs(cache_dir, exist_ok=True)
+        return cache_dir
+
+    @staticmethod
+    def _read_cache_index(cache_dir: str) -> Dict[str, Dict]:
+        try:
+            with open(os.path.join(cache_dir, DocumentLoader.CACHE_INDEX), "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return index if isinstance(index, dict) else {}
+
+    @staticmethod
+    def _write_json(path: str, data) -> None:
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _pdf_page_count(filepath: str) -> int:
+        """Pages of a PDF, from the cache index if a reader has opened it."""
+        cache_dir = DocumentLoader._cache_dir()
+        if cache_dir is not None:
+            stat = os.stat(filepath)
+            known = DocumentLoader._read_cache_index(cache_dir).get(os.path.abspath(filepath))
+            if (
+                known and isinstance(known.get("pages"), int)
+                and known.get("size") == stat.st_size and known.get("mtime_ns") == stat.st_mtime_ns
+            ):
+                return known["pages"]
+        import PyPDF2
+        with open(filepath, "rb") as f:
+            pages = len(PyPDF2.PdfReader(f).pages)
+        DocumentLoader._remember_page_count(filepath, pages)
+        return pages
+
+    @staticmethod
+    def _remember_page_count(filepath: str, pages: int) -> None:
+        """Record a PDF's page count in its cache index entry, if it has one."""
+        cache_dir = DocumentLoader._cache_dir()
+        if cache_dir is None:
+            return
+        stat = os.stat(filepath)
+        key = os.path.abspath(filepath)
+        with _CACHE_INDEX_LOCK:
+            index = DocumentLoader._read_cache_index(cache_dir)
+            known = index.get(key)
+            if not known or known.get("size") != stat.st_size or known.get("mtime_ns") != stat.st_mtime_ns:
+                return
+            known["pages"] = pages
+            DocumentLoader._write_json(os.path.join(cache_dir, DocumentLoader.CACHE_INDEX), index)
+
+    @staticmethod
+    def _cached_page_count(cache_dir: str, digest: str) -> Optional[int]:
+        """Pages of the cached text for *digest*, or None if it isn't cached."""
+        text_path = os.path.join(cache_dir, f"{digest}.txt")
+        try:
+            with open(os.path.join(cache_dir, f"{digest}.json"), "r", encoding="utf-8") as f:
+                pages = json.load(f).get("pages")
+        except (OSError, ValueError, AttributeError):
+            return None
+        if not isinstance(pages, int) or not os.path.exists(text_path):
+            return None
+        return pages
+
+    @staticmethod
+    def _iter_cached_pages(cache_dir: str, digest: str, pages: int) -> Iterator[str]:
+        if pages == 0:
+            return
+        buffer = ""
+        # newline="" keeps the text exactly as extracted
+        with open(os.path.join(cache_dir, f"{digest}.txt"), "r", encoding="utf-8", newline="") as f:
+            for block in iter(lambda: f.read(DocumentLoader.BLOCK_SIZE), ""):
+                buffer += block
+                *complete, buffer = buffer.split(DocumentLoader.PAGE_BREAK)
+                yield from complete
+        yield buffer
+
+    @staticmethod
+    def _caching_pages(
+        pages: Iterator[str], cache_dir: str, digest: str, filepath: str
+    ) -> Iterator[str]:
+        """Pass *pages* through, saving them to the cache if all are read.
+
+        A document whose text contains the page break character itself
+        is not cached.
+        """
+        text_path = os.path.join(cache_dir, f"{digest}.txt")
+        temp_path = f"{text_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        count = 0
+        cacheable = True
+        try:
+            with open(temp_path, "w", encoding="utf-8", newline="") as f:
+                for page in pages:
+                    if DocumentLoader.PAGE_BREAK in page:
+                        cacheable = False
+                    if cacheable:
+                        f.write(page if count == 0 else DocumentLoader.PAGE_BREAK + page)
+                    count += 1
+                    yield page
+            if cacheable:
+                os.replace(temp_path, text_path)
+                # Written last: its presence marks the text as complete
+                DocumentLoader._write_json(
+                    os.path.join(cache_dir, f"{digest}.json"),
+                    {"pages": count, "source": os.path.basename(filepath)},
+                )
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
     @staticmethod
     def _load_txt(filepath: str) -> str:
         with open(filepath, "r", encoding="utf-8") as f:
             return f.read()
 
     @staticmethod
-    def _load_pdf(filepath: str) -> str:
+    def _require_pypdf2():
         try:
-            import PyPDF2
+            import PyPDF2  # noqa: F401
         except ImportError:
             raise ImportError(
                 "PyPDF2 is required for PDF support. "
                 "Install it with: pip install PyPDF2"
             )
 
-        text_parts = []
+    @staticmethod
+    def _load_pdf(filepath: str) -> str:
+        return "\n".join(page for page in DocumentLoader.iter_pages(filepath) if page)
+
+    @staticmethod
+    def _iter_txt(filepath: str) -> Iterator[str]:
+        with open(filepath, "r", encoding="utf-8") as f:
+            for block in iter(lambda: f.read(DocumentLoader.BLOCK_SIZE), ""):
+                yield block
+
+    @staticmethod
+    def _iter_pdf(filepath: str, workers: Optional[int] = None) -> Iterator[str]:
+        first = True
+        for page_text in DocumentLoader.iter_pages(filepath, workers):
+            if page_text:
+                # Pages are newline-separated, matching _load_pdf
+                yield page_text if first else "\n" + page_text
+                first = False
+
+    @staticmethod
+    def _iter_pages_serial(filepath: str) -> Iterator[str]:
+        import PyPDF2
         with open(filepath, "rb") as f:
             reader = PyPDF2.PdfReader(f)
+            DocumentLoader._remember_page_count(filepath, len(reader.pages))
             for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
+                yield page.extract_text() or ""
 
-        return "\n".join(text_parts)
+    @staticmethod
+    def _pool(workers: int) -> ProcessPoolExecutor:
+        """The shared extraction pool, with room for at least *workers* processes."""
+        global _POOL, _POOL_WORKERS
+        with _POOL_LOCK:
+            if _POOL is None or _POOL_WORKERS < workers:
+                if _POOL is not None:
+                    # Tasks already submitted to it still finish
+                    _POOL.shutdown(wait=False)
+                _POOL = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context(DocumentLoader.POOL_START_METHOD),
+                )
+                _POOL_WORKERS = workers
+            return _POOL
+
+    @staticmethod
+    def close_pool(pool: Optional[ProcessPoolExecutor] = None):
+        """Stop the shared extraction workers (or only *pool*, if still shared).
+
+        The next parallel extraction starts new ones.
+        """
+        global _POOL, _POOL_WORKERS
+        with _POOL_LOCK:
+            if _POOL is None or (pool is not None and pool is not _POOL):
+                return
+            closing, _POOL, _POOL_WORKERS = _POOL, None, 0
+        closing.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _iter_pages_parallel(filepath: str, page_count: int, workers: int) -> Iterator[str]:
+        step = DocumentLoader.PAGES_PER_TASK
+        ranges = iter([(start, min(start + step, page_count)) for start in range(0, page_count, step)])
+        pool = DocumentLoader._pool(workers)
+        # Futures in page order; results are taken from the front only
+        pending = deque()
+        try:
+            for start, stop in islice(ranges, workers * DocumentLoader.TASKS_AHEAD):
+                pending.append(pool.submit(_extract_pages, filepath, start, stop))
+            while pending:
+                pages = pending.popleft().result()
+                for start, stop in islice(ranges, 1):
+                    pending.append(pool.submit(_extract_pages, filepath, start, stop))
+                yield from pages
+        except BrokenProcessPool:
+            # A worker died; start over with a new pool next time
+            DocumentLoader.close_pool(pool)
+            raise
+        finally:
+            # Stopped early (or failed): drop ranges not yet started,
+            # leaving the pool to other readers
+            for future in pending:
+                future.cancel()
 
     @staticmethod
     def chunk_text(text: str, chunk_size: int = 4000, overlap: int = 200) -> List[str]:
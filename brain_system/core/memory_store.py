@@ -1,76 +1,637 @@
-
+import atexit
+import heapq
 import json
 import os
-from datetime import datetime
-from typing import List, Dict, Any
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Collection, Iterable, Iterator, Optional, Tuple
+
+from .bm25 import STOPWORDS, BM25Index
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows: no cross-process locking
+    FCNTL_AVAILABLE = False
+
 
 class MemoryStore:
-    def __init__(self, filepath: str = None):
+    """Long-term memory kept as an append-only JSON Lines log.
+
+    Each entry is one line, so :meth:`add_memory` appends a single line
+    instead of rewriting the whole file.  Entries are cached in memory;
+    lines appended by another store on the same file are picked up on the
+    next read.  A line left incomplete by a crash is skipped, and
+    :meth:`compact` moves such lines to ``<log>.corrupt`` rather than
+    deleting them.
+
+    Several processes may share one log: appends, migration and
+    compaction hold an exclusive ``fcntl`` lock on ``<log>.lock``, and
+    whole-file rewrites go to a temporary file that atomically replaces
+    the log, so readers see either the old or the new log, never a mix.
+    A store notices when another process has replaced the log and
+    re-reads it.  (Without ``fcntl``, on Windows, only threads of one
+    process are coordinated.)
+
+    Retrieval ranks entries with a BM25 inverted index over their content,
+    built once when the log is read and extended on every new entry.
+
+    :meth:`add_memory_async` hands entries to a background writer instead,
+    so callers never wait on disk I/O; :meth:`flush` waits for the queue
+    to drain, and :meth:`close` (also run at interpreter exit) flushes it
+    and stops the writer.
+
+    Retention is opt-in: *max_entries* and *max_bytes* cap the log, and
+    *ttl_by_tag* expires entries carrying a tag (``{"conversation":
+    timedelta(days=30)}``).  Over a cap, the entries with the lowest
+    retention score go first: their ``importance`` (see
+    :meth:`add_memory`) halved every IMPORTANCE_HALF_LIFE of age.  The
+    log may run COMPACT_SLACK over a cap, or hold expired entries, until
+    a compaction on a background thread rewrites it; searches keep being
+    answered meanwhile.  :meth:`stats` reports the outcome.
+
+    A legacy ``brain_memory.json`` array is migrated to the log the first
+    time its store is opened, and kept as ``brain_memory.json.bak``.  If
+    the array is truncated or damaged, every complete entry in it is
+    still migrated.
+    """
+
+    # Once the store holds COMMON_TERM_MIN_ENTRIES memories, query terms
+    # found in more than COMMON_TERM_DF of them are left out of the BM25
+    # ranking, so query cost tracks the rarer terms rather than store size
+    COMMON_TERM_DF = 0.2
+    COMMON_TERM_MIN_ENTRIES = 1000
+    # Without recent_fallback only relevant memories are wanted, so common
+    # terms stop counting as a match once there are this many to compare
+    STRICT_COMMON_TERM_MIN_ENTRIES = 10
+
+    # Most queued entries the background writer appends in one write
+    WRITE_BATCH = 256
+
+    # Retention: importance of entries added without one, the age over
+    # which an entry's retention score halves, and how far past a cap the
+    # log may grow before a background compaction trims it
+    DEFAULT_IMPORTANCE = 0.5
+    IMPORTANCE_HALF_LIFE = timedelta(days=30)
+    COMPACT_SLACK = 0.1
+
+    LOG_SUFFIX = ".jsonl"
+    LEGACY_SUFFIX = ".json"
+    BACKUP_SUFFIX = ".bak"
+    LOCK_SUFFIX = ".lock"
+    CORRUPT_SUFFIX = ".corrupt"
+
+    # Queue sentinel that stops the background writer
+    _STOP = object()
+
+    def __init__(
+        self,
+        filepath: str = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl_by_tag: Optional[Dict[str, timedelta]] = None,
+    ):
         if filepath is None:
-            # Default to brain_memory.json in the current working directory
-            filepath = os.path.join(os.getcwd(), "brain_memory.json")
-        self.filepath = os.path.abspath(filepath)
+            # Default to brain_memory.jsonl in the current working directory
+            filepath = os.path.join(os.getcwd(), "brain_memory.jsonl")
+        filepath = os.path.abspath(filepath)
+        if filepath.endswith(self.LEGACY_SUFFIX):
+            # Given the legacy file name; keep the log right next to it
+            filepath = filepath[:-len(self.LEGACY_SUFFIX)] + self.LOG_SUFFIX
+        self.filepath = filepath
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_by_tag = dict(ttl_by_tag or {})
+
+        self._entries: List[Dict[str, Any]] = []
+        self._offset = 0            # bytes of the log already read
+        self._inode = None          # identity of the log file read so far
+        self._skipped = 0           # unreadable lines seen so far
+        # Keyed by position in _entries, so a higher id is a newer entry
+        self._index = BM25Index()
+        # Earliest moment a cached entry outlives its tag's TTL
+        self._next_expiry: Optional[datetime] = None
+        # _lock guards the cache, index and offset against the background
+        # threads.  _file_lock plus a flock on the lock file serialize
+        # writers, in this process and others; always taken before _lock
+        self._lock = threading.RLock()
+        self._file_lock = threading.Lock()
+        self._lock_fd: Optional[int] = None
+
+        # Background compaction and its outcome
+        self._compactor: Optional[threading.Thread] = None
+        self._last_compaction: Optional[datetime] = None
+        self._evicted = 0
+        self._expired = 0
+
+        # Write-behind queue, drained by a writer thread started on demand
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
         self._ensure_file_exists()
+        self._sync()
+
+    @property
+    def legacy_path(self) -> Optional[str]:
+        """The JSON array file this log replaces, if it follows the naming."""
+        if not self.filepath.endswith(self.LOG_SUFFIX):
+            return None
+        return self.filepath[:-len(self.LOG_SUFFIX)] + self.LEGACY_SUFFIX
+
+    @contextmanager
+    def _writer_lock(self) -> Iterator[None]:
+        """Keep every other writer, in any process, off the log."""
+        with self._file_lock:
+            if not FCNTL_AVAILABLE:
+                yield
+                return
+            if self._lock_fd is None:
+                self._lock_fd = os.open(
+                    self.filepath + self.LOCK_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644
+                )
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Hold the store against other threads and other processes."""
+        with self._writer_lock(), self._lock:
+            yield
 
     def _ensure_file_exists(self):
-        if not os.path.exists(self.filepath):
-            with open(self.filepath, 'w') as f:
-                json.dump([], f)
-        else:
-            # Validate existing file is valid JSON
+        if os.path.exists(self.filepath):
+            return
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._exclusive():
+            # Another process may have created or migrated it meanwhile
+            if os.path.exists(self.filepath):
+                return
+            legacy_path = self.legacy_path
+            if legacy_path is not None and os.path.exists(legacy_path):
+                self._migrate(legacy_path)
+            else:
+                open(self.filepath, "a").close()
+
+    def _migrate(self, legacy_path: str):
+        """Convert a legacy JSON array file into the log, then back it up."""
+        with open(legacy_path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = self._salvage(text)
+            print(f"⚠️  {os.path.basename(legacy_path)} is damaged; "
+                  f"recovered {len(data)} complete memories")
+        if not isinstance(data, list):
+            data = []
+
+        entries = [entry for entry in data if isinstance(entry, dict)]
+        temp_path, _ = self._write_temp(self._encode(entry).encode("utf-8") for entry in entries)
+        os.replace(temp_path, self.filepath)
+        os.replace(legacy_path, legacy_path + self.BACKUP_SUFFIX)
+        print(f"📦 Migrated {len(entries)} memories from {os.path.basename(legacy_path)}")
+
+    @staticmethod
+    def _salvage(text: str) -> List[Any]:
+        """Every complete top-level object of a damaged JSON array."""
+        decoder = json.JSONDecoder()
+        entries = []
+        position = text.find("[") + 1
+        while position > 0:
+            position = text.find("{", position)
+            if position == -1:
+                break
             try:
-                with open(self.filepath, 'r') as f:
-                    json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                with open(self.filepath, 'w') as f:
-                    json.dump([], f)
-
-    def add_memory(self, memory_text: str, tags: List[str] = None):
-        """Add a memory entry to LTM."""
-        if tags is None:
-            tags = []
+                entry, position = decoder.raw_decode(text, position)
+            except ValueError:
+                # Skip past the damaged object's opening brace and resync
+                position += 1
+                continue
+            entries.append(entry)
+        return entries
+
+    def _write_temp(self, lines: Iterable[bytes]) -> Tuple[str, int]:
+        """Write *lines* to a durable temporary file to ``os.replace`` the log with.
+
+        Caller holds :meth:`_writer_lock`.  Returns the path and the size.
+        """
+        temp_path = f"{self.filepath}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            for line in lines:
+                f.write(line)
+            size = f.tell()
+            f.flush()
+            os.fsync(f.fileno())
+        return temp_path, size
+
+    @staticmethod
+    def _encode(entry: Dict[str, Any]) -> str:
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    @staticmethod
+    def _new_entry(
+        memory_text: str, tags: List[str] = None, importance: Optional[float] = None
+    ) -> Dict[str, Any]:
         entry = {
             "timestamp": datetime.now().isoformat(),
             "content": memory_text,
-            "tags": tags
+            "tags": tags or []
         }
-        
+        if importance is not None:
+            entry["importance"] = float(importance)
+        return entry
+
+    @staticmethod
+    def _timestamp(entry: Dict[str, Any]) -> Optional[datetime]:
+        try:
+            return datetime.fromisoformat(entry["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _matches(entry: Dict[str, Any], exclude: Collection[str], tags: Collection[str]) -> bool:
+        """True unless *entry*'s content is in *exclude* or it lacks one of *tags*."""
+        if entry.get("content") in exclude:
+            return False
+        entry_tags = entry.get("tags")
+        return all(tag in entry_tags for tag in tags) if isinstance(entry_tags, list) else not tags
+
+    def _expiry(self, entry: Dict[str, Any]) -> Optional[datetime]:
+        """When *entry* outlives the shortest TTL among its tags, if any."""
+        tags = entry.get("tags")
+        if not self.ttl_by_tag or not isinstance(tags, list):
+            return None
+        ttls = [self.ttl_by_tag[tag] for tag in tags if tag in self.ttl_by_tag]
+        timestamp = self._timestamp(entry)
+        if not ttls or timestamp is None:
+            return None
+        return timestamp + min(ttls)
+
+    def _retention_score(self, entry: Dict[str, Any], now: datetime) -> float:
+        """Importance, halved every IMPORTANCE_HALF_LIFE of the entry's age."""
         try:
-            with open(self.filepath, 'r+') as f:
-                data = json.load(f)
-                data.append(entry)
-                f.seek(0)
-                f.truncate()
-                json.dump(data, f, indent=4)
-        except (json.JSONDecodeError, ValueError):
-            with open(self.filepath, 'w') as f:
-                json.dump([entry], f, indent=4)
-
-    def retrieve_memories(self, query: str, limit: int = 3) -> List[Dict[str, Any]]:
+            importance = float(entry.get("importance", self.DEFAULT_IMPORTANCE))
+        except (TypeError, ValueError):
+            importance = self.DEFAULT_IMPORTANCE
+        timestamp = self._timestamp(entry)
+        if timestamp is None:
+            return importance
+        age = max((now - timestamp) / self.IMPORTANCE_HALF_LIFE, 0.0)
+        return importance * 0.5 ** age
+
+    def _reset(self):
+        """Forget everything read so far, so the log is re-read from the start."""
+        self._entries = []
+        self._index = BM25Index()
+        self._offset = 0
+        self._skipped = 0
+        self._next_expiry = None
+
+    def _sync(self):
+        """Read entries appended to the log since the last read.
+
+        If the log was replaced (compacted by another process) or shrank,
+        it is re-read from the start.
         """
-        Naive retrieval: simple keyword matching or just return recent memories.
-        In a production system, this would use vector embeddings.
+        with self._lock:
+            try:
+                with open(self.filepath, "rb") as f:
+                    stat = os.fstat(f.fileno())
+                    if stat.st_ino != self._inode or stat.st_size < self._offset:
+                        self._reset()
+                        self._inode = stat.st_ino
+                    f.seek(self._offset)
+                    chunk = f.read()
+            except FileNotFoundError:
+                return
+            # An unterminated last line may still be being written; leave it
+            end = chunk.rfind(b"\n") + 1
+            for line in chunk[:end].splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    self._skipped += 1
+                    continue
+                if isinstance(entry, dict):
+                    self._append_entry(entry)
+            self._offset += end
+
+    def _append_entry(self, entry: Dict[str, Any]):
+        self._index.add(len(self._entries), str(entry.get("content", "")))
+        self._entries.append(entry)
+        expiry = self._expiry(entry)
+        if expiry is not None and (self._next_expiry is None or expiry < self._next_expiry):
+            self._next_expiry = expiry
+
+    def add_memory(
+        self, memory_text: str, tags: List[str] = None, importance: Optional[float] = None
+    ):
+        """Add a memory entry to LTM.
+
+        *importance* (DEFAULT_IMPORTANCE when omitted) ranks the entry for
+        eviction once the store is over its size caps; 0 goes first.
         """
+        self._write([self._new_entry(memory_text, tags, importance)])
+        self._maybe_compact()
+
+    def add_memory_async(
+        self, memory_text: str, tags: List[str] = None, importance: Optional[float] = None
+    ):
+        """Queue a memory entry for the background writer and return at once.
+
+        The entry is searchable once written; call :meth:`flush` to wait.
+        """
+        entry = self._new_entry(memory_text, tags, importance)
+        self._start_writer()
+        self._queue.put(entry)
+
+    def _write(self, entries: List[Dict[str, Any]]):
+        """Append *entries* to the log in one write."""
+        with self._exclusive():
+            self._sync()
+            data = "".join(self._encode(entry) for entry in entries).encode("utf-8")
+            with open(self.filepath, "a+b") as f:
+                end = f.seek(0, os.SEEK_END)
+                if end > self._offset:
+                    f.seek(end - 1)
+                    if f.read(1) != b"\n":
+                        # Torn line from an interrupted write: start a fresh line
+                        data = b"\n" + data
+                f.write(data)
+                f.flush()
+                appended_at = f.tell()
+            if end == self._offset:
+                self._offset = appended_at
+                for entry in entries:
+                    self._append_entry(entry)
+            else:
+                # An unterminated line preceded ours; read it and ours in order
+                self._sync()
+
+    def _start_writer(self):
+        with self._lock:
+            if self._writer is not None and self._writer.is_alive():
+                return
+            self._writer = threading.Thread(
+                target=self._drain, name="memory-store-writer", daemon=True
+            )
+            self._writer.start()
+            atexit.register(self.close)
+
+    def _drain(self):
+        """Background writer: append queued entries in batches until stopped."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.WRITE_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(item is self._STOP for item in batch)
+            entries = [item for item in batch if item is not self._STOP]
+            try:
+                if entries:
+                    self._write(entries)
+                    self._maybe_compact()
+            except Exception as e:
+                print(f"⚠️  Failed to write {len(entries)} memories: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def flush(self):
+        """Block until every queued memory has been written."""
+        self._queue.join()
+
+    def close(self):
+        """Write any queued memories, stop the background threads and release the lock file."""
+        writer = self._writer
+        if writer is not None:
+            if writer.is_alive():
+                self._queue.put(self._STOP)
+                writer.join()
+            self._writer = None
+            atexit.unregister(self.close)
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        # Reopened by the next write, if the store is used again
+        with self._file_lock:
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+
+    def _needs_compaction(self) -> bool:
+        with self._lock:
+            slack = 1 + self.COMPACT_SLACK
+            if self.max_entries is not None and len(self._entries) > self.max_entries * slack:
+                return True
+            if self.max_bytes is not None and self._offset > self.max_bytes * slack:
+                return True
+            return self._next_expiry is not None and datetime.now() >= self._next_expiry
+
+    def _maybe_compact(self):
+        """Start a background compaction if a retention policy is exceeded."""
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            if not self._needs_compaction():
+                return
+            self._compactor = threading.Thread(
+                target=self._compact_in_background, name="memory-store-compactor", daemon=True
+            )
+            self._compactor.start()
+
+    def _compact_in_background(self):
         try:
-            with open(self.filepath, 'r') as f:
-                data = json.load(f)
-        except (json.JSONDecodeError, ValueError):
-            return []
-        
-        # Simple keyword match
-        keywords = query.lower().split()
-        relevant = []
-        for entry in data:
-            content = entry['content'].lower()
-            score = sum(1 for k in keywords if k in content)
-            if score > 0:
-                relevant.append((score, entry))
-        
-        # Sort by relevance score, then recentness
-        relevant.sort(key=lambda x: x[0], reverse=True)
-        
-        # If no keywords found, return most recent
-        if not relevant:
-            return data[-limit:]
-            
-        return [r[1] for r in relevant[:limit]]
+            self.compact()
+        except Exception as e:
+            print(f"⚠️  Memory compaction failed: {e}")
+
+    def _retain(
+        self, lines: List[Tuple[bytes, Dict[str, Any]]], now: datetime
+    ) -> Tuple[List[Tuple[bytes, Dict[str, Any]]], int, int]:
+        """Apply the retention policies to the log's ``(line, entry)`` pairs.
+
+        Returns the pairs kept, in order, and how many expired and were
+        evicted.
+        """
+        kept = []
+        for line, entry in lines:
+            expiry = self._expiry(entry)
+            if expiry is None or expiry > now:
+                kept.append((line, entry))
+        expired = len(lines) - len(kept)
+
+        excess_entries = len(kept) - self.max_entries if self.max_entries is not None else 0
+        excess_bytes = (
+            sum(len(line) for line, _ in kept) - self.max_bytes
+            if self.max_bytes is not None else 0
+        )
+        if excess_entries <= 0 and excess_bytes <= 0:
+            return kept, expired, 0
+
+        # Lowest retention score first; among equals, the oldest
+        order = sorted(
+            range(len(kept)), key=lambda i: (self._retention_score(kept[i][1], now), i)
+        )
+        evict = set()
+        for i in order:
+            if excess_entries <= 0 and excess_bytes <= 0:
+                break
+            evict.add(i)
+            excess_entries -= 1
+            excess_bytes -= len(kept[i][0])
+        kept = [pair for i, pair in enumerate(kept) if i not in evict]
+        return kept, expired, len(evict)
+
+    def compact(self) -> int:
+        """Rewrite the log without unreadable lines, applying retention.
+
+        Unreadable lines are appended to ``<log>.corrupt`` for inspection
+        rather than deleted; expired entries and, over a size cap, those
+        with the lowest retention score are dropped.  The new log and its
+        index are built while searches go on against the old ones, then
+        swapped in.  Returns the number of lines moved to ``<log>.corrupt``.
+        """
+        with self._writer_lock():
+            with open(self.filepath, "rb") as f:
+                # Under the lock no one is mid-write, so an unterminated
+                # last line is torn and counts as unreadable too
+                data = f.read()
+
+            lines, corrupt = [], []
+            for line in data.splitlines(keepends=True):
+                if not line.strip():
+                    continue
+                if not line.endswith(b"\n"):
+                    line += b"\n"
+                try:
+                    entry = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    entry = None
+                if isinstance(entry, dict):
+                    lines.append((line, entry))
+                else:
+                    corrupt.append(line)
+
+            now = datetime.now()
+            kept, expired, evicted = self._retain(lines, now)
+
+            entries = [entry for _, entry in kept]
+            index = BM25Index()
+            next_expiry = None
+            for position, entry in enumerate(entries):
+                index.add(position, str(entry.get("content", "")))
+                expiry = self._expiry(entry)
+                if expiry is not None and (next_expiry is None or expiry < next_expiry):
+                    next_expiry = expiry
+
+            if corrupt:
+                with open(self.filepath + self.CORRUPT_SUFFIX, "ab") as f:
+                    f.writelines(corrupt)
+                    f.flush()
+                    os.fsync(f.fileno())
+            temp_path, size = self._write_temp(line for line, _ in kept)
+
+            with self._lock:
+                os.replace(temp_path, self.filepath)
+                self._entries = entries
+                self._index = index
+                self._offset = size
+                self._inode = os.stat(self.filepath).st_ino
+                self._skipped = 0
+                self._next_expiry = next_expiry
+                self._last_compaction = now
+                self._expired += expired
+                self._evicted += evicted
+            return len(corrupt)
+
+    def stats(self) -> Dict[str, Any]:
+        """Size of the store and what compaction has done.
+
+        ``last_compaction`` (ISO time or None), ``expired`` and ``evicted``
+        count compactions run by this store object.
+        """
+        with self._lock:
+            self._sync()
+            return {
+                "entries": len(self._entries),
+                "bytes": self._offset,
+                "unreadable_lines": self._skipped,
+                "last_compaction": (
+                    self._last_compaction.isoformat() if self._last_compaction else None
+                ),
+                "expired": self._expired,
+                "evicted": self._evicted,
+                "compacting": self._compactor is not None and self._compactor.is_alive(),
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._sync()
+            return len(self._entries)
+
+    def retrieve_memories(
+        self,
+        query: str,
+        limit: int = 3,
+        recent_fallback: bool = True,
+        exclude: Collection[str] = (),
+        tags: Collection[str] = (),
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the *limit* memories most relevant to *query* by BM25, best
+        first; equal scores go to the more recent memory.  Stopwords never
+        count as a match.  If no memory shares another term with the query,
+        the most recent ones are returned (or none, without
+        *recent_fallback*, which also ignores terms common to the store).
+        Memories whose content is in *exclude*, or that lack any of *tags*,
+        are skipped.
+        """
+        if self._next_expiry is not None and datetime.now() >= self._next_expiry:
+            self._maybe_compact()
+
+        with self._lock:
+            self._sync()
+            data = self._entries
+
+            if not recent_fallback and len(data) >= self.STRICT_COMMON_TERM_MIN_ENTRIES:
+                scores = self._index.scores(
+                    query, max_df=self.COMMON_TERM_DF, fallback=False, ignore=STOPWORDS
+                )
+            else:
+                max_df = self.COMMON_TERM_DF if len(data) >= self.COMMON_TERM_MIN_ENTRIES else None
+                scores = self._index.scores(query, max_df=max_df, ignore=STOPWORDS)
+            if exclude or tags:
+                scores = {
+                    position: score for position, score in scores.items()
+                    if self._matches(data[position], exclude, tags)
+                }
+            if not scores:
+                if not recent_fallback or limit <= 0:
+                    return []
+                recent = (
+                    [entry for entry in data if self._matches(entry, exclude, tags)]
+                    if exclude or tags else data
+                )
+                return recent[-limit:]
+
+            # Rounded so float noise doesn't override the recency tie-break
+            best = heapq.nlargest(
+                limit, scores.items(), key=lambda item: (round(item[1], 9), item[0])
+            )
+            return [data[position] for position, _ in best]
@@ -11,6 +11,8 @@ from ..agents.executive_agent import ExecutiveAgent
 from .persona import PersonaProfile
 from .working_memory import WorkingMemory
 from .vector_memory import VectorMemory
+from .memory_store import MemoryStore
+from .consolidation import MemoryConsolidator
 
 class BrainState(TypedDict):
     input: str
@@ -18,12 +20,33 @@ class BrainState(TypedDict):
     sensory_analysis: str
     memory_context: str
     raw_memories: List[str]
+    passages_used: int
     logical_analysis: str
     emotional_analysis: str
     final_response: str
 
 class BrainOrchestrator:
-    def __init__(self, provider: str = "gemini", model_name: str = None):
+    # Tag of conversation turns stored in long-term memory (each also
+    # tagged "persona:<id>" and "session:<id>"), and how many entries
+    # long-term memory keeps (least important and oldest go first)
+    TURN_TAG = "conversation"
+    MEMORY_MAX_ENTRIES = 50000
+
+    # Most words the working memory holds; beyond it the oldest turns are
+    # consolidated even if fewer than 15 are held
+    WORKING_MEMORY_TOKENS = 4000
+
+    # Conversation context given to the Executive: the latest turn plus the
+    # earlier turns most relevant to the input, within this many words
+    CONTEXT_TOKEN_BUDGET = 800
+
+    def __init__(
+        self,
+        provider: str = "gemini",
+        model_name: str = None,
+        memory_path: str = None,
+        session_id: str = None,
+    ):
         self.provider = provider
         self.model_name = model_name
         self.sensory = SensoryAgent(provider=provider, model_name=model_name)
@@ -32,48 +55,136 @@ class BrainOrchestrator:
         self.logic = LogicAgent(provider=provider, model_name=model_name)
         self.executive = ExecutiveAgent(provider=provider, model_name=model_name)
         self.persona: Optional[PersonaProfile] = None
+        # Registry id of the loaded persona, or its name when loaded from a document
+        self.persona_id: Optional[str] = None
 
         # Memory subsystems
-        self.working_memory = WorkingMemory(max_turns=15)
         self.vector_memory = VectorMemory()
+        # Turns evicted from working memory are summarized in the background
+        # into this session's own vector collection (kept for resuming only
+        # when the session is named)
+        self.consolidator = MemoryConsolidator(
+            self.memory.consolidate,
+            session_id=session_id,
+            embedder_source=self.vector_memory,
+        )
+        self.working_memory = WorkingMemory(
+            max_turns=15,
+            max_tokens=self.WORKING_MEMORY_TOKENS,
+            on_evict=self.consolidator.add_turns,
+        )
+        # Long-term memory of completed turns (JSON Lines log at memory_path,
+        # brain_memory.jsonl in the working directory by default)
+        self.memory_store = MemoryStore(memory_path, max_entries=self.MEMORY_MAX_ENTRIES)
+        self.memory.memory_store = self.memory_store
+        self.memory.turn_tags = self._turn_tags()
+        self.memory.working_memory = self.working_memory
+        self.memory.consolidator = self.consolidator
 
-        # Wire vector memory into memory agent
-        self.memory.vector_memory = self.vector_memory
+        # Wire vector memory into the memory agent and the agents with
+        # their own retrieval profiles
+        for agent in (self.memory, self.emotional, self.logic):
+            agent.vector_memory = self.vector_memory
 
         self.app = self._build_graph()
 
-    def set_persona(self, filepath: str):
-        """Load a persona from a document and inject into all agents."""
+    def set_persona(self, filepath: str, background: bool = True):
+        """Load a persona from a document and inject into all agents.
+
+        The profile is active as soon as this returns; with *background*
+        the biography is indexed on a worker thread (see
+        ``vector_memory.progress``) and the Memory Agent answers from the
+        profile until it is ready.  Only the head of a PDF is extracted
+        to read the profile; indexing extracts the whole text and caches it.
+        """
         self.persona = PersonaProfile()
         self.persona.load_from_document(
             filepath,
             provider=self.provider,
             model_name=self.model_name
         )
+        self.persona_id = self.persona.name or "persona"
         self._inject_persona()
 
-        # Index the full document text for biography search
+        # Stream the full document into the biography index page by page,
+        # so the whole book never sits in memory at once
         from .document_loader import DocumentLoader
-        text = DocumentLoader.load(filepath)
-        self.vector_memory.index_text(text, self.persona.name or "persona")
+        name = self.persona.name or "persona"
+
+        def index():
+            return self.vector_memory.index_stream(
+                DocumentLoader.iter_text(filepath),
+                name,
+                fingerprint=DocumentLoader.fingerprint(filepath),
+            )
+
+        if background:
+            self.vector_memory.index_in_background(
+                index, name, total_blocks=DocumentLoader.count_blocks(filepath)
+            )
+        else:
+            index()
+
+    def set_persona_from_dict(self, persona_dict: dict, background: bool = True):
+        """Load a pre-curated persona from a dict and inject into all agents.
 
-    def set_persona_from_dict(self, persona_dict: dict):
-        """Load a pre-curated persona from a dict and inject into all agents."""
+        With *background*, profile fields are indexed on a worker thread.
+        """
         self.persona = PersonaProfile()
         self.persona.load_from_dict(persona_dict)
+        self.persona_id = persona_dict.get("id") or persona_dict.get("name", "persona")
         self._inject_persona()
 
-        # Index the pre-curated profile fields for biography search
+        # Index the pre-curated profile fields for biography search,
+        # using the shipped embeddings for built-in personas when available
+        from ..personas.persona_index import load_embeddings
         profile_fields = persona_dict.get("profile", {})
-        self.vector_memory.index_profile(
-            profile_fields, persona_dict.get("name", "persona")
-        )
+        name = persona_dict.get("name", "persona")
+
+        def index():
+            return self.vector_memory.index_profile(
+                profile_fields,
+                name,
+                embeddings=load_embeddings(
+                    persona_dict.get("id", ""),
+                    model=self.vector_memory.embedding_model,
+                    dimension=self.vector_memory.embedding_dim,
+                ),
+            )
+
+        if background:
+            self.vector_memory.index_in_background(index, name)
+        else:
+            index()
 
     def _inject_persona(self):
         """Inject role-specific persona context into each agent."""
         agents = [self.sensory, self.memory, self.emotional, self.logic, self.executive]
         for agent in agents:
             agent.persona_context = self.persona.get_agent_context(agent.role)
+            # Retrieve only what the prompt doesn't already carry verbatim
+            if agent.RETRIEVES_PERSONA:
+                agent.retrieval_chunk_types = tuple(
+                    f"profile_{field.lower()}"
+                    for field in self.persona.fields_outside_context(agent.role)
+                )
+
+        # Recall only this persona's turns from long-term memory
+        self.memory.turn_tags = self._turn_tags()
+
+        # Profile fields stand in for biography search until it is indexed
+        self.memory.profile_passages = [
+            f"{field}: {value}"
+            for field, value in self.persona.profile.items()
+            if isinstance(value, str) and value.strip()
+        ]
+
+    def _turn_tags(self) -> List[str]:
+        """Tags of the turns this persona and session store in long-term memory."""
+        tags = [self.TURN_TAG, f"session:{self.consolidator.session_id}"]
+        if self.persona_id is not None:
+            tags.append(f"persona:{self.persona_id}")
+        return tags
 
     def _build_graph(self):
         workflow = StateGraph(BrainState)
@@ -113,7 +224,8 @@ class BrainOrchestrator:
         result = self.memory.process({"input": state["input"]})
         return {
             "memory_context": result["memory_context"],
-            "raw_memories": result["raw_memories"]
+            "raw_memories": result["raw_memories"],
+            "passages_used": result["passages_used"],
         }
 
     def _logic_node(self, state: BrainState):
@@ -144,18 +256,39 @@ class BrainOrchestrator:
         self.working_memory.add_turn(
             state["input"], result["final_response"]
         )
+        # ...and in long-term memory, written behind by a background thread
+        self.memory_store.add_memory_async(
+            f"User: {state['input']}\nBrain: {result['final_response']}",
+            tags=self._turn_tags(),
+        )
 
         return {"final_response": result["final_response"]}
 
+    def close(self):
+        """Flush long-term memory to disk and close the vector stores."""
+        self.memory_store.close()
+        self.consolidator.close()
+        self.vector_memory.close()
+
     def run(self, user_input: str) -> dict:
         """Run the brain pipeline. Returns full state with all agent outputs."""
+        turns_available = self.working_memory.turn_count
+        context = self.working_memory.select_context(
+            user_input, max_tokens=self.CONTEXT_TOKEN_BUDGET
+        )
         initial_state = BrainState(
             input=user_input,
-            conversation_context=self.working_memory.get_context(last_n=10),
+            conversation_context=context.text,
         )
         result = self.app.invoke(initial_state)
         return {
             "final_response": result["final_response"],
+            "context": {
+                "turns_used": context.turns,
+                "turns_available": turns_available,
+                "tokens": context.tokens,
+                "tokens_saved": context.tokens_saved,
+            },
             "agent_outputs": {
                 "sensory": {
                     "name": "Sensory Agent",
@@ -166,6 +299,7 @@ class BrainOrchestrator:
                     "name": "Memory Agent",
                     "role": "Hippocampus",
                     "output": result.get("memory_context", ""),
+                    "passages_used": result.get("passages_used", 0),
                 },
                 "logic": {
                     "name": "Logic Agent",
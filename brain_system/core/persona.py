@@ -11,6 +11,16 @@ class PersonaProfile:
     responds as that person would.
     """
 
+    # Profile fields get_agent_context writes into every agent's prompt,
+    # and those it adds per role (keep in step with get_agent_context)
+    BASE_CONTEXT_FIELDS = ("NAME", "ERA", "PERSONALITY_TRAITS")
+    ROLE_CONTEXT_FIELDS = {
+        "Amygdala & Limbic System": ("EMOTIONAL_TENDENCIES", "VALUES"),
+        "Left Frontal Lobe": ("REASONING_STYLE", "KNOWN_VIEWS"),
+        "Prefrontal Cortex (PFC)": ("BELIEFS", "SPEECH_STYLE", "KEY_EXPERIENCES"),
+        "Hippocampus": ("KEY_EXPERIENCES",),
+    }
+
     def __init__(self):
         self.name: str = ""
         self.profile: Dict[str, str] = {}
@@ -27,11 +37,10 @@ class PersonaProfile:
         Load a document, extract a persona profile using the LLM.
         """
         print(f"📖 Loading document: {filepath}")
-        full_text = DocumentLoader.load(filepath)
 
         # If document is very large, use only the first ~8000 chars for profile extraction
-        # to stay within context limits
-        extract_text = full_text[:8000] if len(full_text) > 8000 else full_text
+        # to stay within context limits (and never read the rest of the book here)
+        extract_text = DocumentLoader.load_head(filepath, 8000)
 
         llm = LLMFactory.create_llm(provider=provider, model_name=model_name)
 
@@ -63,9 +72,6 @@ Text to analyze:
         self.raw_summary = raw_profile
         self.active = True
 
-        # Also store the full document text for memory seeding
-        self._document_text = full_text
-
         print(f"✅ Persona loaded: {self.name}")
 
     def load_from_dict(self, profile_dict: Dict[str, Any]):
@@ -77,7 +83,6 @@ Text to analyze:
         self.profile = dict(profile_dict.get("profile", {}))
         self.raw_summary = f"Pre-curated persona: {self.name}"
         self.active = True
-        self._document_text = ""
         print(f"✅ Pre-curated persona loaded: {self.name}")
 
     def _parse_profile(self, raw_text: str):
@@ -101,6 +106,11 @@ Text to analyze:
                         self.name = value
                     break
 
+    def fields_outside_context(self, agent_role: str) -> list:
+        """Profile fields that :meth:`get_agent_context` leaves out for *agent_role*."""
+        included = self.BASE_CONTEXT_FIELDS + self.ROLE_CONTEXT_FIELDS.get(agent_role, ())
+        return [field for field in self.profile if field not in included]
+
     def get_agent_context(self, agent_role: str) -> str:
         """
         Returns persona-specific context tailored for a given agent role.
@@ -0,0 +1,123 @@
+"""
+Diversity re-ranking for retrieved passages.
+
+Overlapping chunks of the same biography often come back together as
+near-duplicates.  Maximal marginal relevance (MMR) picks passages that are
+relevant to the query but dissimilar to what was already picked, and
+adjacent chunks can be stitched into one contiguous passage so the prompt
+doesn't carry the shared overlap twice.  When only the clearly relevant
+passages are wanted, :func:`elbow` finds where the scores fall off.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+def mmr(
+    query_vector: Sequence[float],
+    candidate_vectors: Sequence[Sequence[float]],
+    top_k: int,
+    diversity: float = 0.3,
+) -> List[int]:
+    """Select *top_k* candidate indices by maximal marginal relevance.
+
+    *diversity* ranges from 0 (pure relevance) to 1 (pure novelty).
+    Vectors are compared by cosine similarity.
+    """
+    if len(candidate_vectors) == 0 or top_k <= 0:
+        return []
+
+    candidates = np.asarray(candidate_vectors, dtype=np.float32)
+    query = np.asarray(query_vector, dtype=np.float32)
+
+    candidates = candidates / np.maximum(
+        np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12
+    )
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = candidates @ query
+    pairwise = candidates @ candidates.T
+
+    # Highest similarity of each candidate to anything already selected
+    redundancy = np.full(len(candidates), -np.inf, dtype=np.float32)
+    available = np.ones(len(candidates), dtype=bool)
+    selected: List[int] = []
+
+    for _ in range(min(top_k, len(candidates))):
+        if selected:
+            scores = (1 - diversity) * relevance - diversity * redundancy
+        else:
+            scores = relevance.copy()
+        scores[~available] = -np.inf
+
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, pairwise[best])
+
+    return selected
+
+
+def _stitch(left: str, right: str, min_overlap: int = 8) -> str:
+    """Join two consecutive chunks, dropping the text they share."""
+    max_overlap = min(len(left), len(right))
+    for size in range(max_overlap, min_overlap - 1, -1):
+        if left.endswith(right[:size]):
+            return left + right[size:]
+    return f"{left} {right}"
+
+
+def elbow(scores: Sequence[float]) -> int:
+    """How many of the descending *scores* come before their largest drop.
+
+    Returns at least 1 for a non-empty list; with fewer than three scores
+    there is no elbow to find and all of them are kept.
+    """
+    if len(scores) < 3:
+        return len(scores)
+    drops = np.diff(np.asarray(scores, dtype=np.float64))
+    return int(np.argmin(drops)) + 1
+
+
+def merge_adjacent(passages: Sequence[Tuple[int, str]]) -> List[str]:
+    """Merge runs of consecutive chunks into contiguous passages.
+
+    *passages* are ``(chunk_index, text)`` pairs in relevance order; a
+    negative index marks a passage that must not be merged.  Merged passages
+    keep the rank of their best-ranked member.
+    """
+    return [text for _, text in merge_adjacent_ranked(passages)]
+
+
+def merge_adjacent_ranked(passages: Sequence[Tuple[int, str]]) -> List[Tuple[int, str]]:
+    """Like :func:`merge_adjacent`, returning ``(rank, text)`` pairs.
+
+    *rank* is the position in *passages* of the merged passage's
+    best-ranked member.
+    """
+    rank = {}
+    for position, (index, _) in enumerate(passages):
+        rank.setdefault(index, position)
+
+    texts = dict(passages)
+    mergeable = sorted(i for i in texts if i >= 0)
+
+    groups: List[Tuple[int, str]] = []
+    run: List[int] = []
+    for index in mergeable + [None]:
+        if run and (index is None or index != run[-1] + 1):
+            text = texts[run[0]]
+            for member in run[1:]:
+                text = _stitch(text, texts[member])
+            groups.append((min(rank[m] for m in run), text))
+            run = []
+        if index is not None:
+            run.append(index)
+
+    groups.extend(
+        (position, text)
+        for position, (index, text) in enumerate(passages) if index < 0
+    )
+    groups.sort(key=lambda group: group[0])
+    return groups
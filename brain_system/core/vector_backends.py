@@ -0,0 +1,645 @@
+"""
+Storage backends for persona vector collections.
+
+A backend stores passages with their embedding and answers
+nearest-neighbour queries by inner product.  ``VectorMemory`` keeps the
+chunking, lexical index and persona bookkeeping, and delegates vector
+storage to one of:
+
+- :class:`NumpyBackend` — a contiguous float32 matrix searched exactly with
+  ``argpartition``, optionally persisted as a memory-mapped ``.npy`` file.
+  No dependencies beyond NumPy; fastest for small collections.
+- :class:`ZvecBackend` — an on-disk zvec collection with an HNSW index;
+  scales to large biographies.
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import ClassVar, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import zvec
+    ZVEC_AVAILABLE = True
+except ImportError:
+    ZVEC_AVAILABLE = False
+
+# chunk_type values usable in a filter ("biography", "profile_values", ...)
+_CHUNK_TYPE_RE = re.compile(r"^\w+$")
+
+
+@dataclass
+class SearchHit:
+    """One stored passage with its collection metadata.
+
+    Returned by searches (with ``score``) and passed to
+    :meth:`VectorBackend.insert` (with ``vector``).
+    """
+
+    id: str
+    text: str
+    chunk_type: str = ""
+    chunk_index: int = -1
+    start: int = -1
+    end: int = -1
+    score: float = 0.0
+    vector: Optional[List[float]] = None
+    source: str = ""
+
+
+@dataclass(frozen=True)
+class IndexConfig:
+    """Vector precision and HNSW parameters for persona collections.
+
+    ``precision`` is ``"fp32"`` (default), ``"fp16"`` (half-size vector
+    storage) or ``"int8"`` (HNSW graph over INT8-quantized vectors: faster
+    build and distance computation, lower recall).  ``int8`` does not save
+    space: zvec keeps the fp32 vectors next to the quantized index, so it
+    takes *more* disk than fp32; use ``fp16`` to shrink a collection.
+    HNSW parameters left as None use zvec's defaults.  ``ef_search`` only affects queries and can
+    be changed without re-indexing.  Only the zvec backend uses these.
+    """
+
+    PRECISIONS: ClassVar[Tuple[str, ...]] = ("fp32", "fp16", "int8")
+
+    precision: str = "fp32"
+    hnsw_m: Optional[int] = None
+    ef_construction: Optional[int] = None
+    ef_search: Optional[int] = None
+
+    def __post_init__(self):
+        if self.precision not in self.PRECISIONS:
+            raise ValueError(
+                f"Unknown precision: {self.precision}. Supported: {self.PRECISIONS}"
+            )
+
+    @property
+    def build_key(self) -> str:
+        """Identifies the settings baked into a collection at build time."""
+        return f"{self.precision}/{self.hnsw_m}/{self.ef_construction}"
+
+
+class VectorBackend(ABC):
+    """Vector storage and top-k inner-product search for one collection."""
+
+    # Name recorded in collection metadata to reopen the right backend
+    kind: ClassVar[str] = ""
+
+    @abstractmethod
+    def insert(self, records: Sequence[SearchHit]):
+        """Store *records* (each with ``vector`` set)."""
+
+    @abstractmethod
+    def query(
+        self,
+        vector: Sequence[float],
+        top_k: int,
+        include_vector: bool = False,
+        chunk_types: Optional[Sequence[str]] = None,
+    ) -> List[SearchHit]:
+        """Return up to *top_k* hits by descending inner product.
+
+        With *chunk_types*, only records of those types are considered.
+        """
+
+    def query_many(
+        self,
+        vectors: Sequence[Sequence[float]],
+        top_k: int,
+        include_vector: bool = False,
+        chunk_types: Optional[Sequence[str]] = None,
+    ) -> List[List[SearchHit]]:
+        """Run :meth:`query` for each of *vectors*, returning hits per vector."""
+        return [self.query(vector, top_k, include_vector, chunk_types) for vector in vectors]
+
+    @abstractmethod
+    def fetch(self, ids: Iterable[str], include_vector: bool = False) -> Dict[str, SearchHit]:
+        """Return the stored records for *ids* (unknown ids are omitted)."""
+
+    @abstractmethod
+    def delete(self, ids: Iterable[str]):
+        """Remove records by id (unknown ids are ignored)."""
+
+    @abstractmethod
+    def records(self, include_vector: bool = True) -> Iterable[SearchHit]:
+        """Iterate over every stored record."""
+
+    def record_batches(
+        self, size: int, include_vector: bool = True
+    ) -> Iterator[List[SearchHit]]:
+        """Iterate over every stored record in lists of up to *size*."""
+        batch: List[SearchHit] = []
+        for record in self.records(include_vector):
+            batch.append(record)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @abstractmethod
+    def flush(self):
+        """Persist pending writes."""
+
+    @abstractmethod
+    def close(self):
+        """Release resources; the data stays on disk."""
+
+    @abstractmethod
+    def destroy(self):
+        """Close and delete the collection's files."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored records."""
+
+
+class NumpyBackend(VectorBackend):
+    """Exact search over a float32 matrix held in memory.
+
+    Rows grow by doubling, deletes swap the last row into the gap, and a
+    query is one matrix-vector product plus ``argpartition``.  With a
+    *path*, :meth:`flush` persists the collection as ``vectors.f32`` (raw
+    row-major float32) and ``records.jsonl`` (a dimension header, then one
+    record per row).  A flush after inserts only appends the new rows;
+    both files are rewritten only once an update or delete has changed a
+    row already on disk.  :meth:`open` memory-maps the matrix read-only
+    until the next write.  Safe to query while another thread writes.
+    """
+
+    kind = "numpy"
+
+    VECTORS_FILE = "vectors.f32"
+    RECORDS_FILE = "records.jsonl"
+
+    # Rows copied out of the matrix at a time by records()
+    RECORD_BATCH = 1000
+
+    # Record fields persisted next to the matrix, in row order
+    _FIELDS = ("id", "text", "chunk_type", "chunk_index", "start", "end", "source")
+
+    def __init__(self, path: Optional[str] = None, dimension: Optional[int] = None):
+        self._path = path
+        self._dimension = dimension
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._writable = True
+        self._records: List[SearchHit] = []   # row-aligned, vectors not kept
+        self._rows: Dict[str, int] = {}
+
+        # Row-aligned chunk_type codes, for filtered queries
+        self._type_codes: Dict[str, int] = {}
+        self._type_ids = np.empty(0, dtype=np.int32)
+
+        # Writes may reallocate the matrix under a concurrent query
+        self._lock = threading.RLock()
+
+        # Rows [0, _flushed) are on disk as they are in memory; once a row
+        # below _flushed changes, the next flush rewrites both files
+        self._flushed = 0
+        self._rewrite = True
+
+    @classmethod
+    def open(cls, path: str) -> "NumpyBackend":
+        """Load a persisted collection, memory-mapping its vectors."""
+        with open(os.path.join(path, cls.RECORDS_FILE), "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            records = [SearchHit(**json.loads(line)) for line in f if line.strip()]
+        backend = cls(path, header.get("dimension"))
+
+        # A flush interrupted between the two appends leaves extra vectors
+        vectors_path = os.path.join(path, cls.VECTORS_FILE)
+        if records:
+            row_bytes = 4 * backend._dimension
+            del records[os.path.getsize(vectors_path) // row_bytes:]
+
+        backend._records = records
+        backend._rows = {record.id: row for row, record in enumerate(records)}
+        backend._size = len(records)
+        backend._type_ids = np.fromiter(
+            (backend._type_code(record.chunk_type) for record in records),
+            dtype=np.int32, count=backend._size,
+        )
+        if backend._size:
+            backend._matrix = np.memmap(
+                vectors_path, dtype=np.float32, mode="r",
+                shape=(backend._size, backend._dimension),
+            )
+            backend._writable = False
+        backend._flushed = backend._size
+        backend._rewrite = False
+        return backend
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, extra: int, dimension: int):
+        """Ensure room for *extra* more rows in a writable matrix."""
+        if self._dimension is None:
+            self._dimension = dimension
+        elif dimension != self._dimension:
+            raise ValueError(
+                f"Vector dimension {dimension} does not match collection "
+                f"dimension {self._dimension}"
+            )
+
+        needed = self._size + extra
+        capacity = 0 if self._matrix is None else self._matrix.shape[0]
+        if self._writable and needed <= capacity:
+            return
+        rows = max(needed, 2 * capacity, 16)
+        grown = np.empty((rows, self._dimension), dtype=np.float32)
+        type_ids = np.empty(rows, dtype=np.int32)
+        if self._size:
+            grown[:self._size] = self._matrix[:self._size]
+            type_ids[:self._size] = self._type_ids[:self._size]
+        self._matrix = grown
+        self._type_ids = type_ids
+        self._writable = True
+
+    def _type_code(self, chunk_type: str) -> int:
+        return self._type_codes.setdefault(chunk_type, len(self._type_codes))
+
+    def insert(self, records: Sequence[SearchHit]):
+        with self._lock:
+            if not records:
+                return
+            vectors = np.asarray([record.vector for record in records], dtype=np.float32)
+            self._reserve(len(records), vectors.shape[1])
+            for record, vector in zip(records, vectors):
+                stored = SearchHit(**{name: getattr(record, name) for name in self._FIELDS})
+                row = self._rows.get(record.id)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._records.append(stored)
+                    self._rows[record.id] = row
+                else:
+                    self._records[row] = stored
+                    self._rewrite = self._rewrite or row < self._flushed
+                self._matrix[row] = vector
+                self._type_ids[row] = self._type_code(record.chunk_type)
+
+    def query(
+        self,
+        vector: Sequence[float],
+        top_k: int,
+        include_vector: bool = False,
+        chunk_types: Optional[Sequence[str]] = None,
+    ) -> List[SearchHit]:
+        return self.query_many([vector], top_k, include_vector, chunk_types)[0]
+
+    def query_many(
+        self,
+        vectors: Sequence[Sequence[float]],
+        top_k: int,
+        include_vector: bool = False,
+        chunk_types: Optional[Sequence[str]] = None,
+    ) -> List[List[SearchHit]]:
+        """Score every query in one matrix product, then rank per query."""
+        with self._lock:
+            if self._size == 0 or top_k <= 0 or len(vectors) == 0:
+                return [[] for _ in vectors]
+            queries = np.asarray(vectors, dtype=np.float32)
+
+            if chunk_types is None:
+                candidates = None
+                scores = self._matrix[:self._size] @ queries.T
+            else:
+                codes = [self._type_codes[t] for t in chunk_types if t in self._type_codes]
+                candidates = np.flatnonzero(np.isin(self._type_ids[:self._size], codes))
+                if len(candidates) == 0:
+                    return [[] for _ in vectors]
+                scores = self._matrix[candidates] @ queries.T
+
+            return [
+                self._top_hits(scores[:, column], candidates, top_k, include_vector)
+                for column in range(scores.shape[1])
+            ]
+
+    def _top_hits(
+        self,
+        scores: np.ndarray,
+        candidates: Optional[np.ndarray],
+        top_k: int,
+        include_vector: bool,
+    ) -> List[SearchHit]:
+        """Hits for the *top_k* best *scores* (rows, or positions in *candidates*)."""
+        k = min(top_k, len(scores))
+        if k < len(scores):
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind="stable")]
+        rows = best if candidates is None else candidates[best]
+        return [
+            self._hit(int(row), float(score), include_vector)
+            for row, score in zip(rows, scores[best])
+        ]
+
+    def fetch(self, ids: Iterable[str], include_vector: bool = False) -> Dict[str, SearchHit]:
+        with self._lock:
+            found = {}
+            for doc_id in ids:
+                row = self._rows.get(doc_id)
+                if row is not None:
+                    found[doc_id] = self._hit(row, 0.0, include_vector)
+            return found
+
+    def delete(self, ids: Iterable[str]):
+        with self._lock:
+            for doc_id in ids:
+                row = self._rows.pop(doc_id, None)
+                if row is None:
+                    continue
+                if not self._writable:
+                    self._reserve(0, self._dimension)
+                self._rewrite = self._rewrite or row < self._flushed
+                last = self._size - 1
+                if row != last:
+                    # Move the last row into the gap
+                    self._matrix[row] = self._matrix[last]
+                    self._type_ids[row] = self._type_ids[last]
+                    self._records[row] = self._records[last]
+                    self._rows[self._records[row].id] = row
+                self._records.pop()
+                self._size -= 1
+
+    def records(self, include_vector: bool = True) -> Iterable[SearchHit]:
+        for batch in self.record_batches(self.RECORD_BATCH, include_vector):
+            yield from batch
+
+    def record_batches(
+        self, size: int, include_vector: bool = True
+    ) -> Iterator[List[SearchHit]]:
+        """Yield the stored records *size* rows at a time.
+
+        Vectors are float32 NumPy rows copied out of the matrix one batch
+        at a time, so the collection is never duplicated as Python lists.
+        Rows moved by a delete between batches may be skipped or repeated.
+        """
+        start = 0
+        while True:
+            with self._lock:
+                stop = min(start + size, self._size)
+                if start >= stop:
+                    return
+                vectors = np.array(self._matrix[start:stop]) if include_vector else None
+                batch = [self._hit(row, 0.0, False) for row in range(start, stop)]
+            if vectors is not None:
+                for hit, vector in zip(batch, vectors):
+                    hit.vector = vector
+            yield batch
+            start = stop
+
+    def flush(self):
+        with self._lock:
+            if self._path is None:
+                return
+            os.makedirs(self._path, exist_ok=True)
+            vectors_path = os.path.join(self._path, self.VECTORS_FILE)
+            records_path = os.path.join(self._path, self.RECORDS_FILE)
+
+            # Nothing on disk yet (the header may lack the dimension): rewrite
+            if self._rewrite or self._flushed == 0 or not os.path.exists(records_path):
+                with open(vectors_path + ".tmp", "wb") as f:
+                    self._write_rows(f, 0)
+                with open(records_path + ".tmp", "w", encoding="utf-8") as f:
+                    f.write(json.dumps({"dimension": self._dimension}) + "\n")
+                    self._write_records(f, 0)
+                os.replace(vectors_path + ".tmp", vectors_path)
+                os.replace(records_path + ".tmp", records_path)
+            elif self._size > self._flushed:
+                # Vectors first: open() ignores records without a vector
+                with open(vectors_path, "ab") as f:
+                    self._write_rows(f, self._flushed)
+                with open(records_path, "a", encoding="utf-8") as f:
+                    self._write_records(f, self._flushed)
+
+            self._flushed = self._size
+            self._rewrite = False
+
+    def _write_rows(self, f, start: int):
+        if self._size > start:
+            f.write(np.ascontiguousarray(self._matrix[start:self._size]).tobytes())
+
+    def _write_records(self, f, start: int):
+        for record in self._records[start:self._size]:
+            fields = {name: getattr(record, name) for name in self._FIELDS}
+            f.write(json.dumps(fields, separators=(",", ":")) + "\n")
+
+    def close(self):
+        with self._lock:
+            self._matrix = None
+            self._records = []
+            self._rows = {}
+            self._type_ids = np.empty(0, dtype=np.int32)
+            self._size = 0
+            self._flushed = 0
+
+    def destroy(self):
+        self.close()
+        if self._path is not None and os.path.exists(self._path):
+            shutil.rmtree(self._path)
+
+    def _hit(self, row: int, score: float, include_vector: bool) -> SearchHit:
+        record = self._records[row]
+        return SearchHit(
+            id=record.id,
+            text=record.text,
+            chunk_type=record.chunk_type,
+            chunk_index=record.chunk_index,
+            start=record.start,
+            end=record.end,
+            score=score,
+            vector=self._matrix[row].tolist() if include_vector else None,
+            source=record.source,
+        )
+
+
+class ZvecBackend(VectorBackend):
+    """zvec collection with an HNSW index over the ``embedding`` vector."""
+
+    kind = "zvec"
+
+    # zvec rejects larger write batches
+    MAX_WRITE_BATCH = 1024
+
+    # Threads query_many uses to overlap native zvec searches
+    QUERY_WORKERS = 4
+
+    _OUTPUT_FIELDS = ["chunk_text", "chunk_type", "source", "chunk_index", "span_start", "span_end"]
+
+    def __init__(self, collection: "zvec.Collection", config: Optional[IndexConfig] = None):
+        self._collection = collection
+        self.config = config or IndexConfig()
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        dimension: int,
+        config: Optional[IndexConfig] = None,
+    ) -> "ZvecBackend":
+        """Create an empty collection at *path*."""
+        config = config or IndexConfig()
+        hnsw_options = {}
+        if config.hnsw_m is not None:
+            hnsw_options["m"] = config.hnsw_m
+        if config.ef_construction is not None:
+            hnsw_options["ef_construction"] = config.ef_construction
+        if config.precision == "int8":
+            hnsw_options["quantize_type"] = zvec.QuantizeType.INT8
+        data_type = (
+            zvec.DataType.VECTOR_FP16 if config.precision == "fp16"
+            else zvec.DataType.VECTOR_FP32
+        )
+
+        schema = zvec.CollectionSchema(
+            name=os.path.basename(path),
+            vectors=[
+                zvec.VectorSchema(
+                    "embedding",
+                    data_type=data_type,
+                    dimension=dimension,
+                    index_param=zvec.HnswIndexParam(**hnsw_options),
+                )
+            ],
+            fields=[
+                zvec.FieldSchema("chunk_text", zvec.DataType.STRING),
+                zvec.FieldSchema("chunk_type", zvec.DataType.STRING),
+                zvec.FieldSchema("source", zvec.DataType.STRING),
+                zvec.FieldSchema("chunk_index", zvec.DataType.INT64),
+                zvec.FieldSchema("span_start", zvec.DataType.INT64),
+                zvec.FieldSchema("span_end", zvec.DataType.INT64),
+            ],
+        )
+        return cls(zvec.create_and_open(path, schema), config)
+
+    @classmethod
+    def open(cls, path: str, config: Optional[IndexConfig] = None) -> "ZvecBackend":
+        return cls(zvec.open(path), config)
+
+    def __len__(self) -> int:
+        return self._collection.stats.doc_count
+
+    def insert(self, records: Sequence[SearchHit]):
+        docs = [
+            zvec.Doc(
+                id=record.id,
+                vectors={"embedding": record.vector},
+                fields={
+                    "chunk_text": record.text,
+                    "chunk_type": record.chunk_type,
+                    "source": record.source,
+                    "chunk_index": record.chunk_index,
+                    "span_start": record.start,
+                    "span_end": record.end,
+                },
+            )
+            for record in records
+        ]
+        for i in range(0, len(docs), self.MAX_WRITE_BATCH):
+            self._collection.insert(docs[i:i + self.MAX_WRITE_BATCH])
+
+    def query(
+        self,
+        vector: Sequence[float],
+        top_k: int,
+        include_vector: bool = False,
+        chunk_types: Optional[Sequence[str]] = None,
+    ) -> List[SearchHit]:
+        param = None
+        if self.config.ef_search is not None:
+            param = zvec.HnswQueryParam(ef=self.config.ef_search)
+        options = {}
+        if chunk_types is not None:
+            if not chunk_types:
+                return []
+            options["filter"] = self._chunk_type_filter(chunk_types)
+        results = self._collection.query(
+            vectors=zvec.VectorQuery("embedding", vector=vector, param=param),
+            topk=top_k,
+            include_vector=include_vector,
+            output_fields=self._OUTPUT_FIELDS,
+            **options,
+        )
+        return [
+            self._to_hit(doc, include_vector)
+            for doc in results if doc.has_field("chunk_text")
+        ]
+
+    def query_many(
+        self,
+        vectors: Sequence[Sequence[float]],
+        top_k: int,
+        include_vector: bool = False,
+        chunk_types: Optional[Sequence[str]] = None,
+    ) -> List[List[SearchHit]]:
+        if len(vectors) <= 1:
+            return super().query_many(vectors, top_k, include_vector, chunk_types)
+        with ThreadPoolExecutor(min(len(vectors), self.QUERY_WORKERS)) as pool:
+            return list(pool.map(
+                lambda vector: self.query(vector, top_k, include_vector, chunk_types),
+                vectors,
+            ))
+
+    def fetch(self, ids: Iterable[str], include_vector: bool = False) -> Dict[str, SearchHit]:
+        fetched = self._collection.fetch(
+            list(ids), output_fields=self._OUTPUT_FIELDS, include_vector=include_vector
+        )
+        return {
+            doc_id: self._to_hit(doc, include_vector)
+            for doc_id, doc in fetched.items() if doc.has_field("chunk_text")
+        }
+
+    def delete(self, ids: Iterable[str]):
+        self._collection.delete(list(ids))
+
+    def records(self, include_vector: bool = True) -> Iterable[SearchHit]:
+        with self._collection.iter_docs(include_vector=include_vector) as docs:
+            for doc in docs:
+                if doc.has_field("chunk_text"):
+                    yield self._to_hit(doc, include_vector)
+
+    def flush(self):
+        self._collection.flush()
+
+    def close(self):
+        self._collection.close()
+
+    def destroy(self):
+        self._collection.destroy()
+
+    @staticmethod
+    def _chunk_type_filter(chunk_types: Sequence[str]) -> str:
+        """zvec filter expression matching any of *chunk_types*."""
+        for chunk_type in chunk_types:
+            if not _CHUNK_TYPE_RE.match(chunk_type):
+                raise ValueError(f"Invalid chunk type: {chunk_type!r}")
+        quoted = ",".join(f"'{chunk_type}'" for chunk_type in chunk_types)
+        return f"chunk_type IN ({quoted})"
+
+    @staticmethod
+    def _to_hit(doc: "zvec.Doc", include_vector: bool = False) -> SearchHit:
+        def field(name, default):
+            return doc.field(name) if doc.has_field(name) else default
+
+        return SearchHit(
+            id=doc.id,
+            text=doc.field("chunk_text"),
+            chunk_type=field("chunk_type", ""),
+            chunk_index=field("chunk_index", -1),
+            start=field("span_start", -1),
+            end=field("span_end", -1),
+            score=doc.score or 0.0,
+            vector=doc.vector("embedding") if include_vector and doc.has_vector("embedding") else None,
+            source=field("source", ""),
+        )
@@ -6,74 +6,700 @@ enabling the Memory Agent (Hippocampus) to retrieve relevant life experiences
 by meaning rather than keyword matching.
 """
 
+import hashlib
+import json
 import os
 import re
 import shutil
+import threading
+import time
 import uuid
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union,
+)
 
-try:
+import numpy as np
+
+from .bm25 import BM25Index, BM25Log, term_counts, tokenize
+from .chunking import (
+    ChunkSpan,
+    SizeMeasure,
+    char_length,
+    chunk_spans,
+    iter_chunk_spans,
+    measure_name,
+)
+from .dedup import MinHashDeduplicator
+from .rerank import elbow, merge_adjacent_ranked, mmr
+from .vector_backends import (  # noqa: F401  (SearchHit, IndexConfig re-exported)
+    ZVEC_AVAILABLE,
+    IndexConfig,
+    NumpyBackend,
+    SearchHit,
+    VectorBackend,
+    ZvecBackend,
+)
+
+if ZVEC_AVAILABLE:
     import zvec
-    ZVEC_AVAILABLE = True
-except ImportError:
-    ZVEC_AVAILABLE = False
+
+# Model behind zvec.DefaultLocalDenseEmbedding, used when no embedder is given
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+def embedder_model_name(embedder: Any) -> str:
+    """Name identifying the model an embedder computes vectors with."""
+    return getattr(embedder, "model_name", None) or type(embedder).__qualname__
+
+
+class _IndexingCancelled(Exception):
+    """Raised inside a background indexing job that was superseded."""
+
+
+class _SourceLog:
+    """Ids of a collection's chunks by source label, in an append-only file.
+
+    JSON Lines of ``{"source": ..., "ids": [...]}``, one line per inserted
+    batch, and ``{"source": ..., "dropped": true}`` when a source is
+    removed, so neither adding nor removing chunks rewrites the ids already
+    recorded; :meth:`compact` does, leaving out dropped lines.  Not
+    thread-safe.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def add(self, source: str, ids: List[str]):
+        if ids:
+            self._write({"source": source, "ids": ids})
+
+    def drop(self, source: str):
+        """Forget every id recorded under *source* so far."""
+        self._write({"source": source, "dropped": True})
+
+    def _write(self, entry: Dict):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def _entries(self) -> Iterator[Tuple[str, Dict]]:
+        """``(line, entry)`` for every complete line of the file."""
+        self.flush()
+        try:
+            f = open(self.path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    yield line, json.loads(line)
+                except ValueError:
+                    continue
+
+    def ids(self, source: str) -> List[str]:
+        """Ids recorded under *source* since it was last dropped."""
+        ids: List[str] = []
+        for _, entry in self._entries():
+            if entry.get("source") != source:
+                continue
+            if entry.get("dropped"):
+                ids = []
+            else:
+                ids.extend(entry.get("ids", []))
+        return ids
+
+    def compact(self):
+        """Rewrite the file without dropped sources' lines and drop markers."""
+        last_drop: Dict[str, int] = {}
+        for number, (_, entry) in enumerate(self._entries()):
+            if entry.get("dropped"):
+                last_drop[entry.get("source")] = number
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as out:
+            for number, (line, entry) in enumerate(self._entries()):
+                if not entry.get("dropped") and number > last_drop.get(entry.get("source"), -1):
+                    out.write(line)
+        self.close()
+        os.replace(temp_path, self.path)
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _Snapshot:
+    """One built collection of a persona plus its BM25 index.
+
+    The BM25 index and the ids of each source's chunks are kept next to
+    the collection in append-only logs (see :class:`bm25.BM25Log` and
+    :class:`_SourceLog`), written as chunks are inserted.  The index is
+    only read into memory for a lexical search.
+
+    Readers pin a snapshot with :meth:`acquire` / :meth:`release`.  Once it
+    is retired (replaced by a rebuild, evicted, or cleared) it is closed, or
+    deleted from disk, when its last reader releases it.
+    """
+
+    # Files kept next to a collection's directory, named after it
+    LEXICAL_SUFFIX = ".bm25.jsonl"
+    SOURCES_SUFFIX = ".sources.jsonl"
+
+    def __init__(
+        self,
+        name: str,
+        backend: VectorBackend,
+        path: str,
+        lock: Optional[threading.RLock] = None,
+        on_finalize: Optional[Callable[[str], None]] = None,
+    ):
+        self.name = name
+        self.backend = backend
+        self.path = path
+        self.published = False
+        # Chunk types stored in the collection (None: not recorded)
+        self.chunk_types: Optional[Set[str]] = None
+        # Guards the BM25 index and the logs, which are not safe to read
+        # while written
+        self.lock = lock or threading.RLock()
+        self._lexical: Optional[BM25Index] = None
+        self._lexical_log = BM25Log(self.lexical_path)
+        self._source_log = _SourceLog(self.sources_path)
+        self._on_finalize = on_finalize
+
+        self._state_lock = threading.Lock()
+        self._refs = 0
+        self._retired = False
+        self._delete = False
+        self._finalized = False
+
+    @property
+    def lexical_path(self) -> str:
+        return f"{self.path}{self.LEXICAL_SUFFIX}"
+
+    @property
+    def sources_path(self) -> str:
+        return f"{self.path}{self.SOURCES_SUFFIX}"
+
+    @property
+    def lexical(self) -> BM25Index:
+        """BM25 index built alongside the collection (loaded lazily)."""
+        with self.lock:
+            if self._lexical is None:
+                self._lexical = self._lexical_log.load()
+            return self._lexical
+
+    def add_chunks(self, source: str, chunks: Sequence[Tuple[str, str]]):
+        """Record inserted ``(doc_id, text)`` chunks under *source*."""
+        with self.lock:
+            for doc_id, text in chunks:
+                terms = term_counts(text)
+                self._lexical_log.add(doc_id, terms)
+                if self._lexical is not None:
+                    self._lexical.add_terms(doc_id, terms)
+            self._source_log.add(source, [doc_id for doc_id, _ in chunks])
+
+    def source_ids(self, source: str) -> List[str]:
+        with self.lock:
+            return self._source_log.ids(source)
+
+    def remove_chunks(self, chunks: Sequence[Tuple[str, Optional[str]]]):
+        """Drop deleted ``(doc_id, text)`` chunks from the BM25 index.
+
+        Pass the text when known; otherwise every posting list is scanned.
+        """
+        with self.lock:
+            for doc_id, text in chunks:
+                terms = set(tokenize(text)) if text is not None else None
+                self._lexical_log.remove(doc_id, terms)
+                if self._lexical is not None:
+                    self._lexical.remove_terms(doc_id, terms)
+
+    def drop_source(self, source: str):
+        """Forget the ids recorded under *source*."""
+        with self.lock:
+            self._source_log.drop(source)
+
+    def compact_logs(self):
+        """Rewrite both logs with only the live chunks."""
+        with self.lock:
+            self._lexical_log.compact(self.lexical)
+            self._source_log.compact()
+
+    def flush_logs(self):
+        with self.lock:
+            self._lexical_log.flush()
+            self._source_log.flush()
+
+    def _close_logs(self):
+        with self.lock:
+            self._lexical_log.close()
+            self._source_log.close()
+
+    def copy_logs(self, path: str):
+        """Copy the logs for a copy of the collection at *path*."""
+        with self.lock:
+            self.flush_logs()
+            for old, new in (
+                (self.lexical_path, f"{path}{self.LEXICAL_SUFFIX}"),
+                (self.sources_path, f"{path}{self.SOURCES_SUFFIX}"),
+            ):
+                if os.path.exists(old):
+                    shutil.copyfile(old, new)
+
+    def relocate(self, backend: VectorBackend, path: str):
+        """Swap in a copy of the collection at *path*, moving the logs along."""
+        with self.lock:
+            self._close_logs()
+            for old, new in (
+                (self.lexical_path, f"{path}{self.LEXICAL_SUFFIX}"),
+                (self.sources_path, f"{path}{self.SOURCES_SUFFIX}"),
+            ):
+                if os.path.exists(old):
+                    os.replace(old, new)
+            self.backend, self.path = backend, path
+            self._lexical_log = BM25Log(self.lexical_path)
+            self._source_log = _SourceLog(self.sources_path)
+
+    def acquire(self):
+        with self._state_lock:
+            self._refs += 1
+
+    def release(self):
+        with self._state_lock:
+            self._refs -= 1
+            done = self._retired and self._refs == 0
+        if done:
+            self._finalize()
+
+    def retire(self, delete: bool = False):
+        """Close (or *delete*) the snapshot once no reader holds it."""
+        with self._state_lock:
+            self._retired = True
+            self._delete = self._delete or delete
+            done = self._refs == 0
+        if done:
+            self._finalize()
+
+    def _finalize(self):
+        with self._state_lock:
+            if self._finalized:
+                return
+            self._finalized = True
+        self._close_logs()
+        if self._delete:
+            self.backend.destroy()
+            for path in (self.lexical_path, self.sources_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        else:
+            self.backend.close()
+        if self._on_finalize is not None:
+            self._on_finalize(self.path)
 
 
 class VectorMemory:
-    """Semantic vector store for persona biography passages."""
+    """Semantic vector store for persona biography passages.
+
+    Collections are keyed by persona.  Up to ``max_open_collections`` of them
+    stay open at once (least-recently-used eviction), so switching back to a
+    recently used persona is a pointer swap rather than a rebuild.
+
+    Chunk ids are derived from their source label and text, so documents
+    can be appended to (``add_documents``) or withdrawn from
+    (``remove_source``) an existing index in place, and re-adding the same
+    text is a no-op.
+
+    Alongside each collection a BM25 inverted index is built at index time,
+    enabling ``search(query, mode="hybrid")`` to fuse exact-term matches with
+    semantic matches via reciprocal rank fusion.  It is written to disk as
+    an append-only log and read into memory by the first hybrid search
+    (roughly 1 KB per passage).
+
+    Results can be diversified with maximal marginal relevance
+    (``diversity=...``), and neighbouring biography chunks can be merged into
+    one contiguous passage (``merge_adjacent=True``) to save prompt tokens.
+
+    Vectors live in a pluggable backend (see ``vector_backends``).  With
+    ``backend="auto"`` a collection starts as an exact-search NumPy matrix
+    and moves to a zvec HNSW collection once it holds more than
+    ``NUMPY_MAX_VECTORS`` passages; without zvec installed it stays on
+    NumPy, given an ``embedder`` with an ``embed(text)`` method.
+
+    Safe for concurrent use: searches pin the current snapshot of the
+    active collection, while (re-)indexing builds a new snapshot in its own
+    directory and publishes it with an atomic metadata swap.  A replaced
+    snapshot is deleted only after its last reader has finished.
+    """
 
     # Embedding dimension for the default Sentence Transformer model
     _EMBEDDING_DIM = 384
 
-    # Chunking parameters for full books
-    CHUNK_SIZE = 500        # target characters per chunk
+    # Bump when the collection schema changes; older indexes are rebuilt
+    _INDEX_FORMAT = 7
+
+    # Chunking parameters for full books (in units of the chunk measure,
+    # characters by default)
+    CHUNK_SIZE = 500        # target size per chunk
     CHUNK_OVERLAP = 50      # overlap between consecutive chunks
     BATCH_SIZE = 100        # insert batch size for large documents
 
-    def __init__(self, storage_dir: Optional[str] = None):
-        if not ZVEC_AVAILABLE:
+    # Chunks whose estimated Jaccard similarity (over word 5-grams) to an
+    # earlier chunk of the same document reaches this are not indexed.
+    # A passage repeated in a book (quotation, boilerplate page) is chunked
+    # at different sentence boundaries each time, so its copies typically
+    # score 0.4-0.7 rather than near 1.0
+    DEDUP_THRESHOLD = 0.5
+
+    # Source labels for chunks created by index_stream / index_profile
+    DOCUMENT_SOURCE = "document"
+    PROFILE_SOURCE = "profile"
+
+    # Streaming ingestion: characters buffered before sentence splitting
+    STREAM_WINDOW = 64 * 1024
+
+    # How many persona collections to keep open at once
+    MAX_OPEN_COLLECTIONS = 4
+
+    # Hybrid retrieval: candidates fetched per retriever (x top_k) and the
+    # reciprocal rank fusion constant
+    SEARCH_MODES = ("vector", "hybrid")
+    HYBRID_CANDIDATES = 4
+    RRF_K = 60
+
+    # MMR re-ranking: candidates fetched (x top_k) before diversifying
+    MMR_CANDIDATES = 4
+
+    # Vector backends.  "auto" keeps collections of up to NUMPY_MAX_VECTORS
+    # passages in NumPy: exact search stays faster than HNSW well past that
+    # size (benchmarks/vector_backends.py), but the whole matrix lives in
+    # RAM (~77 MB at 384 dims).  Flushes append new rows to disk; only an
+    # update or delete of a stored row rewrites the whole matrix
+    BACKENDS = ("auto", NumpyBackend.kind, ZvecBackend.kind)
+    NUMPY_MAX_VECTORS = 50000
+
+    def __init__(
+        self,
+        storage_dir: Optional[str] = None,
+        max_open_collections: int = MAX_OPEN_COLLECTIONS,
+        chunk_size: int = CHUNK_SIZE,
+        chunk_overlap: int = CHUNK_OVERLAP,
+        chunk_measure: SizeMeasure = char_length,
+        index_config: Optional[IndexConfig] = None,
+        backend: str = "auto",
+        embedder: Optional[Any] = None,
+        embedding_dim: Optional[int] = None,
+        dedup_threshold: Optional[float] = DEDUP_THRESHOLD,
+    ):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}. Supported: {self.BACKENDS}")
+        if backend == ZvecBackend.kind and not ZVEC_AVAILABLE:
             raise ImportError(
-                "zvec is required for VectorMemory. "
+                "zvec is required for the zvec backend. "
                 "Install it with: pip install zvec"
             )
 
         self._storage_dir = storage_dir or os.path.join(
             os.getcwd(), ".brain_vector_store"
         )
-        self._collection: Optional[zvec.Collection] = None
-        self._embedder: Optional[zvec.DefaultLocalDenseEmbedding] = None
+        self.backend = backend
+
+        # Any object with embed(text) -> List[float]; defaults to zvec's
+        # local Sentence Transformer model
+        self._embedder = embedder
+        self._embedder_source: Optional["VectorMemory"] = None
+        self.embedding_dim = (
+            embedding_dim or getattr(embedder, "dimension", None) or self._EMBEDDING_DIM
+        )
+
+        # Published snapshots keyed by safe persona name, oldest first.
+        # _lock guards them and the active pointer; _write_lock serializes
+        # everything that builds or modifies a collection.
+        self.max_open_collections = max(1, max_open_collections)
+        self._snapshots: "OrderedDict[str, _Snapshot]" = OrderedDict()
+        self._active: Optional[_Snapshot] = None
+        self._live_paths: Set[str] = set()
+        self._lock = threading.RLock()
+        self._write_lock = threading.RLock()
+
+        # Chunk sizing; pass chunking.token_counter(tokenizer) as the
+        # measure to size chunks in model tokens instead of characters
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.chunk_measure = chunk_measure
+
+        # Near-duplicate filtering in index_stream / index_text (None: off)
+        self.dedup_threshold = dedup_threshold
+
+        # Vector precision / HNSW parameters for new collections and queries
+        self.index_config = index_config or IndexConfig()
 
-    def _get_embedder(self) -> "zvec.DefaultLocalDenseEmbedding":
+        # Background indexing job and its progress
+        self._worker: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+        self._progress: Dict[str, Any] = {
+            "state": "idle", "persona": None, "chunks": 0,
+            "blocks": 0, "total_blocks": None, "error": None,
+            "duplicates": 0, "embed_seconds": 0.0, "embed_seconds_saved": 0.0,
+        }
+
+    def _get_embedder(self):
         """Lazy-init the embedding model (downloads on first use)."""
-        if self._embedder is None:
-            self._embedder = zvec.DefaultLocalDenseEmbedding()
-        return self._embedder
+        with self._lock:
+            if self._embedder is None and self._embedder_source is not None:
+                self._embedder = self._embedder_source._get_embedder()
+            if self._embedder is None:
+                if not ZVEC_AVAILABLE:
+                    raise ImportError(
+                        "zvec is required for the default embedding model. "
+                        "Install it with: pip install zvec, or pass embedder=..."
+                    )
+                self._embedder = zvec.DefaultLocalDenseEmbedding()
+            return self._embedder
+
+    @property
+    def embedding_model(self) -> str:
+        """Name of the embedding model in use, without loading it."""
+        source = self
+        while source._embedder is None and source._embedder_source is not None:
+            source = source._embedder_source
+        if source._embedder is None:
+            return DEFAULT_EMBEDDING_MODEL
+        return embedder_model_name(source._embedder)
+
+    def share_embedder(self, other: "VectorMemory"):
+        """Embed with *other*'s model instead of loading a second copy.
+
+        The model is still loaded lazily, by whichever store needs it first.
+        """
+        self._embedder_source = other
+        self.embedding_dim = other.embedding_dim
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts, in one model call when the embedder allows.
+
+        zvec's local embedders wrap a sentence-transformers model that can
+        encode a whole batch at once; any other embedder gets one ``embed``
+        call per text.
+        """
+        embedder = self._get_embedder()
+        get_model = getattr(embedder, "_get_model", None)
+        if get_model is None:
+            return [embedder.embed(text) for text in texts]
+
+        vectors = get_model().encode(
+            texts,
+            convert_to_numpy=True,
+            normalize_embeddings=getattr(embedder, "_normalize_embeddings", True),
+        )
+        return [vector.tolist() for vector in vectors]
+
+    @staticmethod
+    def _safe_name(persona_name: str) -> str:
+        return persona_name.lower().replace(" ", "_")[:40]
 
-    def _create_collection(self, name: str) -> "zvec.Collection":
-        """Create a new ZVec collection for a persona."""
-        collection_path = os.path.join(self._storage_dir, name)
+    def _new_collection_path(self, name: str, kind: str) -> str:
+        """Fresh directory for a new build of *name*'s collection."""
+        path = os.path.join(self._storage_dir, f"{name}_v{uuid.uuid4().hex[:8]}")
+        return f"{path}.numpy" if kind == NumpyBackend.kind else path
 
-        # If collection already exists, remove it (re-indexing)
-        if os.path.exists(collection_path):
-            shutil.rmtree(collection_path)
+    def _meta_path(self, name: str) -> str:
+        return os.path.join(self._storage_dir, f"{name}.meta.json")
+
+    def _read_meta(self, name: str) -> Dict:
+        try:
+            with open(self._meta_path(name), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, name: str, meta: Dict):
+        """Write *name*'s metadata atomically (it points at the live build)."""
+        meta = dict(meta, format=self._INDEX_FORMAT)
+        meta.setdefault("index", self.index_config.build_key)
+        temp_path = f"{self._meta_path(name)}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(temp_path, self._meta_path(name))
+
+    def _sweep(self, name: str):
+        """Delete builds of *name* that nothing points at or reads any more."""
+        if not os.path.isdir(self._storage_dir):
+            return
+        current = self._read_meta(name).get("path")
+        pattern = re.compile(
+            rf"^({re.escape(name)}(_v[0-9a-f]{{8}})?(\.numpy)?)"
+            r"(\.bm25\.json|\.bm25\.jsonl|\.sources\.jsonl)?$"
+        )
+        with self._lock:
+            live = {os.path.basename(path) for path in self._live_paths}
+        for entry in os.listdir(self._storage_dir):
+            match = pattern.match(entry)
+            if not match:
+                continue
+            build = match.group(1)
+            if build == current or build in live:
+                continue
+            path = os.path.join(self._storage_dir, entry)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+    def _initial_backend(self, expected_size: Optional[int]) -> str:
+        """Backend for a new collection expected to hold *expected_size* passages."""
+        if self.backend != "auto":
+            return self.backend
+        if not ZVEC_AVAILABLE:
+            return NumpyBackend.kind
+        if expected_size is not None and expected_size > self.NUMPY_MAX_VECTORS:
+            return ZvecBackend.kind
+        return NumpyBackend.kind
+
+    def _create_backend(self, path: str, kind: str) -> VectorBackend:
+        if kind == NumpyBackend.kind:
+            return NumpyBackend(path)
+        return ZvecBackend.create(path, self.embedding_dim, self.index_config)
+
+    def _open_backend(self, path: str, kind: str) -> Optional[VectorBackend]:
+        """Open a stored collection, or None if it can't be opened."""
+        try:
+            if kind == NumpyBackend.kind:
+                return NumpyBackend.open(path)
+            if ZVEC_AVAILABLE:
+                return ZvecBackend.open(path, self.index_config)
+        except Exception:
+            pass
+        return None
+
+    def _snapshot(
+        self,
+        name: str,
+        backend: VectorBackend,
+        path: str,
+        lock: Optional[threading.RLock] = None,
+    ) -> _Snapshot:
+        with self._lock:
+            self._live_paths.add(path)
+        return _Snapshot(name, backend, path, lock, on_finalize=self._finalized)
+
+    def _finalized(self, path: str):
+        with self._lock:
+            self._live_paths.discard(path)
+
+    def _new_snapshot(self, name: str, expected_size: Optional[int] = None) -> _Snapshot:
+        """Create an empty, unpublished collection for *name*."""
         os.makedirs(self._storage_dir, exist_ok=True)
+        self._sweep(name)
+        kind = self._initial_backend(expected_size)
+        path = self._new_collection_path(name, kind)
+        return self._snapshot(name, self._create_backend(path, kind), path)
 
-        schema = zvec.CollectionSchema(
-            name=name,
-            vectors=[
-                zvec.VectorSchema(
-                    "embedding",
-                    data_type=zvec.DataType.VECTOR_FP32,
-                    dimension=self._EMBEDDING_DIM,
-                    index_param=zvec.HnswIndexParam(),
-                )
-            ],
-            fields=[
-                zvec.FieldSchema("chunk_text", zvec.DataType.STRING),
-                zvec.FieldSchema("chunk_type", zvec.DataType.STRING),
-            ],
+    def _publish(self, snapshot: _Snapshot, meta: Dict):
+        """Persist *snapshot* and make it the active collection of its persona.
+
+        The metadata rewrite is the on-disk swap; the snapshot it replaces
+        is deleted once its readers are done.
+        """
+        snapshot.backend.flush()
+        snapshot.flush_logs()
+        self._write_meta(snapshot.name, dict(
+            meta,
+            path=os.path.basename(snapshot.path),
+            backend=snapshot.backend.kind,
+        ))
+        self._load_chunk_types(snapshot, meta)
+
+        with self._lock:
+            previous = self._snapshots.pop(snapshot.name, None)
+            self._snapshots[snapshot.name] = snapshot
+            snapshot.published = True
+            self._active = snapshot
+            self._evict()
+        if previous is not None and previous is not snapshot:
+            previous.retire(delete=True)
+
+    @staticmethod
+    def _load_chunk_types(snapshot: _Snapshot, meta: Dict):
+        if "chunk_types" in meta:
+            snapshot.chunk_types = set(meta["chunk_types"])
+
+    @staticmethod
+    def _lacks_chunk_types(snapshot: _Snapshot, chunk_types: Optional[Sequence[str]]) -> bool:
+        """True if *snapshot* is known to hold none of *chunk_types*."""
+        return (
+            chunk_types is not None
+            and snapshot.chunk_types is not None
+            and snapshot.chunk_types.isdisjoint(chunk_types)
         )
-        return zvec.create_and_open(collection_path, schema)
+
+    def _evict(self):
+        """Retire least recently used snapshots beyond the open limit."""
+        for name in list(self._snapshots):
+            if len(self._snapshots) <= self.max_open_collections:
+                break
+            if self._active is not None and name == self._active.name:
+                continue
+            self._snapshots.pop(name).retire()
+
+    def _release_other(self, name: str):
+        """Stop serving a different persona's collection while *name* builds."""
+        with self._lock:
+            if self._active is not None and self._active.name != name:
+                self._active = None
+
+    @contextmanager
+    def _pinned(self) -> Iterator[Optional[_Snapshot]]:
+        """Hold the active snapshot (or None) open for the duration of a block."""
+        with self._lock:
+            snapshot = self._active
+            if snapshot is not None:
+                snapshot.acquire()
+        try:
+            yield snapshot
+        finally:
+            if snapshot is not None:
+                snapshot.release()
+
+    def _needs_promotion(self, snapshot: _Snapshot) -> bool:
+        return (
+            self.backend == "auto"
+            and ZVEC_AVAILABLE
+            and snapshot.backend.kind == NumpyBackend.kind
+            and len(snapshot.backend) > self.NUMPY_MAX_VECTORS
+        )
+
+    def _copy_to_zvec(self, snapshot: _Snapshot) -> Tuple[VectorBackend, str]:
+        """Copy every record of *snapshot* into a new zvec collection.
+
+        Rows are streamed ``BATCH_SIZE`` at a time straight from the NumPy
+        matrix, so the copy never holds more than one batch of vectors.
+        """
+        path = self._new_collection_path(snapshot.name, ZvecBackend.kind)
+        promoted = self._create_backend(path, ZvecBackend.kind)
+        for batch in snapshot.backend.record_batches(self.BATCH_SIZE):
+            promoted.insert(batch)
+        promoted.flush()
+        print(f"  📦 Moved {len(promoted)} passages to an HNSW index")
+        return promoted, path
+
+    def _promote_build(self, snapshot: _Snapshot):
+        """Move an unpublished NumPy build that outgrew it into zvec, in place."""
+        if snapshot.published or not self._needs_promotion(snapshot):
+            return
+        backend, path = self._copy_to_zvec(snapshot)
+        snapshot.backend.destroy()
+        with self._lock:
+            self._live_paths.discard(snapshot.path)
+            self._live_paths.add(path)
+        snapshot.relocate(backend, path)
 
     # ------------------------------------------------------------------
     # Public API
@@ -83,172 +709,754 @@ class VectorMemory:
         """Chunk a biography text and index it for semantic search.
 
         Handles full books (500+ pages) with sentence-aware chunking.
+        If the same text was already indexed for this persona, the existing
+        collection is reused instead of being rebuilt.
         Returns the number of chunks indexed.
         """
-        safe_name = persona_name.lower().replace(" ", "_")[:40]
-        self._collection = self._create_collection(safe_name)
-        embedder = self._get_embedder()
+        return self.index_stream(
+            [text], persona_name, fingerprint=self._fingerprint(text)
+        )
 
-        chunks = self._chunk_text(text)
-        if not chunks:
-            return 0
+    def index_stream(
+        self,
+        blocks: Iterable[str],
+        persona_name: str,
+        fingerprint: Optional[str] = None,
+    ) -> int:
+        """Index a biography delivered as a stream of text blocks.
+
+        *blocks* (pages, file slices, ...) are concatenated, split into
+        sentences, chunked, embedded and inserted batch by batch, so only a
+        bounded window of text is held in memory at once, and each batch's
+        BM25 postings and chunk ids are appended to logs on disk.  What
+        still grows with the document is the vector backend: NumPy keeps
+        every vector and chunk text in memory (``auto`` moves collections
+        past ``NUMPY_MAX_VECTORS`` passages to zvec, which keeps its own
+        HNSW graph in memory).  Each chunk stores its character span in the
+        concatenated text.  If *fingerprint* matches an existing index for
+        this persona, it is reused instead.
+
+        Unless ``dedup_threshold`` is None, near-duplicate chunks are dropped
+        before embedding; :attr:`progress` reports how many
+        (``duplicates``) and the embedding time that saved.  The filter
+        remembers about 640 bytes per chunk kept.
+        Returns the number of chunks indexed.
+        """
+        if fingerprint is not None:
+            # Re-chunk when the chunking configuration changed
+            fingerprint = (
+                f"{fingerprint}:{self.chunk_size}/{self.chunk_overlap}/"
+                f"{measure_name(self.chunk_measure)}/"
+                f"{self.dedup_threshold}"
+            )
+
+        with self._write_lock:
+            self._begin_progress(persona_name)
+            if fingerprint is not None and self.activate(persona_name, fingerprint=fingerprint):
+                count = self._read_meta(self._safe_name(persona_name)).get("chunks", 0)
+                print(f"📚 Reusing {count} indexed biography passages for {persona_name}")
+                self._end_progress(count)
+                return count
 
-        total = len(chunks)
-        indexed = 0
-
-        # Insert in batches (efficient for large books)
-        for batch_start in range(0, total, self.BATCH_SIZE):
-            batch_chunks = chunks[batch_start:batch_start + self.BATCH_SIZE]
-            docs = []
-            for chunk in batch_chunks:
-                embedding = embedder.embed(chunk)
-                doc = zvec.Doc(
-                    id=str(uuid.uuid4()),
-                    vectors={"embedding": embedding},
-                    fields={
-                        "chunk_text": chunk,
-                        "chunk_type": "biography",
-                    },
+            safe_name = self._safe_name(persona_name)
+            self._release_other(safe_name)
+            snapshot = self._new_snapshot(safe_name)
+            meta: Dict = {"fingerprint": fingerprint, "chunk_types": []}
+            try:
+                spans = iter_chunk_spans(
+                    self._track_blocks(blocks),
+                    self.chunk_size,
+                    self.chunk_overlap,
+                    self.chunk_measure,
+                    window=self.STREAM_WINDOW,
                 )
-                docs.append(doc)
+                if self.dedup_threshold is not None:
+                    spans = self._drop_duplicates(
+                        spans, MinHashDeduplicator(self.dedup_threshold)
+                    )
+                indexed = self._append_spans(spans, self.DOCUMENT_SOURCE, meta, snapshot)
+                meta["duplicates"] = self._progress["duplicates"]
+                self._publish(snapshot, meta)
+            except BaseException:
+                snapshot.retire(delete=True)
+                raise
+
+        print(f"📚 Indexed {indexed} biography passages for {persona_name}  ")
+        self._report_duplicates(indexed)
+        self._end_progress(indexed)
+        return indexed
+
+    def add_documents(
+        self,
+        texts: Iterable[str],
+        source: str,
+        persona_name: Optional[str] = None,
+    ) -> int:
+        """Append texts to a persona index in place, tagged with *source*.
+
+        Targets the active persona, or *persona_name* (creating an empty
+        index for it if none exists).  Chunks already stored under the same
+        source are skipped without being re-embedded.  Only the new chunks
+        are written: their vectors, BM25 postings and ids are appended to
+        the collection's files.
+        Returns the number of new chunks indexed.
+        """
+        with self._write_lock:
+            if persona_name is not None and not self.activate(persona_name):
+                safe_name = self._safe_name(persona_name)
+                self._release_other(safe_name)
+                self._publish(
+                    self._new_snapshot(safe_name),
+                    {"fingerprint": None, "chunks": 0, "chunk_types": []},
+                )
+
+            promoted = None
+            with self._pinned() as snapshot:
+                if snapshot is None:
+                    raise ValueError(
+                        "No persona index is active. Pass persona_name to create one."
+                    )
+
+                name = snapshot.name
+                meta = self._read_meta(name)
+                added = 0
+                for text in texts:
+                    spans = iter_chunk_spans(
+                        [text],
+                        self.chunk_size,
+                        self.chunk_overlap,
+                        self.chunk_measure,
+                        window=self.STREAM_WINDOW,
+                    )
+                    added += self._append_spans(spans, source, meta, snapshot)
+
+                if added:
+                    snapshot.backend.flush()
+                    snapshot.flush_logs()
+                self._write_meta(name, meta)
+                self._load_chunk_types(snapshot, meta)
+
+                if self._needs_promotion(snapshot):
+                    backend, path = self._copy_to_zvec(snapshot)
+                    snapshot.copy_logs(path)
+                    promoted = self._snapshot(name, backend, path, snapshot.lock)
+
+            if promoted is not None:
+                self._publish(promoted, meta)
+
+        print(f"📚 Added {added} passages from {source!r}")
+        return added
+
+    def remove_source(self, source: str) -> int:
+        """Delete every chunk added under *source* from the active index.
+
+        The removal is appended to the BM25 and source logs, which are
+        rewritten once they record more removed chunks than live ones.
+        Returns the number of chunks removed.
+        """
+        with self._write_lock, self._pinned() as snapshot:
+            if snapshot is None:
+                return 0
 
-            self._collection.insert(docs)
-            indexed += len(docs)
-            print(f"  📖 Indexed {indexed}/{total} passages...", end="\r")
+            name = snapshot.name
+            meta = self._read_meta(name)
+            ids = snapshot.source_ids(source)
+            if not ids:
+                return 0
 
-        self._collection.flush()
-        print(f"📚 Indexed {total} biography passages for {persona_name}  ")
-        return total
+            for batch_start in range(0, len(ids), self.BATCH_SIZE):
+                batch = ids[batch_start:batch_start + self.BATCH_SIZE]
+                fetched = snapshot.backend.fetch(batch)
+                snapshot.remove_chunks([
+                    (doc_id, fetched[doc_id].text if doc_id in fetched else None)
+                    for doc_id in batch
+                ])
+                snapshot.backend.delete(batch)
 
-    def index_profile(self, profile: Dict[str, str], persona_name: str) -> int:
+            snapshot.backend.flush()
+            snapshot.drop_source(source)
+            meta["chunks"] = max(0, meta.get("chunks", 0) - len(ids))
+            meta["removed"] = meta.get("removed", 0) + len(ids)
+            if meta["removed"] > meta["chunks"]:
+                snapshot.compact_logs()
+                meta["removed"] = 0
+            snapshot.flush_logs()
+            self._write_meta(name, meta)
+            return len(ids)
+
+    def _append_spans(
+        self,
+        spans: Iterable[ChunkSpan],
+        source: str,
+        meta: Dict,
+        snapshot: _Snapshot,
+    ) -> int:
+        """Embed and insert chunk spans batch by batch under *source*.
+
+        Updates the ``next_index`` and ``chunks`` entries of *meta*.
+        Returns the number of new chunks inserted.
+        """
+        next_index = meta.get("next_index", 0)
+        added = 0
+
+        batch: List[ChunkSpan] = []
+        for span in spans:
+            batch.append(span)
+            if len(batch) >= self.BATCH_SIZE:
+                self._check_cancelled()
+                added += self._insert_spans(batch, next_index, snapshot, source)
+                next_index += len(batch)
+                batch = []
+                self._promote_build(snapshot)
+                self._progress["chunks"] = added
+                print(f"  📖 Indexed {added} passages...", end="\r")
+        if batch:
+            added += self._insert_spans(batch, next_index, snapshot, source)
+            next_index += len(batch)
+            self._promote_build(snapshot)
+
+        # Leave a gap so chunks of separate texts never count as adjacent
+        meta["next_index"] = next_index + 1
+        meta["chunks"] = meta.get("chunks", 0) + added
+        if added and "chunk_types" in meta:
+            meta["chunk_types"] = sorted(set(meta["chunk_types"]) | {"biography"})
+        return added
+
+    def _insert_spans(
+        self,
+        spans: List[ChunkSpan],
+        start_index: int,
+        snapshot: _Snapshot,
+        source: str,
+    ) -> int:
+        """Embed and insert one batch of biography chunks.
+
+        Chunks whose id is already stored are skipped before embedding.
+        Returns the number of chunks inserted.
+        """
+        fresh = {}
+        for offset, span in enumerate(spans):
+            doc_id = self._doc_id(source, span.text)
+            if doc_id not in fresh:
+                fresh[doc_id] = (start_index + offset, span)
+        for doc_id in snapshot.backend.fetch(list(fresh)):
+            del fresh[doc_id]
+        if not fresh:
+            return 0
+
+        start = time.perf_counter()
+        embeddings = self._embed_batch([span.text for _, span in fresh.values()])
+        self._progress["embed_seconds"] += time.perf_counter() - start
+        records = []
+        for (doc_id, (chunk_index, span)), embedding in zip(fresh.items(), embeddings):
+            records.append(SearchHit(
+                id=doc_id,
+                text=span.text,
+                chunk_type="biography",
+                chunk_index=chunk_index,
+                start=span.start,
+                end=span.end,
+                vector=embedding,
+                source=source,
+            ))
+
+        snapshot.backend.insert(records)
+        snapshot.add_chunks(source, [(record.id, record.text) for record in records])
+        return len(records)
+
+    def index_profile(
+        self,
+        profile: Dict[str, str],
+        persona_name: str,
+        embeddings: Optional[Dict[str, List[float]]] = None,
+    ) -> int:
         """Index a pre-curated persona profile dict.
 
         Each profile field (BELIEFS, VALUES, etc.) becomes a searchable chunk.
+        An unchanged profile that was indexed before is reused as-is.
+        Fields with a precomputed vector in *embeddings* skip the embedding
+        model entirely.
         Returns the number of chunks indexed.
         """
-        safe_name = persona_name.lower().replace(" ", "_")[:40]
-        self._collection = self._create_collection(safe_name)
-        embedder = self._get_embedder()
+        fingerprint = self._fingerprint(json.dumps(profile, sort_keys=True))
 
-        docs = []
-        for field, value in profile.items():
-            if not value or not value.strip():
-                continue
-            text = f"{field}: {value}"
-            embedding = embedder.embed(text)
-            doc = zvec.Doc(
-                id=str(uuid.uuid4()),
-                vectors={"embedding": embedding},
-                fields={
-                    "chunk_text": text,
-                    "chunk_type": f"profile_{field.lower()}",
-                },
-            )
-            docs.append(doc)
+        with self._write_lock:
+            self._begin_progress(persona_name)
+            if self.activate(persona_name, fingerprint=fingerprint):
+                count = self._read_meta(self._safe_name(persona_name)).get("chunks", 0)
+                print(f"📚 Reusing {count} indexed profile fields for {persona_name}")
+                self._end_progress(count)
+                return count
+
+            safe_name = self._safe_name(persona_name)
+            self._release_other(safe_name)
+            snapshot = self._new_snapshot(safe_name, expected_size=len(profile))
+            embeddings = embeddings or {}
 
-        if docs:
-            self._collection.insert(docs)
-            self._collection.flush()
+            try:
+                docs: List[SearchHit] = []
+                for field, value in profile.items():
+                    if not value or not value.strip():
+                        continue
+                    text = f"{field}: {value}"
+                    embedding = embeddings.get(field)
+                    if embedding is None:
+                        embedding = self._get_embedder().embed(text)
+                    doc_id = self._doc_id(self.PROFILE_SOURCE, text)
+                    if any(doc.id == doc_id for doc in docs):
+                        continue
+                    docs.append(SearchHit(
+                        id=doc_id,
+                        text=text,
+                        chunk_type=f"profile_{field.lower()}",
+                        # Profile fields are not contiguous text; never merged
+                        chunk_index=-1,
+                        vector=embedding,
+                        source=self.PROFILE_SOURCE,
+                    ))
+
+                for i in range(0, len(docs), self.BATCH_SIZE):
+                    self._check_cancelled()
+                    batch = docs[i:i + self.BATCH_SIZE]
+                    snapshot.backend.insert(batch)
+                    snapshot.add_chunks(self.PROFILE_SOURCE, [(doc.id, doc.text) for doc in batch])
+                    self._progress["chunks"] = min(i + self.BATCH_SIZE, len(docs))
+                self._publish(snapshot, {
+                    "fingerprint": fingerprint,
+                    "chunks": len(docs),
+                    "chunk_types": sorted({doc.chunk_type for doc in docs}),
+                })
+            except BaseException:
+                snapshot.retire(delete=True)
+                raise
 
         print(f"📚 Indexed {len(docs)} profile fields for {persona_name}")
+        self._end_progress(len(docs))
         return len(docs)
 
-    def search(self, query: str, top_k: int = 5) -> List[str]:
-        """Semantic search over the indexed persona biography.
+    def index_in_background(
+        self,
+        index_fn: Callable[[], int],
+        persona_name: str,
+        total_blocks: Optional[int] = None,
+    ) -> threading.Thread:
+        """Run an indexing call (e.g. a bound ``index_stream``) on a worker thread.
 
-        Returns a list of relevant passage strings.
+        Any job still running is cancelled first.  Until the job finishes,
+        :attr:`progress` reports how far it got (*total_blocks*, when known,
+        lets it report a completed fraction), and a different persona's
+        collection is no longer served.
         """
-        if self._collection is None:
-            return []
+        self._cancel_background()
+        self._cancel.clear()
+        self._release_other(self._safe_name(persona_name))
+        self._begin_progress(persona_name, total_blocks)
 
-        embedder = self._get_embedder()
-        query_embedding = embedder.embed(query)
+        def run():
+            try:
+                index_fn()
+            except _IndexingCancelled:
+                self._progress["state"] = "cancelled"
+            except Exception as e:
+                # The partial build was discarded; any previous one still serves
+                self._progress.update(state="failed", error=str(e))
+                print(f"⚠️  Background indexing failed for {persona_name}: {e}")
 
-        results = self._collection.query(
-            vectors=zvec.VectorQuery("embedding", vector=query_embedding),
-            topk=top_k,
-            output_fields=["chunk_text", "chunk_type"],
+        self._worker = threading.Thread(
+            target=run, name=f"index-{self._safe_name(persona_name)}", daemon=True
         )
+        self._worker.start()
+        return self._worker
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until background indexing finishes; returns :attr:`ready`."""
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+        return self.ready
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        mode: str = "vector",
+        diversity: Optional[float] = None,
+        merge_adjacent: bool = False,
+        chunk_types: Optional[Sequence[str]] = None,
+        min_score: Optional[float] = None,
+        adaptive_k: bool = False,
+        with_scores: bool = False,
+    ) -> Union[List[str], List[Tuple[str, float]]]:
+        """Search the indexed persona biography.
+
+        ``mode="vector"`` ranks passages by embedding similarity alone;
+        ``mode="hybrid"`` also ranks them with the BM25 index and fuses both
+        rankings, so exact names and dates surface reliably.
+
+        With *diversity* set (0 = relevance only, 1 = novelty only), more
+        candidates are fetched and re-ranked by maximal marginal relevance.
+        *merge_adjacent* joins consecutive biography chunks among the results
+        into single passages, so fewer than *top_k* strings may be returned.
+        *chunk_types* (e.g. ``["profile_values"]``) restricts the search to
+        passages of those types; the filter is applied inside the vector
+        query rather than to its results.  When the index holds none of
+        them, nothing is embedded or queried.
+
+        Every passage is scored by the cosine similarity of its embedding to
+        the query's (in hybrid mode too, where it does not decide the order).
+        Passages scoring below *min_score* are dropped, and *adaptive_k*
+        keeps only those above the largest drop in score (the "elbow"), so
+        a query may return fewer than *top_k* passages, or none.
+
+        Returns a list of relevant passage strings, or of
+        ``(passage, score)`` pairs with *with_scores*.
+        """
+        self._check_mode(mode)
+        with self._pinned() as snapshot:
+            if snapshot is None or self._lacks_chunk_types(snapshot, chunk_types):
+                return []
+            query_embedding = self._get_embedder().embed(query)
+            return self._search_embedded(
+                snapshot, [query], [query_embedding], top_k, mode,
+                diversity=diversity, merge_adjacent=merge_adjacent,
+                chunk_types=chunk_types, min_score=min_score,
+                adaptive_k=adaptive_k, with_scores=with_scores,
+            )[0]
+
+    def search_many(
+        self,
+        queries: Sequence[str],
+        top_k: int = 5,
+        mode: str = "vector",
+        diversity: Optional[float] = None,
+        merge_adjacent: bool = False,
+        chunk_types: Optional[Sequence[str]] = None,
+        min_score: Optional[float] = None,
+        adaptive_k: bool = False,
+        with_scores: bool = False,
+    ) -> List[Union[List[str], List[Tuple[str, float]]]]:
+        """Run :meth:`search` for several queries at once.
+
+        All queries are embedded in one model call and sent to the backend
+        together (one matrix product for NumPy, concurrent queries for
+        zvec).  Options apply to every query.
+        Returns one list of passage strings per query, in order.
+        """
+        self._check_mode(mode)
+        queries = list(queries)
+        with self._pinned() as snapshot:
+            if snapshot is None or not queries or self._lacks_chunk_types(snapshot, chunk_types):
+                return [[] for _ in queries]
+            query_embeddings = self._embed_batch(queries)
+            return self._search_embedded(
+                snapshot, queries, query_embeddings, top_k, mode,
+                diversity=diversity, merge_adjacent=merge_adjacent,
+                chunk_types=chunk_types, min_score=min_score,
+                adaptive_k=adaptive_k, with_scores=with_scores,
+            )
+
+    def activate(self, persona_name: str, fingerprint: Optional[str] = None) -> bool:
+        """Make a previously indexed persona the active collection.
+
+        Already-open collections are swapped in directly; collections that
+        exist only on disk are opened lazily.  When *fingerprint* is given,
+        the stored index must have been built from the same content with the
+        same index configuration.
+        Returns False if no usable index exists.
+        """
+        name = self._safe_name(persona_name)
+        meta = self._read_meta(name)
+        if meta.get("format") != self._INDEX_FORMAT or not meta.get("path"):
+            return False
+        if fingerprint is not None and (
+            meta.get("fingerprint") != fingerprint
+            or meta.get("index") != self.index_config.build_key
+        ):
+            return False
+
+        path = os.path.join(self._storage_dir, meta["path"])
+        with self._lock:
+            snapshot = self._snapshots.get(name)
+            if snapshot is None or snapshot.path != path:
+                backend = self._open_backend(path, meta.get("backend", ZvecBackend.kind))
+                if backend is None:
+                    return False
+                if snapshot is not None:
+                    self._snapshots.pop(name).retire()
+                snapshot = self._snapshot(name, backend, path)
+                snapshot.published = True
+                self._load_chunk_types(snapshot, meta)
+                self._snapshots[name] = snapshot
+
+            self._snapshots.move_to_end(name)
+            self._active = snapshot
+            self._evict()
+        return True
 
-        return [doc.field("chunk_text") for doc in results if doc.has_field("chunk_text")]
+    def deactivate(self):
+        """Stop searching the active persona, keeping its index for reuse."""
+        self._cancel_background()
+        with self._lock:
+            self._active = None
 
     def clear(self):
         """Clear the current persona index."""
-        if self._collection is not None:
-            self._collection.destroy()
-            self._collection = None
+        self._cancel_background()
+        with self._write_lock:
+            with self._lock:
+                snapshot = self._active
+                if snapshot is None:
+                    return
+                self._snapshots.pop(snapshot.name, None)
+                self._active = None
+            meta_path = self._meta_path(snapshot.name)
+            if os.path.exists(meta_path):
+                os.remove(meta_path)
+            snapshot.retire(delete=True)
+
+    def close(self):
+        """Close every open collection (indexes stay on disk)."""
+        self.deactivate()
+        with self._lock:
+            snapshots = list(self._snapshots.values())
+            self._snapshots.clear()
+        for snapshot in snapshots:
+            snapshot.retire()
 
     @property
     def is_loaded(self) -> bool:
-        return self._collection is not None
+        return self._active is not None
+
+    @property
+    def ready(self) -> bool:
+        """True when a complete index of the current persona can be searched.
+
+        While a persona is re-indexed, its previous index stays searchable.
+        """
+        return self.is_loaded
+
+    @property
+    def progress(self) -> Dict[str, Any]:
+        """Snapshot of the current (or last) indexing job.
+
+        ``state`` is one of idle, indexing, ready, failed or cancelled;
+        ``fraction`` is None while the total amount of input is unknown.
+        """
+        progress = dict(self._progress)
+        total = progress["total_blocks"]
+        if progress["state"] == "ready":
+            progress["fraction"] = 1.0
+        elif total:
+            progress["fraction"] = min(progress["blocks"] / total, 1.0)
+        else:
+            progress["fraction"] = None
+        return progress
+
+    @property
+    def active_persona(self) -> Optional[str]:
+        """Safe name of the active persona collection, or None."""
+        snapshot = self._active
+        return snapshot.name if snapshot is not None else None
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def _chunk_text(
-        text: str,
-        chunk_size: int = 500,
-        overlap: int = 50,
-    ) -> List[str]:
-        """Sentence-aware fixed-size chunking for full books.
+    def _in_worker(self) -> bool:
+        return self._worker is not None and self._worker is threading.current_thread()
 
-        Strategy:
-        1. Split text into sentences using regex.
-        2. Group sentences into chunks of ~chunk_size characters.
-        3. Overlap consecutive chunks by ~overlap characters to
-           preserve context at boundaries.
+    def _begin_progress(self, persona_name: str, total_blocks: Optional[int] = None):
+        """Reset progress for a new indexing call (kept when run by the worker)."""
+        if self._in_worker():
+            return
+        self._progress = {
+            "state": "indexing", "persona": persona_name, "chunks": 0,
+            "blocks": 0, "total_blocks": total_blocks, "error": None,
+            "duplicates": 0, "embed_seconds": 0.0, "embed_seconds_saved": 0.0,
+        }
 
-        Handles PDFs that extract as continuous text (no paragraph
-        breaks) as well as well-formatted text with paragraphs.
-        """
-        # Normalize whitespace (PDFs often have weird spacing)
-        text = re.sub(r"\s+", " ", text).strip()
-        if not text:
-            return []
+    def _end_progress(self, chunks: int):
+        self._progress.update(state="ready", chunks=chunks)
+
+    def _check_cancelled(self):
+        if self._in_worker() and self._cancel.is_set():
+            raise _IndexingCancelled()
+
+    def _track_blocks(self, blocks: Iterable[str]) -> Iterator[str]:
+        """Pass *blocks* through, counting them for :attr:`progress`."""
+        for block in blocks:
+            self._check_cancelled()
+            self._progress["blocks"] += 1
+            yield block
 
-        # Split into sentences — handles Mr./Mrs./Dr. abbreviations
-        sentences = re.split(
-            r"(?<=[.!?])\s+(?=[A-Z\"\'\u201c(])",
-            text,
+    def _drop_duplicates(
+        self, spans: Iterable[ChunkSpan], deduplicator: MinHashDeduplicator
+    ) -> Iterator[ChunkSpan]:
+        """Pass *spans* through, skipping near-duplicates of earlier ones."""
+        for span in spans:
+            if deduplicator.is_duplicate(span.text):
+                self._progress["duplicates"] += 1
+            else:
+                yield span
+
+    def _report_duplicates(self, indexed: int):
+        """Estimate the embedding time saved by dropping duplicates."""
+        dropped = self._progress["duplicates"]
+        if not dropped or not indexed:
+            return
+        saved = dropped * self._progress["embed_seconds"] / indexed
+        self._progress["embed_seconds_saved"] = saved
+        print(f"🧹 Dropped {dropped} near-duplicate passages (~{saved:.1f}s of embedding saved)")
+
+    def _cancel_background(self):
+        """Stop a running background job and wait for it to exit."""
+        worker = self._worker
+        if worker is None or worker is threading.current_thread():
+            return
+        if worker.is_alive():
+            self._cancel.set()
+            worker.join()
+        self._worker = None
+
+    def _check_mode(self, mode: str):
+        if mode not in self.SEARCH_MODES:
+            raise ValueError(
+                f"Unknown search mode: {mode}. Supported: {self.SEARCH_MODES}"
+            )
+
+    def _search_embedded(
+        self,
+        snapshot: _Snapshot,
+        queries: List[str],
+        query_embeddings: List[List[float]],
+        top_k: int,
+        mode: str,
+        diversity: Optional[float] = None,
+        merge_adjacent: bool = False,
+        chunk_types: Optional[Sequence[str]] = None,
+        min_score: Optional[float] = None,
+        adaptive_k: bool = False,
+        with_scores: bool = False,
+    ) -> List[Union[List[str], List[Tuple[str, float]]]]:
+        """Rank passages for already-embedded queries on *snapshot*."""
+        fetch_k = top_k if diversity is None else top_k * self.MMR_CANDIDATES
+        vector_k = fetch_k if mode == "vector" else fetch_k * self.HYBRID_CANDIDATES
+        include_vector = diversity is not None
+        vector_hits = snapshot.backend.query_many(
+            query_embeddings, vector_k, include_vector, chunk_types
         )
 
-        # Build chunks by grouping sentences
-        chunks: List[str] = []
-        current_chunk = ""
+        results = []
+        for query, query_embedding, hits in zip(queries, query_embeddings, vector_hits):
+            hits = self._candidates(
+                snapshot, query, query_embedding, hits, fetch_k, mode,
+                include_vector, chunk_types,
+            )
+            if min_score is not None:
+                hits = [h for h in hits if h.score >= min_score]
+            if diversity is not None:
+                hits = [h for h in hits if h.vector is not None]
+                order = mmr(query_embedding, [h.vector for h in hits], top_k, diversity)
+                hits = [hits[i] for i in order]
+            if adaptive_k and hits:
+                scores = sorted((h.score for h in hits), reverse=True)
+                cutoff = scores[elbow(scores) - 1]
+                hits = [h for h in hits if h.score >= cutoff]
+
+            if merge_adjacent:
+                # A merged passage scores as its best-ranked member
+                passages = [
+                    (text, hits[rank].score)
+                    for rank, text in merge_adjacent_ranked(
+                        [(h.chunk_index, h.text) for h in hits]
+                    )
+                ]
+            else:
+                passages = [(h.text, h.score) for h in hits]
+            results.append(passages if with_scores else [text for text, _ in passages])
+        return results
+
+    def _candidates(
+        self,
+        snapshot: _Snapshot,
+        query: str,
+        query_embedding: List[float],
+        vector_hits: List[SearchHit],
+        top_k: int,
+        mode: str,
+        include_vector: bool = False,
+        chunk_types: Optional[Sequence[str]] = None,
+    ) -> List[SearchHit]:
+        """Ranked candidate hits for *query* under the given search mode.
+
+        *vector_hits* are the query's nearest neighbours: *top_k* of them in
+        vector mode, ``HYBRID_CANDIDATES`` times as many in hybrid mode.
+        Each hit's score is its similarity to *query_embedding*.
+        """
+        if mode == "vector":
+            return vector_hits[:top_k]
+
+        candidates = top_k * self.HYBRID_CANDIDATES
+        with snapshot.lock:
+            lexical_ids = [
+                doc_id for doc_id, _ in snapshot.lexical.search(query, candidates)
+            ]
+        by_id = {hit.id: hit for hit in vector_hits}
+
+        if chunk_types is not None:
+            # BM25 knows nothing about chunk types; check them on the records
+            unseen = [doc_id for doc_id in lexical_ids if doc_id not in by_id]
+            if unseen:
+                by_id.update(snapshot.backend.fetch(unseen, include_vector=True))
+            allowed = set(chunk_types)
+            lexical_ids = [
+                doc_id for doc_id in lexical_ids
+                if doc_id in by_id and by_id[doc_id].chunk_type in allowed
+            ]
 
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
+        fused: Dict[str, float] = {}
+        for ranking in ([hit.id for hit in vector_hits], lexical_ids):
+            for rank, doc_id in enumerate(ranking):
+                fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (self.RRF_K + rank + 1)
+
+        best = sorted(fused, key=fused.get, reverse=True)[:top_k]
+        missing = [doc_id for doc_id in best if doc_id not in by_id]
+        if missing:
+            by_id.update(snapshot.backend.fetch(missing, include_vector=True))
+
+        # Passages found by BM25 alone come back unscored; score them here
+        found = {hit.id for hit in vector_hits}
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        hits = []
+        for doc_id in best:
+            hit = by_id.get(doc_id)
+            if hit is None:
                 continue
+            if doc_id not in found and hit.vector is not None:
+                hit.score = float(np.dot(np.asarray(hit.vector, dtype=np.float32), query_vector))
+                if not include_vector:
+                    hit.vector = None
+            hits.append(hit)
+        return hits
 
-            # If adding this sentence exceeds chunk_size, finalize chunk
-            if current_chunk and len(current_chunk) + len(sentence) + 1 > chunk_size:
-                chunks.append(current_chunk.strip())
-
-                # Start next chunk with overlap from the end of this chunk
-                if overlap > 0 and len(current_chunk) > overlap:
-                    # Take the last ~overlap chars, starting from a word boundary
-                    tail = current_chunk[-overlap:]
-                    word_start = tail.find(" ")
-                    if word_start != -1:
-                        current_chunk = tail[word_start + 1:] + " " + sentence
-                    else:
-                        current_chunk = sentence
-                else:
-                    current_chunk = sentence
-            else:
-                if current_chunk:
-                    current_chunk += " " + sentence
-                else:
-                    current_chunk = sentence
+    @staticmethod
+    def _fingerprint(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
-        # Don't forget the last chunk
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+    @staticmethod
+    def _doc_id(source: str, text: str) -> str:
+        """Deterministic chunk id derived from its source and content."""
+        return hashlib.sha1(f"{source}\x00{text}".encode("utf-8")).hexdigest()
 
-        # Filter out very short chunks (less than 30 chars)
-        chunks = [c for c in chunks if len(c) >= 30]
+    @staticmethod
+    def _chunk_text(
+        text: str,
+        chunk_size: int = 500,
+        overlap: int = 50,
+    ) -> List[str]:
+        """Sentence-aware fixed-size chunking for full books.
 
-        return chunks
+        Thin wrapper over :func:`chunking.chunk_spans` returning only the
+        chunk texts; see that module for the strategy.
+        """
+        return [span.text for span in chunk_spans(text, chunk_size, overlap)]
@@ -5,42 +5,200 @@ Models the Dorsolateral PFC's working memory function: holds recent
 conversation turns so all agents have conversational continuity.
 """
 
-from typing import List, Tuple
+from collections import deque
+from itertools import islice
+from typing import Callable, Deque, List, NamedTuple, Optional, Set, Tuple
+
+from .bm25 import BM25Index
+from .chunking import SizeMeasure, whitespace_tokens
+
+
+class ContextSelection(NamedTuple):
+    """Conversation context picked for one request by :meth:`WorkingMemory.select_context`."""
+
+    text: str
+    turns: int          # turns included
+    tokens: int         # size of text
+    full_tokens: int    # size had every turn in the window been included
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.full_tokens - self.tokens
+
+
+class _Turn(NamedTuple):
+    """A stored turn, rendered and measured once when it is added."""
+
+    id: int             # consecutive, so id - first id = position
+    user_message: str
+    brain_response: str
+    text: str
+    tokens: int
 
 
 class WorkingMemory:
-    """In-memory sliding window of recent conversation turns."""
+    """In-memory sliding window of recent conversation turns.
+
+    The window holds at most *max_turns* turns and, with *max_tokens*, at
+    most that many tokens (sized with *measure*, words by default); the
+    oldest turns are evicted first, but the latest turn is always kept.
+    Turns pushed out of the window are passed to *on_evict*, if given, so
+    they can be consolidated into long-term memory.
+
+    Each turn is formatted and measured once, when it is added (and
+    indexed once, by the first :meth:`select_context` call that sees it).
+    Adding or evicting a turn never copies the rest of the window: the
+    context string is joined from the stored turn texts when asked for,
+    and the whole window's is reused until the window changes.
+    """
 
-    def __init__(self, max_turns: int = 15):
+    # select_context: the latest turns always included, the default token
+    # budget, and how an earlier turn qualifies — its BM25 score against the
+    # input must reach MIN_RELATIVE_SCORE of the best one, counting only
+    # terms found in at most COMMON_TERM_DF of the turns once there are
+    # COMMON_TERM_MIN_TURNS to compare (a follow-up made only of common
+    # words gets just the latest turns)
+    RECENT_TURNS = 1
+    MAX_CONTEXT_TOKENS = 800
+    MIN_RELATIVE_SCORE = 0.3
+    COMMON_TERM_DF = 0.5
+    COMMON_TERM_MIN_TURNS = 4
+
+    def __init__(
+        self,
+        max_turns: int = 15,
+        on_evict: Optional[Callable[[List[Tuple[str, str]]], None]] = None,
+        max_tokens: Optional[int] = None,
+        measure: SizeMeasure = whitespace_tokens,
+    ):
         self.max_turns = max_turns
-        self._turns: List[Tuple[str, str]] = []
+        self.max_tokens = max_tokens
+        self.measure = measure
+        self.on_evict = on_evict
+        self._turns: Deque[_Turn] = deque()
+        self._next_id = 0
+        self._tokens = 0
+        # Every turn's text joined by newlines, built on demand (None: stale)
+        self._rendered: Optional[str] = ""
+        # BM25 over the turns in the window, keyed by turn id; turns from
+        # _unindexed_id on are added on the next select_context
+        self._index = BM25Index()
+        self._unindexed_id = 0
 
     def add_turn(self, user_message: str, brain_response: str):
         """Record a conversation turn (user message + brain response)."""
-        self._turns.append((user_message, brain_response))
-        if len(self._turns) > self.max_turns:
-            self._turns = self._turns[-self.max_turns:]
+        text = f"User: {user_message}\nBrain: {brain_response}"
+        turn = _Turn(self._next_id, user_message, brain_response, text, self.measure(text))
+        self._next_id += 1
+        self._turns.append(turn)
+        self._tokens += turn.tokens
+        self._rendered = None
+
+        evicted = []
+        while len(self._turns) > 1 and (
+            len(self._turns) > self.max_turns
+            or (self.max_tokens is not None and self._tokens > self.max_tokens)
+        ):
+            oldest = self._turns.popleft()
+            self._tokens -= oldest.tokens
+            if oldest.id < self._unindexed_id:
+                self._index.remove(oldest.id, oldest.text)
+            evicted.append((oldest.user_message, oldest.brain_response))
+
+        if evicted and self.on_evict is not None:
+            self.on_evict(evicted)
 
     def get_context(self, last_n: int = 10) -> str:
         """Return formatted recent turns for agent injection.
 
         Returns an empty string if no conversation history exists.
         """
-        recent = self._turns[-last_n:]
-        if not recent:
+        if last_n <= 0:
             return ""
+        if last_n >= len(self._turns):
+            return self._render_window()
+        recent = islice(self._turns, len(self._turns) - last_n, None)
+        return "\n".join(turn.text for turn in recent)
 
-        lines = []
-        for user_msg, brain_resp in recent:
-            lines.append(f"User: {user_msg}")
-            lines.append(f"Brain: {brain_resp}")
+    def _render_window(self) -> str:
+        if self._rendered is None:
+            self._rendered = "\n".join(turn.text for turn in self._turns)
+        return self._rendered
+
+    def select_context(
+        self,
+        query: str,
+        max_tokens: int = MAX_CONTEXT_TOKENS,
+        recent_turns: int = RECENT_TURNS,
+    ) -> ContextSelection:
+        """Return the turns that matter for *query*, formatted like :meth:`get_context`.
+
+        The latest *recent_turns* are always included; earlier turns are
+        ranked by lexical relevance to *query* and added, best first, while
+        they fit in *max_tokens* (sized with the memory's *measure*).
+        Selected turns keep their chronological order.
+        """
+        turns = list(self._turns)
+        first_recent = max(0, len(turns) - recent_turns)
+        selected = list(range(first_recent, len(turns)))
+        budget = max_tokens - sum(turn.tokens for turn in turns[first_recent:])
 
-        return "\n".join(lines)
+        for turn in turns:
+            if turn.id >= self._unindexed_id:
+                self._index.add(turn.id, turn.text)
+        if turns:
+            self._unindexed_id = turns[-1].id + 1
+
+        if first_recent >= self.COMMON_TERM_MIN_TURNS:
+            scores = self._index.scores(query, max_df=self.COMMON_TERM_DF, fallback=False)
+        else:
+            scores = self._index.scores(query)
+        first_id = turns[0].id if turns else 0
+        # Positions of the earlier turns matching the query
+        scores = {
+            turn_id - first_id: score for turn_id, score in scores.items()
+            if turn_id - first_id < first_recent
+        }
+        if scores:
+            cutoff = max(scores.values()) * self.MIN_RELATIVE_SCORE
+            # Equal scores go to the more recent turn
+            ranked = sorted(scores.items(), key=lambda item: (item[1], item[0]), reverse=True)
+            for position, score in ranked:
+                if score < cutoff:
+                    break
+                if turns[position].tokens <= budget:
+                    selected.append(position)
+                    budget -= turns[position].tokens
+
+        if len(selected) == len(turns):
+            text = self._render_window()
+        else:
+            selected.sort()
+            text = "\n".join(turns[position].text for position in selected)
+        return ContextSelection(
+            text=text,
+            turns=len(selected),
+            tokens=sum(turns[position].tokens for position in selected),
+            full_tokens=self._tokens,
+        )
 
     def clear(self):
         """Reset conversation history."""
         self._turns.clear()
+        self._tokens = 0
+        self._rendered = ""
+        self._index = BM25Index()
+        self._unindexed_id = self._next_id
+
+    def turn_texts(self) -> Set[str]:
+        """Every turn in the window, formatted as in :meth:`get_context`."""
+        return {turn.text for turn in self._turns}
 
     @property
     def turn_count(self) -> int:
         return len(self._turns)
+
+    @property
+    def token_count(self) -> int:
+        """Size of the whole window, in the memory's measure."""
+        return self._tokens
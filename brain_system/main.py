@@ -79,6 +79,7 @@ def main():
             user_input = input("\nYou: ")
             if user_input.lower() in ["exit", "quit"]:
                 print("Shutting down Brain System...")
+                brain.close()
                 break
             
             print(f"\n{mode_label} is thinking...")
@@ -0,0 +1,183 @@
+"""
+Precomputed embeddings for the built-in persona registry.
+
+The profiles in :mod:`persona_registry` are static, so their field
+embeddings can be computed once at build time and shipped with the package.
+At runtime the matrix is memory-mapped and handed to
+``VectorMemory.index_profile``, so selecting a built-in persona needs no
+model inference.
+
+Build the artifact with the command below (it downloads the embedding
+model, so it needs sentence-transformers and network access); a wheel
+built afterwards ships it (see ``hatch_build.py`` at the repository root)::
+
+    python -m brain_system.personas.persona_index
+
+Without the artifact, profiles are embedded at runtime.
+
+Vectors are only reused when the manifest's model and dimension match the
+embedder in use, and a field's text is unchanged since the build.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+from ..core.vector_memory import embedder_model_name
+from .persona_registry import PERSONAS
+
+# Bump when the artifact layout or the embedded text format changes
+INDEX_VERSION = 1
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+_MATRIX_FILE = f"persona_embeddings.v{INDEX_VERSION}.npy"
+_MANIFEST_FILE = f"persona_embeddings.v{INDEX_VERSION}.json"
+
+# Loaded lazily on first lookup: (manifest, memory-mapped matrix)
+_cache: Optional[tuple] = None
+
+
+def _field_text(field: str, value: str) -> str:
+    """Text embedded for one profile field (matches VectorMemory.index_profile)."""
+    return f"{field}: {value}"
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _profile_texts():
+    """``(persona_id, field, text)`` for every non-empty registry profile field."""
+    for persona_id in sorted(PERSONAS):
+        for field, value in PERSONAS[persona_id].get("profile", {}).items():
+            if value and value.strip():
+                yield persona_id, field, _field_text(field, value)
+
+
+def artifact_files(data_dir: Optional[str] = None) -> List[str]:
+    """Paths of the artifact's files (matrix and manifest)."""
+    data_dir = data_dir or DATA_DIR
+    return [os.path.join(data_dir, _MATRIX_FILE), os.path.join(data_dir, _MANIFEST_FILE)]
+
+
+def is_current(data_dir: Optional[str] = None) -> bool:
+    """True if the artifact in *data_dir* covers the registry as it is now."""
+    matrix_path, manifest_path = artifact_files(data_dir)
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if manifest.get("version") != INDEX_VERSION or not os.path.exists(matrix_path):
+        return False
+    built = {(entry["persona"], entry["field"], entry["sha256"]) for entry in manifest["entries"]}
+    wanted = {(persona_id, field, _text_hash(text)) for persona_id, field, text in _profile_texts()}
+    return built == wanted
+
+
+def build_index(output_dir: Optional[str] = None) -> str:
+    """Embed every registry persona's profile fields and write the artifact.
+
+    Returns the path of the written manifest.
+    """
+    import numpy as np
+    import zvec
+
+    output_dir = output_dir or DATA_DIR
+    os.makedirs(output_dir, exist_ok=True)
+    embedder = zvec.DefaultLocalDenseEmbedding()
+
+    entries: List[Dict] = []
+    vectors = []
+    for persona_id, field, text in _profile_texts():
+        entries.append({
+            "persona": persona_id,
+            "field": field,
+            "sha256": _text_hash(text),
+            "row": len(vectors),
+        })
+        vectors.append(embedder.embed(text))
+
+    matrix = np.asarray(vectors, dtype=np.float32)
+    np.save(os.path.join(output_dir, _MATRIX_FILE), matrix)
+
+    manifest = {
+        "version": INDEX_VERSION,
+        "model": embedder_model_name(embedder),
+        "dimension": int(matrix.shape[1]) if len(matrix) else 0,
+        "entries": entries,
+    }
+    manifest_path = os.path.join(output_dir, _MANIFEST_FILE)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+
+    print(f"📦 Precomputed {len(entries)} profile embeddings for {len(PERSONAS)} personas")
+    return manifest_path
+
+
+def _load():
+    global _cache
+    if _cache is None:
+        manifest_path = os.path.join(DATA_DIR, _MANIFEST_FILE)
+        matrix_path = os.path.join(DATA_DIR, _MATRIX_FILE)
+        try:
+            import numpy as np
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            matrix = np.load(matrix_path, mmap_mode="r")
+        except (ImportError, OSError, ValueError):
+            manifest, matrix = None, None
+        if manifest is not None and manifest.get("version") != INDEX_VERSION:
+            manifest, matrix = None, None
+        _cache = (manifest, matrix)
+    return _cache
+
+
+def load_embeddings(
+    persona_id: str, model: Optional[str] = None, dimension: Optional[int] = None
+) -> Optional[Dict[str, List[float]]]:
+    """Return precomputed ``{field: vector}`` for a registry persona.
+
+    Returns None when no artifact is shipped, the persona is unknown, any
+    profile field changed since the artifact was built, or the artifact
+    was built with another *model* or *dimension* than the caller embeds
+    with.
+    """
+    persona = PERSONAS.get(persona_id)
+    manifest, matrix = _load()
+    if persona is None or manifest is None:
+        return None
+    if (model is not None and manifest.get("model") != model) or (
+        dimension is not None and manifest.get("dimension") != dimension
+    ):
+        print(
+            f"⚠️ Precomputed persona embeddings are for {manifest.get('model')!r} "
+            f"({manifest.get('dimension')} dims), not {model!r} ({dimension} dims); "
+            "embedding at runtime"
+        )
+        return None
+
+    rows = {
+        entry["field"]: entry
+        for entry in manifest["entries"]
+        if entry["persona"] == persona_id
+    }
+
+    embeddings: Dict[str, List[float]] = {}
+    for field, value in persona.get("profile", {}).items():
+        if not value or not value.strip():
+            continue
+        entry = rows.get(field)
+        if entry is None or entry["sha256"] != _text_hash(_field_text(field, value)):
+            return None
+        embeddings[field] = matrix[entry["row"]].tolist()
+
+    return embeddings
+
+
+if __name__ == "__main__":
+    if is_current():
+        print("📦 Precomputed persona embeddings are up to date")
+    else:
+        build_index()
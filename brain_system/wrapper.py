@@ -45,10 +45,14 @@ class BrainResult:
             agent name (``sensory``, ``memory``, ``logic``, ``emotional``,
             ``executive``).  Each value is a dict with ``name``, ``role``,
             and ``output`` keys.
+        context: How much conversation history went into the prompt:
+            ``turns_used`` of ``turns_available``, its size in ``tokens``
+            (words), and ``tokens_saved`` against including every turn.
     """
 
     response: str
     agent_signals: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    context: Dict[str, int] = field(default_factory=dict)
 
     # ------------------------------------------------------------------
     # Convenience accessors
@@ -91,8 +95,12 @@ class BrainWrapper:
         provider: LLM provider — ``"gemini"``, ``"openai"``, or ``"ollama"``.
         model_name: Model identifier to use (provider-specific).  When *None*,
             each provider falls back to its default model.
-        memory_path: Path to the JSON file used for long-term memory.
-            Defaults to ``brain_memory.json`` in the current working directory.
+        memory_path: Path to the JSON Lines log used for long-term memory.
+            Defaults to ``brain_memory.jsonl`` in the current working
+            directory; a legacy ``.json`` file is migrated on first use.
+        session_id: Name of the conversation session.  Summaries of older
+            turns are kept under it and picked up again by a later brain
+            with the same id; without one they are deleted on :meth:`close`.
 
     Example::
 
@@ -108,6 +116,7 @@ class BrainWrapper:
         provider: str = "gemini",
         model_name: Optional[str] = None,
         memory_path: Optional[str] = None,
+        session_id: Optional[str] = None,
     ) -> None:
         self._provider = provider
         self._model_name = model_name
@@ -117,6 +126,8 @@ class BrainWrapper:
         self._orchestrator = BrainOrchestrator(
             provider=provider,
             model_name=model_name,
+            memory_path=memory_path,
+            session_id=session_id,
         )
 
     # ------------------------------------------------------------------
@@ -133,6 +144,7 @@ class BrainWrapper:
         return BrainResult(
             response=raw["final_response"],
             agent_signals=raw["agent_outputs"],
+            context=raw["context"],
         )
 
     # ------------------------------------------------------------------
@@ -163,9 +175,9 @@ class BrainWrapper:
 
         persona_data = get_persona(persona_or_path)
         if persona_data is not None:
-            self._orchestrator.set_persona_from_dict(persona_data)
+            self._orchestrator.set_persona_from_dict(persona_data, background=False)
         else:
-            self._orchestrator.set_persona(persona_or_path)
+            self._orchestrator.set_persona(persona_or_path, background=False)
 
     def clear_persona(self) -> None:
         """Remove the active persona.  Agents revert to default behaviour."""
@@ -179,14 +191,34 @@ class BrainWrapper:
         for agent in agents:
             agent.persona_context = ""
         self._orchestrator.persona = None
+        self._orchestrator.memory.profile_passages = []
+        self._orchestrator.vector_memory.deactivate()
 
     # ------------------------------------------------------------------
     # Memory helpers
     # ------------------------------------------------------------------
 
     def clear_memory(self) -> None:
-        """Clear conversation history (working memory)."""
+        """Clear conversation history (working memory and its summaries)."""
         self._orchestrator.working_memory.clear()
+        self._orchestrator.consolidator.clear()
+
+    def flush_memory(self) -> None:
+        """Block until every completed turn is written to long-term memory."""
+        self._orchestrator.memory_store.flush()
+
+    def close(self) -> None:
+        """Flush long-term memory and release the brain's stores.
+
+        Also runs automatically at interpreter exit.
+        """
+        self._orchestrator.close()
+
+    def __enter__(self) -> "BrainWrapper":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     # ------------------------------------------------------------------
     # Introspection
@@ -290,7 +322,7 @@ class AgentWrapper:
             and return a ``str``.
         provider: LLM provider for the brain agents.
         model_name: Model identifier (provider-specific).
-        memory_path: Path to JSON memory file.
+        memory_path: Path to the JSON Lines long-term memory log.
     """
 
     def __init__(
@@ -360,6 +392,7 @@ class AgentWrapper:
         return BrainResult(
             response=user_response,
             agent_signals=brain_result.agent_signals,
+            context=brain_result.context,
         )
 
     # ------------------------------------------------------------------
@@ -378,6 +411,10 @@ class AgentWrapper:
         """Clear all stored memories."""
         self._brain.clear_memory()
 
+    def close(self) -> None:
+        """Flush long-term memory and release the brain's stores."""
+        self._brain.close()
+
     def __repr__(self) -> str:
         fn_name = getattr(self._agent_fn, "__name__", "unknown")
         return f"AgentWrapper({fn_name}, provider={self._provider!r})"
@@ -0,0 +1,53 @@
+"""
+Wheel build hook: ship the precomputed persona embeddings.
+
+If an up-to-date artifact exists under ``brain_system/personas/data``
+(generate it with ``python -m brain_system.personas.persona_index``), it
+is included in the wheel.  Generating it during the build is opt-in: set
+``BRAIN_BUILD_PERSONA_INDEX=1`` and build without isolation in an
+environment with the runtime dependencies and sentence-transformers, as
+the first run downloads the embedding model.
+
+Anything that fails here only leaves the artifact out: at runtime
+``load_embeddings`` then returns None and profiles are embedded on load.
+"""
+
+import os
+import sys
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+# Set to 1 to generate a missing or stale artifact during the build
+BUILD_ENV_VAR = "BRAIN_BUILD_PERSONA_INDEX"
+
+
+class PersonaIndexBuildHook(BuildHookInterface):
+    PLUGIN_NAME = "custom"
+
+    def initialize(self, version, build_data):
+        sys.path.insert(0, self.root)
+        try:
+            from brain_system.personas import persona_index
+
+            if not persona_index.is_current():
+                if os.environ.get(BUILD_ENV_VAR) != "1":
+                    self.app.display_info(
+                        "Precomputed persona embeddings are missing or stale; building "
+                        f"the wheel without them (set {BUILD_ENV_VAR}=1 to generate)"
+                    )
+                    return
+                persona_index.build_index()
+        except (ImportError, OSError, RuntimeError, ValueError) as e:
+            # Missing dependencies, no network for the model download (zvec
+            # reports that as ValueError), unwritable data directory
+            self.app.display_warning(
+                f"Skipping precomputed persona embeddings ({type(e).__name__}: {e})"
+            )
+            return
+        finally:
+            sys.path.remove(self.root)
+
+        # The artifact is git-ignored, so include it explicitly
+        for path in persona_index.artifact_files():
+            relative = os.path.relpath(path, self.root).replace(os.sep, "/")
+            build_data["force_include"][path] = relative